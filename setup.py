@@ -69,6 +69,12 @@ setup(  name='ship',
         install_requires=[
             'future',
         ],
+
+        # Optional packages used to speed up some of the tools
+        extras_require={
+            'numpy': ['numpy'],
+            'pandas': ['numpy', 'pandas'],
+        },
          
         include_package_data=True,
         zip_safe=False,
@@ -0,0 +1,116 @@
+"""
+
+ Summary:
+    Contains the ColumnSpec class. This describes the fixed width layout of
+    the rows of a unit in an ISIS/FMP dat file and reads them into a
+    RowDataCollection.
+
+    Unit classes declare the key, start and end of each value in a row once,
+    rather than slicing each line by hand in their read methods. The slices
+    are compiled into a single operator.itemgetter so that a whole row is
+    split up in one call, and the values are added to the collection a
+    column at a time with RowDataCollection.addColumns().
+
+ TODO:
+
+ Updates:
+
+"""
+from __future__ import unicode_literals
+
+import operator
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+class ColumnSpec(object):
+    """Fixed width layout of the values in a row.
+
+    Example:
+        >>> spec = ColumnSpec([
+        ...     (rdt.CHAINAGE, 0, 10), (rdt.ELEVATION, 10, 20),
+        ...     (rdt.EASTING, 20, 30, None),
+        ... ])
+        >>> spec.parseLine('     1.000    20.000')
+        ['1.000', '20.000', None]
+    """
+
+    def __init__(self, columns):
+        """Constructor.
+
+        Args:
+            columns(list): containing a tuple(key, start, end) for each value
+                in a row, where start and end are the slice positions of the
+                value in the line. A fourth item can be added to give the value
+                to use if the field is blank or missing from the line (e.g.
+                None so that the data object default is used). Otherwise the
+                blank string is used.
+        """
+        self.columns = list(columns)
+        self.keys = [c[0] for c in self.columns]
+        slices = [slice(c[1], c[2]) for c in self.columns]
+        self._blanks = [(i, c[3]) for i, c in enumerate(self.columns) if len(c) > 3]
+
+        self._getter = operator.itemgetter(*slices)
+        if len(slices) == 1:
+            # itemgetter only returns a tuple when given more than one item
+            getter = self._getter
+            self._getter = lambda line: (getter(line),)
+
+    def parseLine(self, line):
+        """Split a line up into its values.
+
+        Args:
+            line(str): the line to read.
+
+        Return:
+            list - the stripped values in the same order as the columns.
+        """
+        values = [v.strip() for v in self._getter(line)]
+        for i, blank in self._blanks:
+            if values[i] == '':
+                values[i] = blank
+        return values
+
+    def parseLines(self, lines):
+        """Split up a list of lines into columns.
+
+        Args:
+            lines(list): the lines to read.
+
+        Return:
+            dict - the list of values in each column, keyed on the column key.
+        """
+        getter = self._getter
+        columns = list(zip(*[getter(line) for line in lines]))
+        if not columns:
+            return dict((k, []) for k in self.keys)
+
+        columns = [[v.strip() for v in c] for c in columns]
+        for i, blank in self._blanks:
+            columns[i] = [v if v != '' else blank for v in columns[i]]
+        return dict(zip(self.keys, columns))
+
+    def readRows(self, collection, unit_data, file_line, row_count):
+        """Read rows from the unit data into a RowDataCollection.
+
+        Args:
+            collection(RowDataCollection): the collection to add the rows to.
+            unit_data(list): the lines of the unit.
+            file_line(int): the index of the first row in unit_data.
+            row_count(int): the number of rows to read.
+
+        Return:
+            int - the index of the line after the last row read.
+
+        Raises:
+            See RowDataCollection.addColumns().
+        """
+        out_line = file_line + row_count
+        if row_count < 1:
+            return out_line
+
+        collection.addColumns(self.parseLines(unit_data[file_line:out_line]))
+        return out_line
@@ -6,7 +6,7 @@
     These classes can be used to hold used by the :class:'<RowDataCollection>'.
     They provide a range of methods for easily acessing, amending and retrieving
     values to print to file. Classes include support for:
-        # Numeric data.
+        # Numeric data (optionally stored compactly in an array.array).
         # String data.
         # Symbol data.
         # Constant data (a tuple of legal values).
@@ -28,7 +28,8 @@
 """
 from __future__ import unicode_literals
 
-
+import re
+import array
 from abc import ABCMeta, abstractmethod
 
 import logging
@@ -36,6 +37,38 @@ logger = logging.getLogger(__name__)
 """logging references with a __name__ set to this module."""
 
 
+PADDING_FORMAT = re.compile(r'^\{0?(?::([<>]?)(\d*))?\}$')
+"""Matches format_str's that only pad the value, e.g. '{:>10}'."""
+
+
+def printfFormat(format_str, conversion):
+    """Get the printf style format equivalent to a format_str.
+
+    '{:>10}'.format('%0.3f' % value) gives the same str as '%10.3f' % value,
+    which is much quicker. This only works for format_str's that do nothing
+    other than pad the value.
+
+    Args:
+        format_str(str): the str.format style format, e.g. '{:>10}'.
+        conversion(str): the printf conversion for the value, e.g. '.3f'.
+
+    Returns:
+        str - the printf style format, or None if format_str does more than
+            pad the value.
+    """
+    if format_str is None:
+        return None
+    match = PADDING_FORMAT.match(format_str)
+    if match is None:
+        return None
+    align, width = match.groups()
+    if not width:
+        return '%' + conversion
+    # Values are formatted to a str first, and str's are left aligned
+    flag = '' if align == '>' else '-'
+    return '%' + flag + width + conversion
+
+
 class ADataRowObject(object):
     """Abstract class for all data objects used in an AUnit class.
 
@@ -170,6 +203,45 @@ class ADataRowObject(object):
 
         return out_value
 
+    def printableValues(self, values):
+        """Get a list of values in printable form.
+
+        Gives the same result as calling getPrintableValue() for each value,
+        but the format settings are only looked up once. Subclasses override
+        this with quicker ways of formatting a lot of values.
+
+        Args:
+            values(list): the values to format.
+
+        Returns:
+            list - containing the .DAT file print formatted str of each value.
+        """
+        format_str = self.format_str
+        if self.default == '~' or format_str is None:
+            blank = ''
+        else:
+            blank = format_str.format('')
+
+        if format_str is None:
+            return [blank if v == '' else str(v) for v in values]
+        format_print = self.formatPrintString
+        return [blank if v == '' else format_print(v) for v in values]
+
+    def _printableDistinctValues(self, values):
+        """Get a list of values in printable form, formatting each distinct
+        value only once.
+
+        Used by data objects that only have a few possible values.
+
+        See Also:
+            printableValues
+        """
+        distinct = list(set(values))
+        formatted = dict(zip(
+            distinct, ADataRowObject.printableValues(self, distinct)
+        ))
+        return [formatted[v] for v in values]
+
     def addValue(self, value=None, index=None):
         """Adds a value to the data_collection.
 
@@ -191,6 +263,7 @@ class ADataRowObject(object):
         if self.update_callback is not None:
             self.update_callback(self, value, index)
 
+        self._prepareStorage(value)
         length = len(self.data_collection)
         if index == None or index == length:
             self.data_collection.append(value)
@@ -207,6 +280,25 @@ class ADataRowObject(object):
 #         self.record_length += 1
         self._max = len(self.data_collection)
 
+    def addValues(self, values, index=None):
+        """Adds a list of values to the data_collection.
+
+        The values are added with addValue() one at a time, so they are
+        checked in the same way. Subclasses can override this to add them
+        all at once.
+
+        Args:
+            values(list): the values to add. Any that are None will be set to
+                the default value.
+            index=None(int): the index at which to add the first value. If
+                None they will be appended to the end.
+
+        Raises:
+            IndexError: If index does not exist.
+        """
+        for i, value in enumerate(values):
+            self.addValue(value, None if index is None else index + i)
+
     def setValue(self, value, index):
         """Changes the value at the given index
 
@@ -220,6 +312,7 @@ class ADataRowObject(object):
         if self.update_callback is not None:
             self.update_callback(self, value, index)
 
+        self._prepareStorage(value)
         length = len(self.data_collection)
         if index == None or index == length:
             self.data_collection.append(value)
@@ -256,6 +349,14 @@ class ADataRowObject(object):
     def getDataCollection(self):
         return self.data_collection
 
+    def _prepareStorage(self, value):
+        """Make sure that data_collection can hold the given value.
+
+        Called before a value is stored. Does nothing by default; overridden
+        by the numeric data objects that can use compact storage.
+        """
+        pass
+
     def checkDefault(self, value):
         if self.default == '~' and value == self.default:
             return True
@@ -289,13 +390,147 @@ class ADataRowObject(object):
             self.has_changed = True
 
 
-class IntData(ADataRowObject):
+class ANumericData(ADataRowObject):
+    """Abstract class for the numeric data objects (FloatData and IntData).
+
+    The values are stored in a list like the other data objects, but can be
+    converted to an array.array with compact(). This uses a lot less memory
+    than a list of Python numbers and allows the values to be accessed as a
+    buffer (see buffer()) without copying them, e.g. by numpy.frombuffer().
+
+    A compact data_collection still supports the same methods. If a value
+    that can't be stored in the array (e.g. a blank default) is added it will
+    be converted back to a list.
+    """
+
+    TYPECODE = None
+    """The array.array typecode used by compact()."""
+
+    VALUE_TYPE = None
+    """The type that values are converted to when they're added."""
+
+    @property
+    def is_compact(self):
+        return isinstance(self.data_collection, array.array)
+
+    def compact(self):
+        """Store the values in an array.array rather than a list.
+
+        Return:
+            bool - True if the values are stored in an array. False if they
+                contain values that can't be (e.g. blank defaults).
+        """
+        if self.is_compact:
+            return True
+        try:
+            self.data_collection = array.array(self.TYPECODE, self.data_collection)
+        except (TypeError, OverflowError):
+            return False
+        return True
+
+    def buffer(self):
+        """Get a view of the values that doesn't copy them.
+
+        The values will be compacted first. No values can be added or removed
+        while the view exists, so release it when done.
+
+        Return:
+            memoryview - of the array.array holding the values.
+
+        Raises:
+            ValueError: if the values can't be compacted.
+        """
+        if not self.compact():
+            raise ValueError('Data object contains values that are not numeric')
+        return memoryview(self.data_collection)
+
+    def addValues(self, values, index=None):
+        """Overrides superclass method.
+
+        If there's no update_callback the values are converted and stored in
+        one go rather than being added one at a time.
+
+        See Also:
+            ADataRowObject: addValues()
+        """
+        if self.update_callback is not None:
+            return super(ANumericData, self).addValues(values, index)
+
+        cast = self.VALUE_TYPE
+        default = self.default
+        try:
+            values = [default if v is None else cast(v) for v in values]
+        except ValueError:
+            logger.error('Attempted to add invalid value to %s' % type(self).__name__)
+            raise ValueError('Attempted to add invalid value to %s' % type(self).__name__)
+
+        if self.is_compact:
+            try:
+                values = array.array(self.TYPECODE, values)
+            except (TypeError, OverflowError):
+                self.data_collection = list(self.data_collection)
+
+        length = len(self.data_collection)
+        if index is None or index == length:
+            self.data_collection.extend(values)
+        elif index > length:
+            raise IndexError
+        else:
+            self.data_collection[index:index] = values
+
+        self.has_changed = True
+        self._max = len(self.data_collection)
+
+    def printableValues(self, values):
+        """Overrides superclass method.
+
+        If the format_str only pads the value all of the values are formatted
+        with a single printf style format (see printfFormat()). Falls back on
+        the superclass method if there are any that can't be, e.g. blanks.
+
+        See Also:
+            ADataRowObject: printableValues()
+        """
+        printf_format = self._printfFormat()
+        if printf_format is not None:
+            try:
+                return [printf_format % v for v in values]
+            except TypeError:
+                pass
+        return super(ANumericData, self).printableValues(values)
+
+    def _printfFormat(self):
+        """Get the printf style format for the values, or None if there isn't
+        one that matches formatPrintString().
+        """
+        return None
+
+    def _prepareStorage(self, value):
+        """Overrides superclass method.
+
+        Converts the compact data_collection back to a list if value can't
+        be stored in it.
+        """
+        if not self.is_compact:
+            return
+        if value is None:
+            value = self.default
+        try:
+            array.array(self.TYPECODE, [value])
+        except (TypeError, OverflowError):
+            self.data_collection = list(self.data_collection)
+
+
+class IntData(ANumericData):
     """Concrete implememtation of the ADataRowObject for integer values.
 
     See Also:
         ADataRowObject
     """
 
+    TYPECODE = str('l')  # array.array needs a native str typecode
+    VALUE_TYPE = int
+
 #     def __init__(self, row_pos, datatype, format_str='{}', default=None):
     def __init__(self, datatype, format_str='{}', **kwargs):
         """Constructor.
@@ -364,12 +599,21 @@ class IntData(ADataRowObject):
             value = self.format_str.format(value)
         return value
 
+    def _printfFormat(self):
+        """Overrides superclass method."""
+        if self.default == '~':
+            return None
+        return printfFormat(self.format_str, 'd')
+
 
-class FloatData(ADataRowObject):
+class FloatData(ANumericData):
     """Overrides the value return methods from ADataObject to return a
     float value instead of a string.
     """
 
+    TYPECODE = str('d')  # array.array needs a native str typecode
+    VALUE_TYPE = float
+
 #     def __init__(self, row_pos, datatype, format_str='{}', default=None, no_of_dps=0):
     def __init__(self, datatype, format_str='{}', **kwargs):  # default=None, no_of_dps=0):
         """Constructor.
@@ -450,6 +694,12 @@ class FloatData(ADataRowObject):
                 value = self.format_str.format(value)
         return value
 
+    def _printfFormat(self):
+        """Overrides superclass method."""
+        if self.default == '~' or self.use_sn > -1:
+            return None
+        return printfFormat(self.format_str, '.' + str(self.no_of_dps) + 'f')
+
 
 class StringData(ADataRowObject):
     """Overrides the value return methods from ADataObject to return a
@@ -614,6 +864,17 @@ class ConstantData(ADataRowObject):
             value = self.format_str.format(value)
         return value
 
+    def printableValues(self, values):
+        """Overrides superclass method.
+
+        There are only a few possible values, so each one is only formatted
+        once.
+
+        See Also:
+            ADataRowObject: printableValues()
+        """
+        return self._printableDistinctValues(values)
+
 
 class SymbolData(ADataRowObject):
     """Overrides the value return methods from ADataObject to return a
@@ -708,3 +969,14 @@ class SymbolData(ADataRowObject):
         else:
             value = self.format_str.format(value)
         return value
+
+    def printableValues(self, values):
+        """Overrides superclass method.
+
+        There are only a few possible values, so each one is only formatted
+        once.
+
+        See Also:
+            ADataRowObject: printableValues()
+        """
+        return self._printableDistinctValues(values)
@@ -0,0 +1,297 @@
+"""
+
+ Summary:
+    Contains the PositionIndex class. This keeps track of where each item is
+    in a list, so that the index of an item can be found without searching
+    the whole list.
+
+    The items are held in blocks, in the same order as the list, along with
+    the index that each block starts at. Inserting or deleting an item only
+    changes the block it's in and moves the start of the blocks after it;
+    these are only updated when they are next needed. Finding an item only
+    searches the block it's in. Blocks are split when they get too big and
+    removed when they're empty, so an edit or lookup costs, at most, a pass
+    over the blocks plus a search of one block.
+
+ TODO:
+
+ Updates:
+
+"""
+from __future__ import unicode_literals
+
+import bisect
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+class PositionIndex(object):
+    """Index of the positions of the items in a list.
+
+    The PositionIndex doesn't hold a reference to the list. It must be told
+    about every change made to it with insert() and delete().
+
+    Items must be hashable and are matched on equality. The same item can be
+    added more than once; index() returns the first position. Each item can
+    also be given a group (e.g. the parent of a TuflowPart) so that the last
+    position of any item in the group can be found with lastIndexOfGroup().
+
+    Example:
+        >>> index = PositionIndex()
+        >>> index.insert(0, 'a')
+        >>> index.insert(0, 'b', group='first')
+        >>> index.index('a')
+        1
+        >>> index.lastIndexOfGroup('first')
+        0
+    """
+
+    BLOCK_SIZE = 256
+    """Blocks are split in two when they hold more than twice this."""
+
+    def __init__(self):
+        """Constructor."""
+        self.clear()
+
+    def __len__(self):
+        return self._length
+
+    def __contains__(self, item):
+        return item in self._tokens
+
+    def clear(self):
+        """Remove all of the items."""
+        self._blocks = []
+        self._starts = []
+        # _starts is only correct for the blocks below _valid
+        self._valid = 0
+        self._length = 0
+
+        # Each distinct item is stored in the blocks as an int token, which
+        # is quicker to search for than an object with its own __eq__.
+        self._tokens = {}
+        self._items = {}
+        self._token_blocks = {}
+        self._groups = {}
+        self._group_blocks = {}
+        self._next_token = 0
+
+    def count(self, item):
+        """Get the number of times that an item is in the list.
+
+        Args:
+            item: the item to count.
+
+        Return:
+            int - the number of times it has been inserted and not deleted.
+        """
+        token = self._tokens.get(item, None)
+        if token is None:
+            return 0
+        return len(self._token_blocks[token])
+
+    def insert(self, index, item, group=None):
+        """Record that an item has been inserted into the list.
+
+        Args:
+            index(int): the index that the item was inserted at. Negative
+                indexes work in the same way as list.insert().
+            item: the item that was inserted.
+            group=None: the group that the item belongs to. If the item is
+                already in the list it keeps the group it was first given.
+        """
+        if index < 0:
+            index = max(self._length + index, 0)
+        index = min(index, self._length)
+
+        token = self._tokens.get(item, None)
+        if token is None:
+            token = self._next_token
+            self._next_token += 1
+            self._tokens[item] = token
+            self._items[token] = item
+            self._token_blocks[token] = []
+            self._groups[token] = group
+        group = self._groups[token]
+
+        if not self._blocks:
+            self._blocks.append(_Block(0))
+            self._starts.append(0)
+        if index == self._length:
+            block = self._blocks[-1]
+            local = len(block.items)
+        else:
+            block, local = self._locate(index)
+
+        block.items.insert(local, token)
+        self._length += 1
+        self._token_blocks[token].append(block)
+        self._addToGroup(group, block)
+        self._valid = min(self._valid, block.pos + 1)
+        if len(block.items) > 2 * PositionIndex.BLOCK_SIZE:
+            self._split(block)
+
+    def delete(self, index):
+        """Record that the item at index has been deleted from the list.
+
+        Args:
+            index(int): the index of the deleted item.
+
+        Return:
+            the item that was deleted.
+
+        Raises:
+            IndexError: if index is out of range.
+        """
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError('list index out of range')
+
+        block, local = self._locate(index)
+        token = block.items.pop(local)
+        self._length -= 1
+        item = self._items[token]
+
+        blocks = self._token_blocks[token]
+        blocks.remove(block)
+        self._removeFromGroup(self._groups[token], block)
+        if not blocks:
+            del self._tokens[item]
+            del self._items[token]
+            del self._token_blocks[token]
+            del self._groups[token]
+
+        if block.items:
+            self._valid = min(self._valid, block.pos + 1)
+        else:
+            self._removeBlock(block)
+        return item
+
+    def index(self, item):
+        """Get the first index of an item.
+
+        Args:
+            item: the item to find.
+
+        Return:
+            int - the index of the item, or -1 if it isn't in the list.
+        """
+        token = self._tokens.get(item, None)
+        if token is None:
+            return -1
+        index = -1
+        for block in self._token_blocks[token]:
+            i = self._start(block) + block.items.index(token)
+            if index == -1 or i < index:
+                index = i
+        return index
+
+    def lastIndexOfGroup(self, group):
+        """Get the index of the last item in a group.
+
+        Args:
+            group: the group given to insert().
+
+        Return:
+            int - the index of the last item in the group, or -1 if there
+                aren't any.
+        """
+        blocks = self._group_blocks.get(group, None)
+        if not blocks:
+            return -1
+        block = max(blocks, key=lambda b: b.pos)
+        items = block.items
+        for i in range(len(items) - 1, -1, -1):
+            if self._groups[items[i]] == group:
+                return self._start(block) + i
+        return -1
+
+    def _start(self, block):
+        """Get the index in the list of the first item in a block."""
+        if block.pos >= self._valid:
+            self._updateStarts(block.pos + 1)
+        return self._starts[block.pos]
+
+    def _updateStarts(self, end):
+        """Update the start of each block from _valid up to end."""
+        i = self._valid
+        if i == 0:
+            self._starts[0] = 0
+            i = 1
+        blocks = self._blocks
+        starts = self._starts
+        while i < end:
+            starts[i] = starts[i - 1] + len(blocks[i - 1].items)
+            i += 1
+        self._valid = max(self._valid, end)
+
+    def _locate(self, index):
+        """Get the block holding index and the position of index in it.
+
+        Args:
+            index(int): a positive index less than the length of the list.
+
+        Return:
+            tuple(_Block, int) - the block and the index within it.
+        """
+        self._updateStarts(len(self._blocks))
+        pos = bisect.bisect_right(self._starts, index) - 1
+        return self._blocks[pos], index - self._starts[pos]
+
+    def _split(self, block):
+        """Move the second half of a block into a new block after it."""
+        half = len(block.items) // 2
+        new_block = _Block(block.pos + 1)
+        new_block.items = block.items[half:]
+        del block.items[half:]
+
+        self._blocks.insert(new_block.pos, new_block)
+        self._starts.insert(new_block.pos, 0)
+        self._renumber(new_block.pos + 1)
+        self._valid = min(self._valid, new_block.pos)
+
+        for token in new_block.items:
+            blocks = self._token_blocks[token]
+            blocks[blocks.index(block)] = new_block
+            group = self._groups[token]
+            self._removeFromGroup(group, block)
+            self._addToGroup(group, new_block)
+
+    def _removeBlock(self, block):
+        """Remove an empty block."""
+        del self._blocks[block.pos]
+        del self._starts[block.pos]
+        self._renumber(block.pos)
+        self._valid = min(self._valid, block.pos)
+
+    def _renumber(self, start):
+        for i in range(start, len(self._blocks)):
+            self._blocks[i].pos = i
+
+    def _addToGroup(self, group, block):
+        blocks = self._group_blocks.get(group, None)
+        if blocks is None:
+            blocks = self._group_blocks[group] = {}
+        blocks[block] = blocks.get(block, 0) + 1
+
+    def _removeFromGroup(self, group, block):
+        blocks = self._group_blocks[group]
+        blocks[block] -= 1
+        if blocks[block] < 1:
+            del blocks[block]
+            if not blocks:
+                del self._group_blocks[group]
+
+
+class _Block(object):
+    """A section of the items in a PositionIndex.
+
+    Compared and hashed on identity, so it can be used as a dict key.
+    """
+
+    def __init__(self, pos):
+        self.items = []
+        self.pos = pos
@@ -23,6 +23,18 @@
 from __future__ import unicode_literals
 
 import copy
+import numbers
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
 
 import logging
 logger = logging.getLogger(__name__)
@@ -66,18 +78,55 @@ class RowDataCollection(object):
         self._updateCallback = kwargs.get('update_callback', None)
         self.has_dummy = False
 
+        # Lookups of the data objects in _collection by data_type. See
+        # _dataObjectIndex() for how they're kept up to date.
+        self._lookup = {}
+        self._indexes = {}
+
     @classmethod
     def bulkInitCollection(cls, dataobjects, **kwargs):
         rc = cls(**kwargs)
         for d in dataobjects:
             rc._collection.append(d)
             rc._max = len(rc._collection)
+        rc._updateLookup()
         return rc
 
     @property
     def row_count(self):
         return self.numberOfRows()
 
+    @property
+    def has_changed(self):
+        """True if any of the data objects have been changed.
+
+        See Also:
+            ADataRowObject.setChangeStatus
+        """
+        for obj in self._collection:
+            if obj.has_changed:
+                return True
+        return False
+
+    def compact(self):
+        """Store the values of the numeric data objects compactly.
+
+        See Also:
+            ANumericData.compact
+        """
+        for obj in self._collection:
+            if hasattr(obj, 'compact'):
+                obj.compact()
+
+    def setChangeStatus(self, status):
+        """Set the has_changed status of all of the data objects.
+
+        Args:
+            status(bool): the new has_changed status.
+        """
+        for obj in self._collection:
+            obj.setChangeStatus(status)
+
 
 #     def initCollection(self, dataobject):
     def addToCollection(self, dataobject, index=None):
@@ -101,13 +150,12 @@ class RowDataCollection(object):
             except IndexError:
                 raise('Index %s does not exist in collection' % index)
         self._max = len(self._collection)
+        self._updateLookup()
 
     def indexOfDataObject(self, key):
         """Get the index of the DataObject with data_type equal to key.
         """
-        for i, c in enumerate(self._collection):
-            if c.data_type == key:
-                return i
+        return self._dataObjectIndex(key)
 
     def iterateRows(self, key=None):
         """Returns a generator for iterating through the rows in the collection.
@@ -179,11 +227,10 @@ class RowDataCollection(object):
             able to change it without affecting the main copy use
             getDataObjectCopy().
         """
-        for obj in self._collection:
-            if obj.data_type == name_key:
-                return obj
-        else:
+        index = self._dataObjectIndex(name_key)
+        if index is None:
             raise KeyError('name_key %s was not found in collection' % (name_key))
+        return self._collection[index]
 
     def dataObjectAsList(self, key):
         """Returns a DataObject as a list.
@@ -272,6 +319,105 @@ class RowDataCollection(object):
             vals[c.data_type] = inner
         return vals
 
+    def toArrays(self, keys=None, copy=True):
+        """Returns the row data as numpy arrays.
+
+        By default the values are copied into new arrays. With copy=False the
+        values of numeric data objects (FloatData and IntData) are compacted
+        and returned as a read-only view (see ANumericData.buffer()) instead,
+        so no values are copied.
+
+        Warning:
+            While a view exists the storage behind it can't be resized, so
+            addRow() and deleteRow() on the collection will raise a
+            BufferError. Only use copy=False if the arrays will be deleted
+            before the collection is changed.
+
+        Numeric data objects that can't be compacted (e.g. they contain
+        blanks) are always copied into a float array with NaN in place of the
+        blanks. The values of the other data objects are always copied into
+        an array.
+
+        Args:
+            keys=None(list): the ROW_DATA_TYPES to return. If None all of the
+                data objects in the collection will be returned.
+            copy=True(bool): if False the numeric values will be viewed
+                rather than copied. See the warning above.
+
+        Returns:
+            OrderedDict - containing a numpy array of values by ROW_DATA_TYPE.
+
+        Raises:
+            ImportError: if numpy is not installed.
+            KeyError: If key does not exist.
+        """
+        if np is None:
+            raise ImportError('numpy is needed to convert the row data to arrays')
+        if keys is None:
+            keys = self.collectionTypes()
+
+        arrays = OrderedDict()
+        for key in keys:
+            obj = self.dataObject(key)
+            if self.has_dummy:
+                arrays[key] = np.array(obj.data_collection[:0])
+            else:
+                arrays[key] = self._dataObjectArray(obj, copy)
+        return arrays
+
+    def toDataFrame(self, keys=None, names=None, copy=True):
+        """Returns the row data as a pandas DataFrame.
+
+        The DataFrame can keep the arrays it's given for as long as it
+        exists, so with copy=False rows can't be added to or deleted from the
+        collection until the DataFrame has been deleted (see toArrays()).
+
+        Args:
+            keys=None(list): the ROW_DATA_TYPES to include. If None all of
+                the data objects in the collection will be included.
+            names=None(dict): column names to use for the ROW_DATA_TYPES. Any
+                that aren't in names will use the ROW_DATA_TYPE.
+            copy=True(bool): if False the numeric columns may be views of the
+                collection values. See toArrays().
+
+        Returns:
+            pandas.DataFrame - with a column for each ROW_DATA_TYPE.
+
+        Raises:
+            ImportError: if pandas is not installed.
+            KeyError: If key does not exist.
+
+        See Also:
+            toArrays
+        """
+        if pd is None:
+            raise ImportError('pandas is needed to convert the row data to a DataFrame')
+        arrays = self.toArrays(keys, copy)
+        if names is not None:
+            arrays = OrderedDict((names.get(k, k), v) for k, v in arrays.items())
+        return pd.DataFrame(arrays, copy=copy)
+
+    def _dataObjectArray(self, obj, copy):
+        """Get the values of a data object as a numpy array.
+
+        See Also:
+            toArrays
+        """
+        if not isinstance(obj, ANumericData):
+            return np.array(list(obj.data_collection))
+
+        if obj.compact():
+            values = np.frombuffer(obj.buffer(), dtype=obj.TYPECODE)
+            if copy:
+                return values.copy()
+            values.flags.writeable = False
+            return values
+
+        nan = float('nan')
+        return np.array([
+            v if isinstance(v, numbers.Real) else nan for v in obj.data_collection
+        ], dtype=float)
+
     def dataValue(self, key, index):
         """Get the value in a DataObject at index.
 
@@ -286,12 +432,10 @@ class RowDataCollection(object):
             KeyError - if key does not exist in collection.
             IndexError - if index does not exist in DataObject.
         """
-        for c in self._collection:
-            if c.data_type == key:
-                val = c.getValue(index)
-                return val
-        else:
+        i = self._dataObjectIndex(key)
+        if i is None:
             raise KeyError('DataObject %s does not exist in collection' % key)
+        return self._collection[i].getValue(index)
 
     def _addValue(self, key, value=None):
         """Add a new value to the data object in the collection as referenced by
@@ -315,12 +459,10 @@ class RowDataCollection(object):
             sure that they are dealt with/passed on from here.
         """
         # Find the collection by the key and add the value to it.
-        for c in self._collection:
-            if c.data_type == key:
-                c.addValue(value)
-                break
-        else:
+        i = self._dataObjectIndex(key)
+        if i is None:
             raise KeyError('Key %s does not exist in collection' % (key))
+        self._collection[i].addValue(value)
 
         # Do this after so it's not removed when something goes wrong
         if self.has_dummy:
@@ -345,16 +487,10 @@ class RowDataCollection(object):
             ValueError: If the value is not appropriate for the data type
         """
         # Find the collection by the key and add the value to it.
-        for c in self._collection:
-            if c.data_type == key:
-
-                try:
-                    c.setValue(value, index)
-                    break
-                except ValueError:
-                    raise
-        else:
+        i = self._dataObjectIndex(key)
+        if i is None:
             raise KeyError('Key %s does not exist in collection' % (key))
+        self._collection[i].setValue(value, index)
 
     def getPrintableRow(self, index):
         """ Get the row data in printable form.
@@ -368,11 +504,43 @@ class RowDataCollection(object):
         Returns:
             string formatted for printing to .DAT file.
         """
-        out_str = ''
-        for i, obj in enumerate(self._collection):
-            out_str += obj.getPrintableValue(index)
+        return ''.join([obj.getPrintableValue(index) for obj in self._collection])
+
+    def getPrintableRows(self, start=0, end=None):
+        """Get a block of rows in printable form.
+
+        The values are formatted a column at a time, with
+        ADataRowObject.printableValues(), and then joined into rows. This is
+        much quicker than calling getPrintableRow() for each row.
 
-        return out_str
+        Args:
+            start=0(int): the index of the first row.
+            end=None(int): the index after the last row. If None all of the
+                rows after start will be returned.
+
+        Returns:
+            list - containing a str formatted for printing to .DAT file for
+                each row.
+        """
+        if end is None:
+            end = self.numberOfRows()
+        columns = [
+            obj.printableValues(obj.data_collection[start:end])
+            for obj in self._collection
+        ]
+        return [''.join(row) for row in zip(*columns)]
+
+    def iterPrintableRows(self):
+        """Generator for the printable form of every row in the collection.
+
+        Yields:
+            str - each row formatted for printing to .DAT file.
+
+        See Also:
+            getPrintableRows
+        """
+        for row in self.getPrintableRows():
+            yield row
 
     def updateRow(self, row_vals, index, **kwargs):
         """Add a new row to the units data rows.
@@ -383,17 +551,18 @@ class RowDataCollection(object):
         rather than inserted.
 
         **kwargs:
-            'no_copy'(bool): if True the deepcopy of the object will not be
-                made. This is useful if you are loading a lot of data and don't
-                want the overhead of deepcopy - like loading a new model. 
-                Default is False.
+            'no_copy'(bool): if True the values changed will not be recorded
+                so the row can't be rolled back if something goes wrong. This
+                is useful if you are loading a lot of data and don't want the
+                overhead - like loading a new model. Default is False.
 
         Note: 
             If there is any problem while updating the values in the row all 
             datarow objects will be returned to the state they were in before 
             the operation. This ensures that they don't get out of sync if an 
             error is found halfway through adding the different values. This is 
-            done by creating a deep copy of the object prior to updating.
+            done by recording the values that are changed in a journal so
+            that they can be put back (see _rollback()).
 
         Args:
             row_vals (dict): Contains the names of the data objects of
@@ -409,31 +578,24 @@ class RowDataCollection(object):
         if index > self.row_count:
             raise IndexError
 
-        dataobj_keys = self.collectionTypes()
         vkeys = row_vals.keys()
         for k in vkeys:
-            if not k in dataobj_keys:
+            if self._dataObjectIndex(k) is None:
                 raise KeyError('ROW_DATA_TYPE ' + str(k) + 'is not in collection')
 
-        temp_list = None
+        # Record the values changed so we can put them back if there's a
+        # problem. That way we don't get the lists in the different objects
+        # out of sync.
+        journal = None if no_copy else []
         try:
-            # Need to make a deep copy of the data_object so we can reset them back
-            # to the same place if there's a problem. That way we don't get the lists
-            # in the different objects out of sync.
-            if not no_copy:
-                temp_list = self._deepCopyDataObjects(self._collection)
-
             for key, val in row_vals.items():
-                self._setValue(key, val, index)
+                obj = self.dataObject(key)
+                self._journalValue(journal, obj, index)
+                obj.setValue(val, index)
 
         except (IndexError, ValueError, Exception) as err:
-            self._resetDataObject(temp_list)
+            self._rollback(journal)
             raise err
-        finally:
-            if temp_list is not None:
-                for o in temp_list:
-                    del o
-            del temp_list
 
     def addRow(self, row_vals, index=None, **kwargs):
         """Add a new row to the units data rows.
@@ -448,13 +610,14 @@ class RowDataCollection(object):
             will be returned to the state they were in before the operation.
             This ensures that they don't get out of sync if an error is found
             halfway through adding the different values. This is done by 
-            creating a deep copy of the object prior to updating.
+            recording the values that are added in a journal so that they
+            can be removed again (see _rollback()).
 
         **kwargs:
-            'no_copy'(bool): if True the deepcopy of the object will not be
-                made. This is useful if you are loading a lot of data and don't
-                want the overhead of deepcopy - like loading a new model. 
-                Default is False.
+            'no_copy'(bool): if True the values added will not be recorded so
+                the row can't be rolled back if something goes wrong. This is
+                useful if you are loading a lot of data and don't want the
+                overhead - like loading a new model. Default is False.
 
         Args:
             row_vals (dict): Contains the names of the data objects of
@@ -471,21 +634,17 @@ class RowDataCollection(object):
         if index is not None and index > self.row_count:
             raise IndexError
 
-        dataobj_keys = self.collectionTypes()
         vkeys = row_vals.keys()
         for k in vkeys:
-            if not k in dataobj_keys:
+            if self._dataObjectIndex(k) is None:
                 raise KeyError('ROW_DATA_TYPE ' + str(k) + 'is not in collection')
 
-        temp_list = None
+        # Record the values added so we can remove them if there's a problem.
+        # That way we don't get the lists in the different objects out of sync.
+        journal = None if no_copy else []
         try:
-            # Need to make a deep copy of the data_object so we can reset them back
-            # to the same place if there's a problem. That way we don't get the lists
-            # in the different objects out of sync.
-            if not no_copy:
-                temp_list = self._deepCopyDataObjects(self._collection)
-
             for obj in self._collection:
+                self._journalValue(journal, obj, index)
                 if not obj.data_type in vkeys:
                     if obj.default is not None:
                         obj.addValue(obj.default, index)
@@ -498,33 +657,109 @@ class RowDataCollection(object):
                 raise RuntimeError
 
         except (IndexError, ValueError, Exception):
-            self._resetDataObject(temp_list)
+            self._rollback(journal)
             raise
         except RuntimeError as err:
             logger.error('Collection not in sync!')
             logger.exception(err)
-            self._resetDataObject(temp_list)
+            self._rollback(journal)
             logger.error('Collection reset to previous state')
             raise
-        finally:
-            if temp_list is not None:
-                for o in temp_list:
-                    del o
-            del temp_list
 
         # Do this after so it's not removed if something goes wrong
         if self.has_dummy:
             self.deleteRow(0, no_copy=True)
             self.has_dummy = False
 
+    def addColumns(self, columns, index=None):
+        """Add a block of rows to the collection a column at a time.
+
+        This does the same as calling addRow() for each row, but the keys and
+        defaults are only checked once and the values are added to each data
+        object in one call (see ADataRowObject.addValues()). It's much faster
+        when loading a lot of rows.
+
+        Note:
+            If there is any problem while adding the values all of the data
+            objects will be returned to the state they were in before the
+            operation. Only the number of values in each data object needs to
+            be recorded to do this, so there's no no_copy kwarg.
+
+        Args:
+            columns(dict): Contains the names of the data objects of the
+                collection as keys and a list (or other sequence, e.g. an
+                array) of the new row values as values. All of the lists must
+                be the same length. Data objects that aren't in columns, and
+                values that are None, will get the default value of the data
+                object.
+            index=None(int): The index at which to insert the first row. If
+                None the rows will be appended to the end of the collection.
+
+        Raises:
+            KeyError: If any of the keys don't exist.
+            IndexError: If the index doesn't exist.
+            ValueError: If the columns are different lengths, any of the
+                values are invalid, or a data object that doesn't have a
+                default value isn't in columns or has a None value.
+        """
+        if index is not None and index > self.row_count:
+            raise IndexError
+
+        for k in columns.keys():
+            if self._dataObjectIndex(k) is None:
+                raise KeyError('ROW_DATA_TYPE ' + str(k) + 'is not in collection')
+
+        lengths = set(len(v) for v in columns.values())
+        if len(lengths) > 1:
+            raise ValueError('Columns must all be the same length')
+        count = lengths.pop() if lengths else 0
+        if count < 1:
+            return
+
+        for obj in self._collection:
+            if obj.default is not None:
+                continue
+            if obj.data_type not in columns or \
+                    any(v is None for v in columns[obj.data_type]):
+                raise ValueError('No value or default for %s' % obj.data_type)
+
+        # The values are all added in one place, so they can be removed again
+        # using the original length of each data object
+        start = 0 if self.has_dummy else index
+        restore = [(obj, len(obj), obj.has_changed) for obj in self._collection]
+        try:
+            for obj in self._collection:
+                values = columns.get(obj.data_type, None)
+                if values is None:
+                    values = [obj.default] * count
+                obj.addValues(values, start)
+
+            if not self.checkRowsInSync():
+                raise RuntimeError('RowCollection objects are not in sync')
+
+        except Exception:
+            for obj, length, has_changed in restore:
+                first = length if start is None else start
+                del obj.data_collection[first:first + len(obj) - length]
+                obj._max = len(obj.data_collection)
+                obj.has_changed = has_changed
+            raise
+
+        # Do this after so it's not removed if something goes wrong. The
+        # rows were added before it, so it's at the end.
+        if self.has_dummy:
+            for obj in self._collection:
+                obj.deleteValue(count)
+            self.has_dummy = False
+
     def deleteRow(self, index, **kwargs):
         """Delete a row from the collection.
 
         **kwargs:
-            'no_copy'(bool): if True the deepcopy of the object will not be
-                made. This is useful if you are loading a lot of data and don't
-                want the overhead of deepcopy - like deleting the dummy row. 
-                Default is False.
+            'no_copy'(bool): if True the values deleted will not be recorded
+                so the row can't be put back if something goes wrong. This is
+                useful if you are loading a lot of data and don't want the
+                overhead - like deleting the dummy row. Default is False.
 
         Args:
             index(int): the index to delete the values for.
@@ -537,25 +772,15 @@ class RowDataCollection(object):
         if index < 0 or index > self.row_count:
             raise IndexError
 
-        temp_list = None
+        journal = None if no_copy else []
         try:
-            # Need to make a deep copy of the data_object so we can reset them back
-            # to the same place if there's a problem. That way we don't get the lists
-            # in the different objects out of sync.
-            if not no_copy:
-                temp_list = self._deepCopyDataObjects(self._collection)
-
             for obj in self._collection:
+                self._journalValue(journal, obj, index)
                 obj.deleteValue(index)
 
         except (IndexError, ValueError, Exception):
-            self._resetDataObject(temp_list)
+            self._rollback(journal)
             raise
-        finally:
-            if temp_list is not None:
-                for o in temp_list:
-                    del o
-            del temp_list
 
     def collectionTypes(self):
         """Get a list of the types (names) of all the objects in the collection.
@@ -588,12 +813,10 @@ class RowDataCollection(object):
             ADataRowObject or False if the key doesn't match any in the 
             collection.
         """
-        for obj in self._collection:
-            if obj.data_type == name_key:
-                obj_copy = self._deepCopyDataObjects(obj)
-                return obj_copy
-        else:
+        index = self._dataObjectIndex(name_key)
+        if index is None:
             raise KeyError('name_key %s was not found in collection' % (name_key))
+        return self._deepCopyDataObjects(self._collection[index])
 
     def deleteDataObject(self, name_key):
         """Delete the ADataRowObject instance requested.
@@ -605,13 +828,13 @@ class RowDataCollection(object):
         Returns:
             True if the object was successfully deleted; False if not.
         """
-        for obj in self._collection:
-            if obj.data_type == name_key:
-                self._collection.remove(obj)
-                self._max = len(self._collection)
-                return True
-        else:
+        index = self._dataObjectIndex(name_key)
+        if index is None:
             return False
+        del self._collection[index]
+        self._max = len(self._collection)
+        self._updateLookup()
+        return True
 
     def setDummyRow(self, row_vals):
         """Sets a special 'dummy row' as a placeholder until actual values.
@@ -665,20 +888,96 @@ class RowDataCollection(object):
 
         return lengths[1:] == lengths[:-1]
 
-    def _resetDataObject(self, temp_list):
-        """Reset the data_objects list to its previous state.
+    def _journalValue(self, journal, obj, index):
+        """Record the state of a data object before a value in it is changed.
+
+        Only the value at index and the length of the data object are stored,
+        which is enough for _rollback() to undo a single addValue(),
+        setValue() or deleteValue() call at index.
 
-        This method is called when there is a problem with updating the data_objects
-        list. It returns the self owned versions to their original state.
+        Args:
+            journal(list): the journal to add to. If None nothing is recorded.
+            obj(ADataRowObject): the data object about to be changed.
+            index(int): the index that is about to be changed. May be None
+                if the value is being appended. Negative indexes are stored
+                as the position they refer to, clamped to the range that
+                list.insert() uses.
+        """
+        if journal is None:
+            return
+        length = len(obj.data_collection)
+        if index is not None:
+            if index < 0:
+                index = max(length + index, 0)
+            index = min(index, length)
+        old_value = None
+        if index is not None and index < length:
+            old_value = obj.data_collection[index]
+        journal.append((obj, index, old_value, length, obj.has_changed))
+
+    def _rollback(self, journal):
+        """Undo the changes recorded by _journalValue().
+
+        The entries are undone in reverse order. Whether a value was added,
+        set or deleted is worked out from the change in length of the data
+        object, so an entry for a call that failed before changing anything
+        is left alone.
+
+        Args:
+            journal(list): the entries recorded with _journalValue(). If None
+                nothing is done.
+        """
+        if journal is None:
+            return
+        for obj, index, old_value, length, has_changed in reversed(journal):
+            data = obj.data_collection
+            if len(data) > length:
+                if index is None or index >= length:
+                    index = length
+                del data[index]
+            elif len(data) < length:
+                data.insert(index, old_value)
+            elif index is not None and index < length:
+                data[index] = old_value
+            obj._max = len(data)
+            obj.has_changed = has_changed
+        del journal[:]
+
+    def _dataObjectIndex(self, key):
+        """Get the index in _collection of the data object for key.
+
+        Uses the data_type lookups rather than searching _collection. The
+        lookup is checked against _collection before it's used, and rebuilt
+        if it's out of date or the key isn't found, so it stays correct even
+        if _collection is changed directly.
 
         Args:
-            temp_list: The versions to return the objects to.
+            key: the data_type of the data object.
+
+        Return:
+            int - the index of the first data object with data_type == key,
+                or None if there isn't one.
         """
-        if temp_list is not None:
-            self._collection = temp_list
-            for o in temp_list:
-                del o
-            del temp_list
+        index = self._indexes.get(key, None)
+        if index is not None and index < len(self._collection) and \
+                self._collection[index] is self._lookup[key]:
+            return index
+
+        self._updateLookup()
+        return self._indexes.get(key, None)
+
+    def _updateLookup(self):
+        """Update the data_type lookups to match the contents of _collection.
+
+        If more than one data object has the same data_type the first one is
+        used, the same as it would be when searching _collection.
+        """
+        self._lookup = {}
+        self._indexes = {}
+        for i, obj in enumerate(self._collection):
+            if not obj.data_type in self._lookup:
+                self._lookup[obj.data_type] = obj
+                self._indexes[obj.data_type] = i
 
     def _deepCopyDataObjects(self, obj):
         """Create a deep copy of the data_objects
@@ -31,8 +31,10 @@ from datetime import datetime
 from ship.fmp.datunits.isisunit import AUnit
 from ship.fmp.datunits import ROW_DATA_TYPES as rdt
 from ship.fmp.datunits.isisunit import CommentUnit
+from ship.fmp.datunits.isisunit import UnknownUnit
 from ship.fmp import fmpunitfactory as iuf
 from ship.fmp import unitgroups as ugroups
+from ship.datastructures.positionindex import PositionIndex
 from ship.utils import utilfunctions as uf
 from ship.utils import filetools as ft
 
@@ -41,6 +43,100 @@ logger = logging.getLogger(__name__)
 """logging references with a __name__ set to this module."""
 
 
+class LazyUnit(object):
+    """Placeholder for a unit that has been indexed but not read yet.
+
+    Created by the DatLoader when loading in lazy mode. Stores the location of
+    the unit in the .dat file contents along with the FILE_KEY, unit_type and
+    name found during the index scan. The unit will be read by the
+    FmpUnitFactory the first time it is accessed and the LazyUnit will then be
+    replaced by the real AUnit in the DatCollection.
+
+    Any attribute that is not held by the LazyUnit will cause the unit to be
+    read and the attribute will be fetched from the loaded AUnit instead.
+    This means that code which accesses DatCollection.units directly will
+    still work as expected.
+
+    See Also:
+        DatLoader.buildLazyDat
+    """
+
+    def __init__(self, collection, contents, unit_factory, unit_class,
+                 file_key, start_line, end_line, file_order):
+        """Constructor.
+
+        Args:
+            collection(DatCollection): the collection this unit is held in.
+            contents(list): all of the lines in the .dat file.
+            unit_factory(FmpUnitFactory): the factory used to read the unit.
+            unit_class(AUnit): the class of the unit that will be read.
+            file_key(str): the AUnit.FILE_KEY of the unit.
+            start_line(int): the contents index that the unit starts on.
+            end_line(int): the last contents index of the unit.
+            file_order(int): the order of the unit in the .dat file.
+        """
+        self._collection = collection
+        self._contents = contents
+        self._unit_factory = unit_factory
+        self.unit_class = unit_class
+        self.file_key = file_key
+        self.start_line = start_line
+        self.end_line = end_line
+        self.file_order = file_order
+        self._unit_type = unit_class.UNIT_TYPE
+        self._unit_category = unit_class.UNIT_CATEGORY
+
+        name_line = unit_class.FILE_NAME_LINE
+        if name_line is not None:
+            self._name = contents[start_line + name_line][:12].strip()
+        else:
+            self._name = unit_class()._name
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def unit_type(self):
+        return self._unit_type
+
+    @property
+    def unit_category(self):
+        return self._unit_category
+
+    def __getattr__(self, name):
+        """Read the unit and return the requested attribute from it.
+
+        This is only called when the attribute is not found on the LazyUnit.
+        """
+        # Don't load on special methods (e.g. copy/pickle protocol lookups)
+        collection = self.__dict__.get('_collection', None)
+        if name.startswith('__') or collection is None:
+            raise AttributeError(name)
+        unit = collection._loadLazyUnit(self)
+        return getattr(unit, name)
+
+    def readUnit(self):
+        """Read the unit from the .dat file contents.
+
+        Return:
+            tuple(AUnit, int) - the loaded unit and the last contents index
+                that was read by it.
+        """
+        file_line, unit = self._unit_factory.createUnitFromFile(
+            self._contents, self.start_line, self.file_key, self.file_order
+        )
+        return unit, file_line
+
+    def sourceLines(self):
+        """Get the lines of the .dat file that this unit was indexed from.
+
+        Return:
+            list - the unit lines, as found in the file, without newlines.
+        """
+        return [l.rstrip('\n') for l in self._contents[self.start_line:self.end_line + 1]]
+
+
 class DatCollection(object):
     """Collection of isisunit type classes.
 
@@ -68,13 +164,28 @@ class DatCollection(object):
         self.path_holder = path_holder
         self._ic_index = -999  # DON'T MESS WITH THIS!
         self._gis_index = -999  # DON'T MESS WITH THIS!
+
+        # Lookup tables for finding units without scanning self.units.
+        # _name_index holds a list of the units with each name and
+        # _positions the index of each unit in self.units. The units tell the
+        # collection when they are renamed (see observedLabelChange()).
+        self._name_index = {}
+        self._indexed_names = {}
+        self._positions = PositionIndex()
+
+        # Graph of the links between units. Built the first time it's needed
+        # and then kept up to date as units are added and removed.
+        self._network = None
         self._min = 0
         self._max = len(self.units)
         self._current = 0
 
     def __iter__(self):
         """Return an iterator for the units list"""
-        return iter(self.units)
+        i = 0
+        while i < len(self.units):
+            yield self._loadUnit(i)
+            i += 1
 
     def __next__(self):
         """Iterate to the next unit"""
@@ -90,7 +201,9 @@ class DatCollection(object):
         Returns:
             contents of the units element at index.
         """
-        return self.units[key]
+        if isinstance(key, slice):
+            return [self._loadUnit(i) for i in range(*key.indices(len(self.units)))]
+        return self._loadUnit(key)
 
 
 #     def __setitem__(self, key, value):
@@ -132,7 +245,7 @@ class DatCollection(object):
         Raises:
             AttributeError: When a non-isisunit type is given.
         """
-        if not isinstance(unit, AUnit):
+        if not isinstance(unit, (AUnit, LazyUnit)):
             raise AttributeError('Given unit is not of type AUnit')
         update_node_count = kwargs.get('update_node_count', True)
         ics = kwargs.get('ics', {})
@@ -145,29 +258,29 @@ class DatCollection(object):
                 unit._unit_type == 'initial_conditions':
             if unit._unit_type == 'header':
                 if self.units and self.units[0]._unit_type == 'header':
-                    self.units[0] = unit
+                    self._replaceUnit(0, unit)
                 else:
-                    self.units.insert(0, unit)
+                    self._insertUnit(0, unit)
 
             elif unit._unit_type == 'gis_info':
                 if self._gis_index == -999:
-                    self.units.append(unit)
+                    self._insertUnit(len(self.units), unit)
                     self._gis_index = len(self.units) - 1
                 else:
-                    self.units[self._gis_index] = unit
+                    self._replaceUnit(self._gis_index, unit)
 
             else:
                 # If it already exists in the collection
                 if self._ic_index != -999:
-                    self.units[self._ic_index] = unit
+                    self._replaceUnit(self._ic_index, unit)
                 else:
                     # If gis_info unit exists put it before that, otherwise it
                     # goes on the end
                     if self._gis_index == -999:
-                        self.units.append(unit)
+                        self._insertUnit(len(self.units), unit)
                         self._ic_index = len(self.units) - 1
                     else:
-                        self.units.insert(self._gis_index, unit)
+                        self._insertUnit(self._gis_index, unit)
                         self._ic_index = self._gis_index - 1
 
             self._max = len(self.units)
@@ -185,11 +298,11 @@ class DatCollection(object):
         elif self._gis_index != -999 and index > self._gis_index:
             index = self._gis_index
         elif index > len(self.units):
-            self.units.append(unit)
+            self._insertUnit(len(self.units), unit)
             index = None
 
         if index is not None:
-            self.units.insert(index, unit)
+            self._insertUnit(index, unit)
             if self._ic_index != -999:
                 self._ic_index += 1
             if self._gis_index != -999:
@@ -236,6 +349,7 @@ class DatCollection(object):
             index = self.index(unit, unit_type)
 
         if index != -1:
+            self._loadUnit(index)
             name = self.units[index]._name
             name_ds = self.units[index]._name_ds
             utype = self.units[index]._unit_type
@@ -249,8 +363,13 @@ class DatCollection(object):
                     except KeyError:
                         logger.warning('No intitial conditions found for initial conditions label: ' + name)
 
-            header.head_data['node_count'].value = ic.node_count
-            del self.units[index]
+                header.head_data['node_count'].value = ic.node_count
+
+            self._deleteUnit(index)
+            if self._ic_index != -999 and self._ic_index > index:
+                self._ic_index -= 1
+            if self._gis_index != -999 and self._gis_index > index:
+                self._gis_index -= 1
             self._max = len(self.units)
             return True
 
@@ -277,17 +396,12 @@ class DatCollection(object):
             int - the index of the given unit, or -1 if it could not be found.
         """
         index = -1
-        if isinstance(unit, AUnit):
-            index = self.units.index(unit)
+        if isinstance(unit, (AUnit, LazyUnit)):
+            index = self._position(unit)
+            if index == -1:
+                raise ValueError('unit is not in the collection')
         elif uf.isString(unit):
-            for i, u in enumerate(self.units):
-                if u.name == unit:
-                    if unit_type == u.unit_type:
-                        index = i
-                        break
-                    elif unit_type is None:
-                        index = i
-                        break
+            index = self._findByName(unit, unit_type=unit_type)
         else:
             index = -1
 
@@ -297,22 +411,39 @@ class DatCollection(object):
         """Get the formatted contents of each isisunit in the collection.
 
         Iterates through each of the units in the collection and
-        calls their getData() method.
+        calls their getData() method. Units that were read from a file and
+        haven't changed since are written out as the lines they were read
+        from instead, to avoid formatting them again.
 
         Returns:
             List containing all lines for each unit formatted for printing
                 out to the dat file.
+
+        See Also:
+            iterPrintableContents
         """
-        out_data = []
         logger.debug('Returning printable unit data')
+        return list(self.iterPrintableContents())
 
-        # For each unit call the isisunit object and ask it
-        # for its .DAT file formatted text to save to file
-        for u in self.units:
-            logger.debug('Unit Type: ' + u._unit_type)
-            out_data.extend(u.getData())
+    def iterPrintableContents(self):
+        """Generator for the formatted contents of the collection.
 
-        return out_data
+        The same as getPrintableContents() except that the lines are created
+        as they are needed, one unit at a time, rather than all being held in
+        a list.
+
+        Yields:
+            str - each line of each unit formatted for printing out to the dat
+                file.
+        """
+        for u in self.units:
+            # Units that have never been read can't have changed
+            if isinstance(u, LazyUnit) or not u.has_changed:
+                lines = u.sourceLines()
+            else:
+                lines = u.iterData()
+            for line in lines:
+                yield line
 
     def write(self, filepath=None, overwrite=False):
         """Write the contents of this file to disk.
@@ -340,8 +471,7 @@ class DatCollection(object):
         if not overwrite and os.path.exists(filepath):
             raise IOError('filepath %s already exists. Set overwrite=True to ignore this warning.' % filepath)
 
-        contents = self.getPrintableContents()
-        ft.writeFile(contents, filepath)
+        ft.writeFile(self.iterPrintableContents(), filepath)
 
     def unitsByCategory(self, unit_keys):
         """Return all the units in the requested unit(s).
@@ -367,9 +497,9 @@ class DatCollection(object):
             unit_keys = [unit_keys]
 
         types = []
-        for u in self.units:
+        for i, u in enumerate(self.units):
             if u.unit_category in unit_keys:
-                types.append(u)
+                types.append(self._loadUnit(i))
 
         return types
 
@@ -402,9 +532,9 @@ class DatCollection(object):
             type_keys = [type_keys]
 
         types = []
-        for u in self.units:
+        for i, u in enumerate(self.units):
             if u.unit_type in type_keys:
-                types.append(u)
+                types.append(self._loadUnit(i))
 
         return types
 
@@ -422,6 +552,7 @@ class DatCollection(object):
             Remove this function it can be accessed through the variables or
             by setting up a property if needed.
         """
+        self._loadAllUnits()
         return self.units
 
     def unit(self, key, unit_type=None, unit_category=None):
@@ -452,9 +583,9 @@ class DatCollection(object):
         # Do a quick lookup on these as we know roughly where they are
         if key == 'initial_conditions':
             if self.units and self.units[-1]._unit_type == 'initial_conditions':
-                return self.units[-1]
+                return self._loadUnit(len(self.units) - 1)
             elif len(self.units) > 1 and self.units[-2]._unit_type == 'initial_conditions':
-                return self.units[-2]
+                return self._loadUnit(len(self.units) - 2)
             else:
                 return False
         if key == 'header':
@@ -463,16 +594,10 @@ class DatCollection(object):
             else:
                 return False
 
-        for u in self.units:
-            if u.name == key:
-                if unit_type is None and unit_category is None:
-                    return u
-                elif unit_type and u.unit_type == unit_type:
-                    return u
-                elif unit_category and u.unit_category == unit_category:
-                    return u
-        else:
+        index = self._findByName(key, unit_type, unit_category)
+        if index == -1:
             return False
+        return self._loadUnit(index)
 
     def setUnit(self, unit):
         """Replace the contents of a certain unit with the given one.
@@ -488,6 +613,8 @@ class DatCollection(object):
         Raises:
             NameError, AttributeError - if the .name or .unit_type could not
             be found.
+            KeyError - if there is no unit with a matching .name and 
+            .unit_type in the collection.
         """
         try:
             name = unit._name
@@ -497,12 +624,10 @@ class DatCollection(object):
             logger.exception(err)
             raise
 
-        index = self.index(unit._name, unit._unit_type)
-        self.units[index] = unit
-
-        for i, u in enumerate(self.units, 0):
-            if u.name == unit.name:
-                self.units[i] = unit
+        index = self.index(unit.name, unit._unit_type)
+        if index == -1:
+            raise KeyError('No %s unit called %s in the collection' % (utype, unit.name))
+        self._replaceUnit(index, unit)
 
     def numberOfUnits(self):
         """The number of units currently held in the collection.
@@ -513,65 +638,273 @@ class DatCollection(object):
         return len(self.units)
 
     def linkedUnits(self, unit):
+        """Get all of the units directly associated with the given unit.
+
+        Uses the UnitNetwork to find the units that reference the same labels
+        as the given unit, so the rest of the model doesn't need checking.
+
+        Args:
+            unit(AUnit): the unit to find the associates of.
+
+        Return:
+            LinkedUnits - containing the associates of unit.
+
+        See Also:
+            LinkedUnits, UnitNetwork
         """
-        """
+        if isinstance(unit, LazyUnit):
+            unit = self._loadLazyUnit(unit)
+        network = self.unitNetwork()
         linksect = ugroups.LinkedUnits(unit)
         index = self.index(unit)
         linksect.addLinkedUnit(self.units[index - 1], 'upstream')
         linksect.addLinkedUnit(self.units[index + 1], 'downstream')
 
-        unit_links = [val for val in unit.linkLabels().values() if val.strip() != '']
-        unit_links = set(unit_links)
-        associates = []         # Used for named_units in linksect
-        temp_junctions = []     # Store any junctions that refer to this unit
+        # Keep the associates in the same order as the units
+        named = network.namedUnits(unit)
+        linksect.named_units = sorted(named, key=self._position)
+        junctions = network.junctions(unit)
+        linksect.junctions = sorted(junctions, key=lambda j: self._position(j[0]))
+        return linksect
 
-        # Store the name, name_ds and index of the units in this collection
-        # so that we don't have to loop twice
-        temp_locations = {}
-        for i, u in enumerate(self.units):
+    def unitNetwork(self):
+        """Get the graph of the links between the units in the collection.
 
-            # Add the name, name_ds and index of all the units
-            # Same name's/name_ds' are stored in a list
-            if not u.name in temp_locations.keys():
-                temp_locations[u.name] = []
-            if u.name_ds != 'unknown' and not u.name_ds in temp_locations.keys():
-                temp_locations[u.name_ds] = []
-            if not i in temp_locations[u.name]:
-                temp_locations[u.name].append(i)
-            if u.name_ds != 'unknown' and not i in temp_locations[u.name_ds]:
-                temp_locations[u.name_ds].append(i)
-
-            # Check if unit is in the linkLabels of u and add to associates or
-            # temp_junctions as appropriate if it is
-            links = [val for val in u.linkLabels().values() if val.strip() != '']
-            if not unit_links.isdisjoint(links):
-                if u.unit_type == 'junction':
-                    temp_junctions.append((u, links))
-                else:
-                    if not u == unit:
-                        associates.append(u)
-
-        # Check all of the junction linkLabels that we found and put the actual
-        # unit in the list for each name it references
-        junctions = []
-        if temp_junctions:
-            for i, junc in enumerate(temp_junctions):
-                junctions.append((junc[0], []))
-                for link in junc[1]:
-                    for index in temp_locations[link]:
-                        if not self.units[index] in junctions[i][1] and not \
-                                self.units[index].unit_type == 'junction':
-                            junctions[i][1].append(self.units[index])
-
-        linksect.named_units = associates
-        linksect.junctions = junctions
-
-        del junctions
-        del associates
-        del temp_junctions
-        del temp_locations
+        The UnitNetwork is built the first time this is called and then
+        updated as units are added to and removed from the collection, or
+        have their labels changed.
 
-        return linksect
+        Return:
+            UnitNetwork - containing all of the units in the collection.
+
+        See Also:
+            UnitNetwork
+        """
+        if self._network is None:
+            # Every unit's linkLabels() are needed so make sure they're all read
+            self._loadAllUnits()
+            self._network = ugroups.UnitNetwork(self.units)
+        return self._network
+
+    def _loadUnit(self, index):
+        """Get the unit at index, reading it first if it is a LazyUnit.
+
+        When a LazyUnit is read it is replaced in the collection by the
+        loaded AUnit. If the unit used fewer lines than were indexed for it
+        (e.g. there was an unsupported unit after it in the file) the
+        remaining lines are put into an UnknownUnit after it.
+
+        The InitialConditionsUnit needs to know the labels of all of the other
+        units in the model, so reading it will cause all of the other units
+        to be read first.
+
+        Args:
+            index(int): the index of the unit in the collection.
+
+        Return:
+            AUnit - at the given index.
+        """
+        lazy_unit = self.units[index]
+        if not isinstance(lazy_unit, LazyUnit):
+            return lazy_unit
+        if index < 0:
+            index += len(self.units)
+
+        if lazy_unit._unit_type == 'initial_conditions':
+            for i, u in enumerate(self.units):
+                if isinstance(u, LazyUnit) and not u is lazy_unit:
+                    self._loadUnit(i)
+            index = self._position(lazy_unit)
+
+        unit, file_line = lazy_unit.readUnit()
+        self.swapLazyUnit(lazy_unit, unit, file_line, index)
+        return unit
+
+    def swapLazyUnit(self, lazy_unit, unit, file_line, index=None):
+        """Replace a LazyUnit with the AUnit that was read from it.
+
+        If the unit used fewer lines than were indexed for the LazyUnit the
+        remaining lines are put into an UnknownUnit after it.
+
+        This is used when the units are read somewhere other than through
+        the LazyUnit (e.g. by the DatLoader parallel load mode).
+
+        Args:
+            lazy_unit(LazyUnit): the LazyUnit to replace.
+            unit(AUnit): the unit read from the lazy_unit lines.
+            file_line(int): the last contents index used by the unit.
+            index=None(int): the index of lazy_unit if it's already known.
+        """
+        if index is None:
+            index = self._position(lazy_unit)
+        self._replaceUnit(index, unit)
+
+        if file_line < lazy_unit.end_line:
+            unknown = UnknownUnit()
+            unknown.readUnitData(
+                [l.rstrip('\n') for l in lazy_unit._contents[file_line + 1:lazy_unit.end_line + 1]]
+            )
+            self._insertUnit(index + 1, unknown)
+            if self._ic_index != -999 and self._ic_index > index:
+                self._ic_index += 1
+            if self._gis_index != -999 and self._gis_index > index:
+                self._gis_index += 1
+            self._max = len(self.units)
+
+    def _loadLazyUnit(self, lazy_unit):
+        """Read the given LazyUnit and return the loaded AUnit.
+
+        Args:
+            lazy_unit(LazyUnit): a LazyUnit held in this collection.
+
+        Return:
+            AUnit - read from the LazyUnit.
+        """
+        return self._loadUnit(self._position(lazy_unit))
+
+    def _insertUnit(self, index, unit):
+        """Insert a unit into self.units and update the lookup tables.
+
+        Args:
+            index(int): the index to insert the unit at.
+            unit(AUnit): the unit to insert.
+        """
+        self.units.insert(index, unit)
+        self._positions.insert(index, unit)
+        self._addToNetwork(unit)
+        self._addToNameIndex(unit)
+
+    def _replaceUnit(self, index, unit):
+        """Replace the unit at index and update the lookup tables.
+
+        Args:
+            index(int): the index of the unit to replace.
+            unit(AUnit): the unit to put in its place.
+        """
+        old_unit = self.units[index]
+        self._removeFromNameIndex(old_unit)
+        self.units[index] = unit
+        self._positions.delete(index)
+        self._positions.insert(index, unit)
+        if self._network is not None:
+            self._network.removeUnit(old_unit)
+            self._addToNetwork(unit)
+        self._addToNameIndex(unit)
+
+    def _deleteUnit(self, index):
+        """Delete the unit at index and update the lookup tables.
+
+        Args:
+            index(int): the index of the unit to delete.
+        """
+        old_unit = self.units[index]
+        self._removeFromNameIndex(old_unit)
+        del self.units[index]
+        self._positions.delete(index)
+        if self._network is not None:
+            self._network.removeUnit(old_unit)
+
+    def _addToNetwork(self, unit):
+        if self._network is None:
+            return
+        if isinstance(unit, LazyUnit):
+            # Don't read the unit now, the network can be built when needed
+            self._network = None
+        else:
+            self._network.addUnit(unit)
+
+    def _addToNameIndex(self, unit):
+        self._indexName(unit)
+        if isinstance(unit, AUnit):
+            unit.addObserver(self)
+
+    def _removeFromNameIndex(self, unit):
+        self._unindexName(unit)
+        if isinstance(unit, AUnit):
+            unit.removeObserver(self)
+
+    def _indexName(self, unit):
+        name = unit.name
+        self._indexed_names[unit] = name
+        if not name in self._name_index:
+            self._name_index[name] = []
+        self._name_index[name].append(unit)
+
+    def _unindexName(self, unit):
+        name = self._indexed_names.pop(unit, None)
+        units = self._name_index.get(name, [])
+        for i, u in enumerate(units):
+            if u is unit:
+                del units[i]
+                break
+        if not units:
+            self._name_index.pop(name, None)
+
+    def observedLabelChange(self, unit):
+        """Update the lookup tables for a unit that has changed.
+
+        Called by the units in the collection whenever their name, name_ds or
+        the head_data labels that they link to change. Only the given unit is
+        updated.
+
+        Args:
+            unit(AUnit): the unit that changed.
+        """
+        if not unit in self._indexed_names:
+            return
+        if self._indexed_names[unit] != unit.name:
+            self._unindexName(unit)
+            self._indexName(unit)
+        if self._network is not None and unit in self._network:
+            self._network.updateUnit(unit)
+
+    def _position(self, unit):
+        """Get the index of the given unit in self.units.
+
+        Args:
+            unit(AUnit): the unit to find.
+
+        Return:
+            int - the index of the unit or -1 if it's not in the collection.
+        """
+        return self._positions.index(unit)
+
+    def _findByName(self, name, unit_type=None, unit_category=None):
+        """Find the index of the first unit with the given name.
+
+        Uses the name lookup table rather than checking every unit.
+
+        Args:
+            name(str): the AUnit.name to find.
+            unit_type=None(str): the AUnit.unit_type to match.
+            unit_category=None(str): the AUnit.unit_category to match.
+
+        Return:
+            int - the index of the unit or -1 if it couldn't be found.
+        """
+        index = -1
+        for u in self._name_index.get(name, []):
+            if unit_type is None and unit_category is None:
+                pass
+            elif unit_type and u.unit_type == unit_type:
+                pass
+            elif unit_category and u.unit_category == unit_category:
+                pass
+            else:
+                continue
+
+            i = self._position(u)
+            if index == -1 or i < index:
+                index = i
+
+        return index
+
+    def _loadAllUnits(self):
+        """Read any LazyUnit's in the collection."""
+        i = 0
+        while i < len(self.units):
+            self._loadUnit(i)
+            i += 1
 
     @classmethod
     def initialisedDat(cls, dat_path, units=[], **kwargs):
@@ -34,6 +34,7 @@ from collections import OrderedDict
 from ship.fmp.datunits.isisunit import AUnit
 from ship.datastructures import dataobject as do
 from ship.datastructures.rowdatacollection import RowDataCollection
+from ship.datastructures.columnspec import ColumnSpec
 from ship.fmp.datunits import ROW_DATA_TYPES as rdt
 from ship.fmp.headdata import HeadDataItem
 from ship.utils.tools import geometry
@@ -58,6 +59,25 @@ class BridgeUnit (AUnit):
     UNIT_CATEGORY = 'bridge'
     FILE_KEY = None
     FILE_KEY2 = None
+    FILE_NAME_LINE = None
+
+    MAIN_ROW_SPEC = ColumnSpec([
+        (rdt.CHAINAGE, 0, 10), (rdt.ELEVATION, 10, 20), (rdt.ROUGHNESS, 20, 30),
+        (rdt.EMBANKMENT, 40, 51),
+    ])
+    """Layout of the geometry rows in the dat file."""
+
+    OPENING_ROW_SPEC = ColumnSpec([
+        (rdt.OPEN_START, 0, 10), (rdt.OPEN_END, 10, 20),
+        (rdt.SPRINGING_LEVEL, 20, 30), (rdt.SOFFIT_LEVEL, 30, 40),
+    ])
+    """Layout of the opening rows in the dat file."""
+
+    CULVERT_ROW_SPEC = ColumnSpec([
+        (rdt.INVERT, 0, 10), (rdt.SOFFIT, 10, 20), (rdt.AREA, 20, 30),
+        (rdt.CD_PART, 30, 40), (rdt.CD_FULL, 40, 50), (rdt.DROWNING, 50, 60),
+    ])
+    """Layout of the culvert rows in the dat file."""
 
     def __init__(self, **kwargs):
         """Constructor.
@@ -153,29 +173,9 @@ class BridgeUnit (AUnit):
         """
         no_of_chainage_rows = int(unit_data[file_line].strip())
         file_line += 1
-        out_line = file_line + no_of_chainage_rows
-        try:
-            # Load the geometry data
-            for i in range(file_line, out_line):
-
-                chain = unit_data[i][0:10].strip()
-                elev = unit_data[i][10:20].strip()
-                rough = unit_data[i][20:30].strip()
-                try:
-                    bank = unit_data[i][40:51].strip()
-                except:
-                    bank = None
-
-                self.row_data['main'].addRow({
-                    rdt.CHAINAGE: chain, rdt.ELEVATION: elev,
-                    rdt.ROUGHNESS: rough, rdt.EMBANKMENT: bank
-                }, no_copy=True)
-
-        except NotImplementedError:
-            logger.error('Unable to read Unit Data(dataRowObject creation) - NotImplementedError')
-            raise
-
-        return out_line
+        return BridgeUnit.MAIN_ROW_SPEC.readRows(
+            self.row_data['main'], unit_data, file_line, no_of_chainage_rows
+        )
 
     def getData(self):
         """Retrieve the data in this unit.
@@ -218,8 +218,7 @@ class BridgeUnit (AUnit):
         out_data = []
         no_of_rows = self.row_data['main'].row_count
         out_data.append(self._formatDataItem(no_of_rows, 10, is_head_item=False))
-        for i in range(0, no_of_rows):
-            out_data.append(self.row_data['main'].getPrintableRow(i))
+        out_data.extend(self.row_data['main'].getPrintableRows(0, no_of_rows))
 
         return out_data
 
@@ -423,6 +422,7 @@ class BridgeUnitUsbpr (BridgeUnit):
     UNIT_CATEGORY = 'bridge'
     FILE_KEY = 'BRIDGE'
     FILE_KEY2 = 'USBPR1978'
+    FILE_NAME_LINE = 2
 
     def __init__(self, **kwargs):
         """Constructor.
@@ -521,26 +521,9 @@ class BridgeUnitUsbpr (BridgeUnit):
         """
         no_of_opening_rows = int(unit_data[file_line].strip())
         file_line += 1
-        out_line = file_line + no_of_opening_rows
-        try:
-            # Load the geometry data
-            for i in range(file_line, out_line):
-
-                ostart = unit_data[i][0:10].strip()
-                oend = unit_data[i][10:20].strip()
-                spring = unit_data[i][20:30].strip()
-                soffit = unit_data[i][30:40].strip()
-
-                self.row_data['opening'].addRow({
-                    rdt.OPEN_START: ostart, rdt.OPEN_END: oend,
-                    rdt.SPRINGING_LEVEL: spring, rdt.SOFFIT_LEVEL: soffit
-                }, no_copy=True)
-
-        except NotImplementedError:
-            logger.error('Unable to read Unit Data(dataRowObject creation) - NotImplementedError')
-            raise
-
-        return out_line
+        return BridgeUnit.OPENING_ROW_SPEC.readRows(
+            self.row_data['opening'], unit_data, file_line, no_of_opening_rows
+        )
 
     def _readCulvertRowData(self, unit_data, file_line):
         """Load the data defining the culvert openings in the bridge.
@@ -556,29 +539,9 @@ class BridgeUnitUsbpr (BridgeUnit):
         """
         no_of_culvert_rows = int(unit_data[file_line].strip())
         file_line += 1
-        out_line = file_line + no_of_culvert_rows
-        try:
-            # Load the geometry data
-            for i in range(file_line, out_line):
-
-                invert = unit_data[i][0:10].strip()
-                soffit = unit_data[i][10:20].strip()
-                area = unit_data[i][20:30].strip()
-                cd_part = unit_data[i][30:40].strip()
-                cd_full = unit_data[i][40:50].strip()
-                drowning = unit_data[i][50:60].strip()
-
-                self.row_data['culvert'].addRow({
-                    rdt.INVERT: invert, rdt.SOFFIT: soffit, rdt.AREA: area,
-                    rdt.CD_PART: cd_part, rdt.CD_FULL: cd_full,
-                    rdt.DROWNING: drowning
-                }, no_copy=True)
-
-        except NotImplementedError:
-            logger.error('Unable to read Unit Data(dataRowObject creation) - NotImplementedError')
-            raise
-
-        return out_line
+        return BridgeUnit.CULVERT_ROW_SPEC.readRows(
+            self.row_data['culvert'], unit_data, file_line, no_of_culvert_rows
+        )
 
     def _getHeadData(self):
         """Return the extracted header data.
@@ -613,13 +576,11 @@ class BridgeUnitUsbpr (BridgeUnit):
 
         no_of_rows = self.row_data['opening'].row_count
         out_data.append(self._formatDataItem(no_of_rows, 10, is_head_item=False))
-        for i in range(0, no_of_rows):
-            out_data.append(self.row_data['opening'].getPrintableRow(i))
+        out_data.extend(self.row_data['opening'].getPrintableRows(0, no_of_rows))
 
         no_of_rows = self.row_data['culvert'].row_count
         out_data.append(self._formatDataItem(no_of_rows, 10, is_head_item=False))
-        for i in range(0, no_of_rows):
-            out_data.append(self.row_data['culvert'].getPrintableRow(i))
+        out_data.extend(self.row_data['culvert'].getPrintableRows(0, no_of_rows))
 
         return out_data
 
@@ -658,6 +619,7 @@ class BridgeUnitArch (BridgeUnit):
     UNIT_CATEGORY = BridgeUnit.UNIT_CATEGORY
     FILE_KEY = 'BRIDGE'
     FILE_KEY2 = 'ARCH'
+    FILE_NAME_LINE = 2
 
     def __init__(self, **kwargs):
         """Constructor.
@@ -751,26 +713,9 @@ class BridgeUnitArch (BridgeUnit):
         """
         no_of_opening_rows = int(unit_data[file_line].strip())
         file_line += 1
-        out_line = file_line + no_of_opening_rows
-        try:
-            # Load the geometry data
-            for i in range(file_line, out_line):
-
-                ostart = unit_data[i][0:10].strip()
-                oend = unit_data[i][10:20].strip()
-                spring = unit_data[i][20:30].strip()
-                soffit = unit_data[i][30:40].strip()
-
-                self.row_data['opening'].addRow({
-                    rdt.OPEN_START: ostart, rdt.OPEN_END: oend,
-                    rdt.SPRINGING_LEVEL: spring, rdt.SOFFIT_LEVEL: soffit
-                }, no_copy=True)
-
-        except NotImplementedError:
-            logger.error('Unable to read Unit Data(dataRowObject creation) - NotImplementedError')
-            raise
-
-        return out_line
+        return BridgeUnit.OPENING_ROW_SPEC.readRows(
+            self.row_data['opening'], unit_data, file_line, no_of_opening_rows
+        )
 
     def _getAdditionalRowData(self):
         """Get the formatted row data for any additional row data objects.
@@ -781,7 +726,6 @@ class BridgeUnitArch (BridgeUnit):
         out_data = []
         no_of_rows = self.row_data['opening'].row_count
         out_data.append(self._formatDataItem(no_of_rows, 10, is_head_item=False))
-        for i in range(0, no_of_rows):
-            out_data.append(self.row_data['opening'].getPrintableRow(i))
+        out_data.extend(self.row_data['opening'].getPrintableRows(0, no_of_rows))
 
         return out_data
@@ -37,6 +37,7 @@ class CulvertUnit(AUnit):
     UNIT_CATEGORY = 'culvert'
     FILE_KEY = 'CULVERT'
     FILE_KEY2 = None
+    FILE_NAME_LINE = 2
 
     def __init__(self):
         '''Constructor.
@@ -61,6 +62,7 @@ class CulvertUnitInlet(CulvertUnit):
     UNIT_CATEGORY = 'culvert'
     FILE_KEY = 'CULVERT'
     FILE_KEY2 = 'INLET'
+    FILE_NAME_LINE = 2
 
     def __init__(self, **kwargs):
         '''Constructor.
@@ -143,6 +145,7 @@ class CulvertUnitOutlet(CulvertUnit):
     CATEGORY = 'culvert'
     FILE_KEY = 'CULVERT'
     FILE_KEY2 = 'OUTLET'
+    FILE_NAME_LINE = 2
 
     def __init__(self):
         super(CulvertUnitOutlet, self).__init__()
@@ -53,6 +53,7 @@ class GisInfoUnit (AUnit):
     UNIT_CATEGORY = 'gis_info'
     FILE_KEY = 'GISINFO'
     FILE_KEY2 = None
+    FILE_NAME_LINE = None
 
     def __init__(self, **kwargs):
         """Constructor
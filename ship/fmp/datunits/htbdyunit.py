@@ -26,6 +26,7 @@ from ship.fmp.datunits.isisunit import AUnit
 from ship.fmp.datunits import ROW_DATA_TYPES as rdt
 from ship.datastructures import dataobject as do
 from ship.datastructures.rowdatacollection import RowDataCollection
+from ship.datastructures.columnspec import ColumnSpec
 from ship.utils import utilfunctions as uf
 from ship.fmp.headdata import HeadDataItem
 from ship.datastructures import DATA_TYPES as dt
@@ -50,6 +51,10 @@ class HtbdyUnit (AUnit):
     UNIT_CATEGORY = 'boundary_ds'
     FILE_KEY = 'HTBDY'
     FILE_KEY2 = None
+    FILE_NAME_LINE = 1
+
+    ROW_SPEC = ColumnSpec([(rdt.ELEVATION, 0, 10), (rdt.TIME, 10, 20)])
+    """Layout of the rows in the dat file."""
 
     def __init__(self, **kwargs):
         """Constructor.
@@ -150,22 +155,9 @@ class HtbdyUnit (AUnit):
         Args:
             unit_data: the data pertaining to this unit.
         """
-        out_line = file_line + rows
-        try:
-            # Load the geometry data
-            for i in range(file_line, out_line):
-                elev = unit_data[i][0:10].strip()
-                time = unit_data[i][10:20].strip()
-
-                self.row_data['main'].addRow({
-                    rdt.ELEVATION: elev, rdt.TIME: time
-                }, no_copy=True)
-
-        except NotImplementedError:
-            logger.ERROR('Unable to read Unit Data(dataRowObject creation) - NotImplementedError')
-            raise
-
-        return out_line
+        return HtbdyUnit.ROW_SPEC.readRows(
+            self.row_data['main'], unit_data, file_line, rows
+        )
 
     def getData(self):
         """Retrieve the data in this unit.
@@ -190,8 +182,7 @@ class HtbdyUnit (AUnit):
             list containing the formatted unit rows.
         """
         out_data = []
-        for i in range(0, self.row_data['main'].numberOfRows()):
-            out_data.append(self.row_data['main'].getPrintableRow(i))
+        out_data.extend(self.row_data['main'].getPrintableRows())
 
         return out_data
 
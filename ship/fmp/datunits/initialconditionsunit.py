@@ -25,6 +25,7 @@ from __future__ import unicode_literals
 
 from ship.fmp.datunits.isisunit import AUnit
 from ship.datastructures.rowdatacollection import RowDataCollection
+from ship.datastructures.columnspec import ColumnSpec
 from ship.datastructures import dataobject as do
 from ship.fmp.datunits import ROW_DATA_TYPES as rdt
 
@@ -43,6 +44,14 @@ class InitialConditionsUnit (AUnit):
     UNIT_CATEGORY = 'initial_conditions'
     FILE_KEY = 'INITIAL'
     FILE_KEY2 = None
+    FILE_NAME_LINE = None
+
+    ROW_SPEC = ColumnSpec([
+        (rdt.LABEL, 0, 12), (rdt.QMARK, 12, 14), (rdt.FLOW, 14, 24),
+        (rdt.STAGE, 24, 34), (rdt.FROUDE_NO, 34, 44), (rdt.VELOCITY, 44, 54),
+        (rdt.UMODE, 54, 64), (rdt.USTATE, 64, 74), (rdt.ELEVATION, 74, 84),
+    ])
+    """Layout of the node rows in the dat file."""
 
     def __init__(self, **kwargs):
         """Constructor
@@ -87,29 +96,10 @@ class InitialConditionsUnit (AUnit):
         self._node_count = kwargs['node_count']
         self._name_types = kwargs['name_types']
 
-        i = file_line
-        out_line = file_line + self._node_count + 2
-        for i in range(file_line, out_line):
-            if i < file_line + 2:
-                continue  # Skip the first couple of header lines
-
-            label = unit_data[i][0:12].strip()
-            qmark = unit_data[i][12:14].strip()
-            flow = unit_data[i][14:24].strip()
-            stage = unit_data[i][24:34].strip()
-            froude_no = unit_data[i][34:44].strip()
-            velocity = unit_data[i][44:54].strip()
-            umode = unit_data[i][54:64].strip()
-            ustate = unit_data[i][64:74].strip()
-            elevation = unit_data[i][74:84].strip()
-
-            self.row_data['main'].addRow({
-                rdt.LABEL: label, rdt.QMARK: qmark, rdt.FLOW: flow,
-                rdt.STAGE: stage, rdt.FROUDE_NO: froude_no, rdt.VELOCITY: velocity,
-                rdt.UMODE: umode, rdt.USTATE: ustate,
-                rdt.ELEVATION: elevation
-            }, no_copy=True)
-
+        # Skip the first couple of header lines
+        out_line = InitialConditionsUnit.ROW_SPEC.readRows(
+            self.row_data['main'], unit_data, file_line + 2, self._node_count
+        )
         return out_line - 1
 
     def getData(self):
@@ -119,8 +109,7 @@ class InitialConditionsUnit (AUnit):
         out_data.append('INITIAL CONDITIONS')
         out_data.append(' label   ?      flow     stage froude no  velocity     umode    ustate         z')
 #         for i in range(0, self._node_count):
-        for i in range(0, self.row_data['main'].numberOfRows()):
-            out_data.append(self.row_data['main'].getPrintableRow(i))
+        out_data.extend(self.row_data['main'].getPrintableRows())
 
         return out_data
 
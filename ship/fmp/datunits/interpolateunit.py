@@ -38,6 +38,7 @@ class InterpolateUnit(AUnit):
     UNIT_CATEGORY = 'interpolate'
     FILE_KEY = 'INTERPOLATE'
     FILE_KEY2 = None
+    FILE_NAME_LINE = 1
 
     def __init__(self):
         '''Constructor.
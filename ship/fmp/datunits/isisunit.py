@@ -109,6 +109,22 @@ class AUnit(object):
         data in the .dat file.
         """
 
+        self._source_lines = None
+        """The lines of the .dat file that the unit was read from.
+
+        Set by the FmpUnitFactory when a unit is loaded. Used to write the
+        unit back out without formatting it again if it hasn't changed.
+        """
+        self._source_signature = None
+        self._changed = False
+
+        self.observers = []
+        """Objects that are told when the labels of this unit change.
+
+        Used by the DatCollection holding the unit to keep its lookup tables
+        up to date. Observers must implement observedLabelChange(unit).
+        """
+
     @property
     def name(self):
         return self._name
@@ -116,6 +132,7 @@ class AUnit(object):
     @name.setter
     def name(self, value):
         self._name = value
+        self._notifyLabelChange()
 
     @property
     def name_ds(self):
@@ -124,6 +141,41 @@ class AUnit(object):
     @name_ds.setter
     def name_ds(self, value):
         self._name_ds = value
+        self._notifyLabelChange()
+
+    def addObserver(self, observer):
+        """Add an object to be told when the labels of this unit change.
+
+        The STRING head_data items of the unit, which hold any labels that it
+        links to, will be watched for changes as well. Items added to the
+        head_data after this is called are not.
+
+        Args:
+            observer: object implementing observedLabelChange(unit).
+        """
+        if not observer in self.observers:
+            self.observers.append(observer)
+        for item in self.head_data.values():
+            if isinstance(item, HeadDataItem) and item.dtype == dt.STRING:
+                item.update_callback = self._headDataChanged
+
+    def removeObserver(self, observer):
+        """Stop an object being told when the labels of this unit change.
+
+        Args:
+            observer: an object previously given to addObserver().
+        """
+        if observer in self.observers:
+            self.observers.remove(observer)
+
+    def _headDataChanged(self, item, value):
+        self._notifyLabelChange()
+
+    def _notifyLabelChange(self):
+        """Tell the observers that one of the labels of this unit changed."""
+        # May be called by a LabelList while the unit is still being unpickled
+        for o in getattr(self, 'observers', []):
+            o.observedLabelChange(self)
 
     @property
     def has_ics(self):
@@ -147,6 +199,110 @@ class AUnit(object):
     def unit_category(self):
         return self._unit_category
 
+    @property
+    def has_changed(self):
+        """True if the unit may be different to the lines it was read from.
+
+        Always True for units that weren't read from a file. Otherwise it
+        checks the has_changed status of the head_data and row_data and
+        whether any of them, or the name/name_ds, have been replaced.
+
+        See Also:
+            setChangeStatus
+        """
+        if self._source_lines is None or self._changed:
+            return True
+        for v in self.head_data.values():
+            if isinstance(v, HeadDataItem) and v.has_changed:
+                return True
+        for r in self.row_data.values():
+            if r.has_changed:
+                return True
+        return self._changeSignature() != self._source_signature
+
+    def setChangeStatus(self, status):
+        """Set whether the unit has changed since it was read.
+
+        Setting status to False marks the current state of the unit as
+        unchanged and resets the has_changed status of the head_data and
+        row_data. Setting it to True means the unit will always be formatted
+        with getData() when written.
+
+        Args:
+            status(bool): the new has_changed status.
+        """
+        if status:
+            self._changed = True
+            return
+
+        self._changed = False
+        for v in self.head_data.values():
+            if isinstance(v, HeadDataItem):
+                v.has_changed = False
+        for r in self.row_data.values():
+            r.setChangeStatus(False)
+        self._source_signature = self._changeSignature()
+
+    def setSourceLines(self, lines):
+        """Store the .dat file lines that this unit was read from.
+
+        The unit will be marked as unchanged.
+
+        Args:
+            lines(list): the unit lines as read from the file.
+        """
+        self._source_lines = lines
+        self.setChangeStatus(False)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # The signature holds object ids, which will be different once the
+        # unit has been unpickled or copied, so keep the result of checking
+        # it instead and take it again in __setstate__.
+        if self._source_signature is not None and \
+                self._changeSignature() != self._source_signature:
+            state['_changed'] = True
+        state['_source_signature'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._source_lines is not None:
+            self._source_signature = self._changeSignature()
+
+    def sourceLines(self):
+        """Get the .dat file lines that this unit was read from.
+
+        Return:
+            list - the unit lines, as found in the file, without newlines, or
+                None if the unit wasn't read from a file.
+        """
+        if self._source_lines is None:
+            return None
+        return [l.rstrip('\n') for l in self._source_lines]
+
+    def _changeSignature(self):
+        """Get the parts of the unit that aren't tracked by a has_changed flag.
+
+        Values that aren't HeadDataItem's are copied. For everything else the
+        identity is enough to know if it's been replaced.
+
+        Subclasses that store data outside of head_data and row_data should
+        extend this.
+        """
+        head = {}
+        for k, v in self.head_data.items():
+            if isinstance(v, HeadDataItem):
+                head[k] = id(v)
+            elif isinstance(v, list):
+                head[k] = list(v)
+            else:
+                head[k] = v
+        rows = {}
+        for k, r in self.row_data.items():
+            rows[k] = (id(r), [id(o) for o in r._collection])
+        return (self._name, self._name_ds, head, rows)
+
     def icLabels(self):
         """Returns the initial_conditions values for this object.
 
@@ -178,8 +334,17 @@ class AUnit(object):
         return {'name': self._name}
 
     def copy(self):
-        """Returns a copy of this unit with it's own memory allocation."""
-        object_copy = copy.deepcopy(self)
+        """Returns a copy of this unit with it's own memory allocation.
+
+        The copy doesn't have any observers, so it isn't linked to the
+        collection that this unit is in.
+        """
+        observers = self.observers
+        self.observers = []
+        try:
+            object_copy = copy.deepcopy(self)
+        finally:
+            self.observers = observers
         return object_copy
 
     def rowDataObject(self, key, rowdata_key='main'):
@@ -238,6 +403,18 @@ class AUnit(object):
         """
         raise NotImplementedError
 
+    def iterData(self):
+        """Generator for the lines returned by getData().
+
+        Units with lots of row data can override this to format the rows one
+        at a time rather than building a list of all of them.
+
+        Yields:
+            str - each line formatted for writing to .dat file.
+        """
+        for line in self.getData():
+            yield line
+
     def readUnitData(self, data, file_line, **kwargs):
         """Reads the unit data supplied to the object.
 
@@ -436,6 +613,7 @@ class UnknownUnit(AUnit):
     """
     FILE_KEY = 'UNKNOWN'
     FILE_KEY2 = None
+    FILE_NAME_LINE = None
 
     def __init__(self, **kwargs):
         """Constructor.
@@ -464,6 +642,7 @@ class CommentUnit(AUnit):
     UNIT_CATEGORY = 'meta'
     FILE_KEY = 'COMMENT'
     FILE_KEY2 = None
+    FILE_NAME_LINE = None
 
     def __init__(self, **kwargs):
         """Constructor.
@@ -512,6 +691,10 @@ class CommentUnit(AUnit):
 
         return output
 
+    def _changeSignature(self):
+        """Overrides superclass method to include the comment text."""
+        return (super(CommentUnit, self)._changeSignature(), list(self.data))
+
 
 class HeaderUnit(AUnit):
     """This class deals with the data file values at the top of the file.
@@ -528,6 +711,7 @@ class HeaderUnit(AUnit):
     UNIT_CATEGORY = 'meta'
     FILE_KEY = 'HEADER'
     FILE_KEY2 = None
+    FILE_NAME_LINE = None
 
     def __init__(self, **kwargs):
         """Constructor.
@@ -601,3 +785,72 @@ class HeaderUnit(AUnit):
         out.append('END GENERAL')
 
         return out
+
+
+class LabelList(list):
+    """List of unit labels that tells the unit when it's changed.
+
+    Used in the head_data of units, like JunctionUnit, that store a list of
+    names rather than a single HeadDataItem. Updating the list will notify
+    the observers of the unit so that it can be found under its new labels.
+    Assigning a new list to the head_data will not, so a LabelList should be
+    used whenever the list is replaced.
+    """
+
+    def __init__(self, unit, labels=[]):
+        """Constructor.
+
+        Args:
+            unit(AUnit): the unit that the labels belong to.
+            labels=[](list): the initial labels.
+        """
+        super(LabelList, self).__init__(labels)
+        self.unit = unit
+
+    def _changed(self):
+        # Not set while the list is being unpickled or copied
+        unit = getattr(self, 'unit', None)
+        if unit is not None:
+            unit._notifyLabelChange()
+
+    def __setitem__(self, key, value):
+        super(LabelList, self).__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super(LabelList, self).__delitem__(key)
+        self._changed()
+
+    def __setslice__(self, i, j, sequence):
+        super(LabelList, self).__setslice__(i, j, sequence)
+        self._changed()
+
+    def __delslice__(self, i, j):
+        super(LabelList, self).__delslice__(i, j)
+        self._changed()
+
+    def __iadd__(self, other):
+        result = super(LabelList, self).__iadd__(other)
+        self._changed()
+        return result
+
+    def append(self, label):
+        super(LabelList, self).append(label)
+        self._changed()
+
+    def extend(self, labels):
+        super(LabelList, self).extend(labels)
+        self._changed()
+
+    def insert(self, index, label):
+        super(LabelList, self).insert(index, label)
+        self._changed()
+
+    def pop(self, index=-1):
+        label = super(LabelList, self).pop(index)
+        self._changed()
+        return label
+
+    def remove(self, label):
+        super(LabelList, self).remove(label)
+        self._changed()
@@ -19,7 +19,7 @@
 """
 from __future__ import unicode_literals
 
-from ship.fmp.datunits.isisunit import AUnit
+from ship.fmp.datunits.isisunit import AUnit, LabelList
 from ship.fmp.headdata import HeadDataItem
 from ship.datastructures import DATA_TYPES as dt
 from ship.utils import utilfunctions as uf
@@ -37,6 +37,7 @@ class JunctionUnit(AUnit):
     UNIT_CATEGORY = 'junction'
     FILE_KEY = 'JUNCTION'
     FILE_KEY2 = None
+    FILE_NAME_LINE = 2
 
     def __init__(self):
         '''Constructor.
@@ -50,7 +51,7 @@ class JunctionUnit(AUnit):
         self.head_data = {
             'comment': HeadDataItem('', '', 0, 0, dtype=dt.STRING),
             'type': HeadDataItem('OPEN', '', 0, 0, dtype=dt.CONSTANT, choices=('OPEN', 'ENERGY')),
-            'names': [],
+            'names': LabelList(self),
         }
         self.name = 'Junc'  # Must be after head_data here (see property below)
 
@@ -103,7 +104,7 @@ class JunctionUnit(AUnit):
         line = unit_data[file_line + 2]
         names = [line[i:i + 12].strip() for i in range(0, len(line), 12)]
 
-        self.head_data['names'] = names
+        self.head_data['names'] = LabelList(self, names)
         self._name = names[0]
         return file_line + 2
 
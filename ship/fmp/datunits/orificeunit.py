@@ -41,6 +41,7 @@ class OrificeUnit(AUnit):
     UNIT_CATEGORY = 'orifice'
     FILE_KEY = 'ORIFICE'
     FILE_KEY2 = None
+    FILE_NAME_LINE = 2
 
     def __init__(self, **kwargs):
         '''Constructor.
@@ -130,6 +131,7 @@ class OutfallUnit(OrificeUnit):
     UNIT_CATEGORY = 'orifice'
     FILE_KEY = 'OUTFALL'
     FILE_KEY2 = None
+    FILE_NAME_LINE = 2
 
     def __init__(self, **kwargs):
         '''Constructor.
@@ -153,6 +155,7 @@ class FloodReliefUnit(OrificeUnit):
     CATEGORY = 'orifice'
     FILE_KEY = 'FLOOD RELIEF'
     FILE_KEY2 = None
+    FILE_NAME_LINE = 2
 
     def __init__(self, **kwargs):
         '''Constructor.
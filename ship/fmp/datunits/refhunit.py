@@ -28,6 +28,7 @@ logger = logging.getLogger(__name__)
 
 from ship.fmp.datunits.isisunit import AUnit
 from ship.datastructures.rowdatacollection import RowDataCollection
+from ship.datastructures.columnspec import ColumnSpec
 from ship.datastructures import dataobject as do
 from ship.datastructures import DATA_TYPES as dt
 from ship.fmp.headdata import HeadDataItem
@@ -53,6 +54,10 @@ class RefhUnit(AUnit):
     UNIT_CATEGORY = 'inflows'
     FILE_KEY = 'REFHBDY'
     FILE_KEY2 = None
+    FILE_NAME_LINE = 1
+
+    ROW_SPEC = ColumnSpec([(rdt.RAIN, 0, 10)])
+    """Layout of the storm data rows in the dat file."""
 
     def __init__(self, **kwargs):
         """Constructor.
@@ -295,13 +300,9 @@ class RefhUnit(AUnit):
     def _readStormData(self, unit_data, file_line, storm_rows):
         """
         """
-        out_line = file_line + storm_rows
-        for i in range(file_line, out_line):
-            self.row_data['main'].addRow(
-                {rdt.RAIN: unit_data[i][0:10].strip()}, no_copy=True
-            )
-
-        return out_line
+        return RefhUnit.ROW_SPEC.readRows(
+            self.row_data['main'], unit_data, file_line, storm_rows
+        )
 
     def _readSuffix(self, unit_data, file_line):
         """
@@ -393,8 +394,7 @@ class RefhUnit(AUnit):
         """
         out_data = []
         out_data = ['{:>10}'.format(self.row_data['main'].numberOfRows())]
-        for i in range(self.row_data['main'].numberOfRows()):
-            out_data.append(self.row_data['main'].getPrintableRow(i))
+        out_data.extend(self.row_data['main'].getPrintableRows())
         return out_data
 #         out_data = ['{:>10}'.format(self.row_data['main'].numberOfRows())]
 #         for line in self.row_data['main']:
@@ -22,10 +22,11 @@
 """
 from __future__ import unicode_literals
 
-from ship.fmp.datunits.isisunit import AUnit
+from ship.fmp.datunits.isisunit import AUnit, LabelList
 from ship.fmp.datunits import ROW_DATA_TYPES as rdt
 from ship.datastructures import dataobject as do
 from ship.datastructures.rowdatacollection import RowDataCollection
+from ship.datastructures.columnspec import ColumnSpec
 from ship.fmp.headdata import HeadDataItem
 from ship.datastructures import DATA_TYPES as dt
 
@@ -49,6 +50,10 @@ class ReservoirUnit (AUnit):
     UNIT_CATEGORY = 'reservoir'
     FILE_KEY = 'RESERVOIR'
     FILE_KEY2 = None
+    FILE_NAME_LINE = 1
+
+    ROW_SPEC = ColumnSpec([(rdt.ELEVATION, 0, 10), (rdt.AREA, 10, 20)])
+    """Layout of the rows in the dat file."""
 
     def __init__(self, **kwargs):
         """Constructor.
@@ -69,7 +74,7 @@ class ReservoirUnit (AUnit):
             'lateral2': HeadDataItem('', '{:<12}', 2, 1, dtype=dt.STRING),
             'lateral3': HeadDataItem('', '{:<12}', 2, 2, dtype=dt.STRING),
             'lateral4': HeadDataItem('', '{:<12}', 2, 3, dtype=dt.STRING),
-            'names': []
+            'names': LabelList(self)
         }
 
         self._unit_type = ReservoirUnit.UNIT_TYPE
@@ -140,7 +145,7 @@ class ReservoirUnit (AUnit):
         line = unit_data[file_line + 1]
         names = [line[i:i + 12].strip() for i in range(0, len(line), 12)]
         self._name = names[0]
-        self.head_data['names'] = names[1:]  # Remove the main name from the list
+        self.head_data['names'] = LabelList(self, names[1:])  # Remove the main name from the list
 
         line_count = 2
         if self.head_data['revision'].value > 0:
@@ -174,22 +179,9 @@ class ReservoirUnit (AUnit):
         """
         self.unit_length = int(unit_data[file_line].strip())
         file_line += 1
-        out_line = file_line + self.unit_length
-        try:
-            # Load the geometry data
-            for i in range(file_line, out_line):
-                elev = unit_data[i][0:10].strip()
-                area = unit_data[i][10:20].strip()
-
-                self.row_data['main'].addRow({
-                    rdt.ELEVATION: elev, rdt.AREA: area,
-                }, no_copy=True)
-
-        except NotImplementedError:
-            logger.error('Unable to read Unit Data(dataRowObject creation) - NotImplementedError')
-            raise
-
-        return out_line
+        return ReservoirUnit.ROW_SPEC.readRows(
+            self.row_data['main'], unit_data, file_line, self.unit_length
+        )
 
     def getData(self):
         """Retrieve the data in this unit.
@@ -221,8 +213,7 @@ class ReservoirUnit (AUnit):
         """
         out_data = []
         out_data.append('{:>10}'.format(num_rows))
-        for i in range(0, num_rows):
-            out_data.append(self.row_data['main'].getPrintableRow(i))
+        out_data.extend(self.row_data['main'].getPrintableRows(0, num_rows))
         return out_data
 
     def _getHeadData(self, num_rows):
@@ -26,9 +26,11 @@ from __future__ import unicode_literals
 from ship.fmp.datunits.isisunit import AUnit
 from ship.datastructures import dataobject as do
 from ship.datastructures.rowdatacollection import RowDataCollection
+from ship.datastructures.columnspec import ColumnSpec
 from ship.fmp.datunits import ROW_DATA_TYPES as rdt
 from ship.fmp.headdata import HeadDataItem
 from ship.datastructures import DATA_TYPES as dt
+from ship.utils.tools import openchannel
 
 import logging
 logger = logging.getLogger(__name__)
@@ -54,6 +56,15 @@ class RiverUnit (AUnit):
     UNIT_CATEGORY = 'river'
     FILE_KEY = 'RIVER'
     FILE_KEY2 = 'SECTION'
+    FILE_NAME_LINE = 2
+
+    ROW_SPEC = ColumnSpec([
+        (rdt.CHAINAGE, 0, 10), (rdt.ELEVATION, 10, 20), (rdt.ROUGHNESS, 20, 30),
+        (rdt.PANEL_MARKER, 30, 35), (rdt.RPL, 35, 40), (rdt.BANKMARKER, 40, 50),
+        (rdt.EASTING, 50, 60, None), (rdt.NORTHING, 60, 70, None),
+        (rdt.DEACTIVATION, 70, 80), (rdt.SPECIAL, 80, 90),
+    ])
+    """Layout of the geometry rows in the dat file."""
 
     def __init__(self, **kwargs):
         """Constructor.
@@ -187,41 +198,9 @@ class RiverUnit (AUnit):
         """
         end_line = int(unit_data[file_line].strip())
         file_line += 1
-        try:
-            # Load the geometry data
-            for i in range(file_line, end_line + file_line):
-                chain = unit_data[i][0:10].strip()
-                elev = unit_data[i][10:20].strip()
-                rough = unit_data[i][20:30].strip()
-                panel = unit_data[i][30:35].strip()
-                rpl = unit_data[i][35:40].strip()
-                bank = unit_data[i][40:50].strip()
-                east = unit_data[i][50:60].strip()
-                north = unit_data[i][60:70].strip()
-                deact = unit_data[i][70:80].strip()
-                special = unit_data[i][80:90].strip()
-
-                if east == '':
-                    east = None
-                if north == '':
-                    north = None
-
-                self.row_data['main'].addRow(
-                    {rdt.CHAINAGE: chain, rdt.ELEVATION: elev, rdt.ROUGHNESS: rough,
-                        rdt.RPL: rpl, rdt.PANEL_MARKER: panel, rdt.BANKMARKER: bank,
-                        rdt.EASTING: east, rdt.NORTHING: north,
-                        rdt.DEACTIVATION: deact, rdt.SPECIAL: special
-                     },
-                    # We don't need to make backup copies here. If it fails the
-                    # load fails anyway and this will just really slow us down
-                    no_copy=True
-                )
-
-        except NotImplementedError:
-            logger.ERROR('Unable to read Unit Data(dataRowObject creation) - NotImplementedError')
-            raise
-
-        return end_line + file_line
+        return RiverUnit.ROW_SPEC.readRows(
+            self.row_data['main'], unit_data, file_line, end_line
+        )
 
     def getData(self):
         """Retrieve the data in this unit.
@@ -232,11 +211,19 @@ class RiverUnit (AUnit):
         Return:
             List of strings formated for writing to .dat file.
         """
-        row_count = self.row_data['main'].numberOfRows()
-        out_data = self._getHeadData(row_count)
-        out_data.extend(self._getRowData(row_count))
+        return list(self.iterData())
 
-        return out_data
+    def iterData(self):
+        """Overrides superclass method to format the rows one at a time.
+
+        See Also:
+            AUnit.iterData
+        """
+        row_count = self.row_data['main'].numberOfRows()
+        for line in self._getHeadData(row_count):
+            yield line
+        for line in self.row_data['main'].iterPrintableRows():
+            yield line
 
     def _getRowData(self, row_count):
         """Returns the row data in this class.
@@ -248,8 +235,7 @@ class RiverUnit (AUnit):
             list = containing the formatted unit rows.
         """
         out_data = []
-        for i in range(0, row_count):
-            out_data.append(self.row_data['main'].getPrintableRow(i))
+        out_data.extend(self.row_data['main'].getPrintableRows(0, row_count))
         return out_data
 
     def _getHeadData(self, row_count):
@@ -371,3 +357,31 @@ class RiverUnit (AUnit):
         else:
             width = abs(chainage[-1] - chainage[0])
         return width
+
+    def hydraulicTable(self, **kwargs):
+        """Get the hydraulic properties of the section over a range of depths.
+
+        Tables are memoized on the section geometry, so the table is only
+        calculated again when the chainage, elevation, roughness or panel
+        marker values of the section change.
+
+        Args:
+            **kwargs: passed on to openchannel.HydraulicTable (e.g.
+                interpolate_space, depths).
+
+        Return:
+            openchannel.HydraulicTable - containing the area, wetted
+                perimeter, top width, hydraulic radius and conveyance of the
+                section. It is shared, so shouldn't be changed.
+
+        See Also:
+            openchannel.hydraulicTable
+        """
+        rows = self.row_data['main']
+        return openchannel.hydraulicTable(
+            rows.dataObjectAsList(rdt.CHAINAGE),
+            rows.dataObjectAsList(rdt.ELEVATION),
+            panel_vals=rows.dataObjectAsList(rdt.PANEL_MARKER),
+            n_vals=rows.dataObjectAsList(rdt.ROUGHNESS),
+            **kwargs
+        )
@@ -26,6 +26,7 @@ from ship.fmp.datunits.isisunit import AUnit
 from ship.fmp.datunits import ROW_DATA_TYPES as rdt
 from ship.datastructures import dataobject as do
 from ship.datastructures.rowdatacollection import RowDataCollection
+from ship.datastructures.columnspec import ColumnSpec
 from ship.fmp.headdata import HeadDataItem
 from ship.datastructures import DATA_TYPES as dt
 
@@ -50,6 +51,15 @@ class SpillUnit (AUnit):
     UNIT_CATEGORY = 'spill'
     FILE_KEY = 'SPILL'
     FILE_KEY2 = None
+    FILE_NAME_LINE = 1
+
+    # In some edge cases there are no values set in the file for the easting
+    # and northing, so use defaults.
+    ROW_SPEC = ColumnSpec([
+        (rdt.CHAINAGE, 0, 10), (rdt.ELEVATION, 10, 20),
+        (rdt.EASTING, 20, 30, None), (rdt.NORTHING, 30, 40, None),
+    ])
+    """Layout of the geometry rows in the dat file."""
 
     def __init__(self, **kwargs):
         """Constructor.
@@ -124,35 +134,9 @@ class SpillUnit (AUnit):
         """
         self.unit_length = int(unit_data[file_line].strip())
         file_line += 1
-        out_line = file_line + self.unit_length
-        try:
-            # Load the geometry data
-            for i in range(file_line, out_line):
-
-                chain = unit_data[i][0:10].strip()
-                elev = unit_data[i][10:20].strip()
-                east = None
-                north = None
-
-                '''
-                In some edge cases there are no values set in the file for the
-                easting and northing, so use defaults. this actually checks
-                that they are both there, e starts at 21, n starts at 31
-                '''
-                if len(unit_data[i]) > 31:
-                    east = unit_data[i][20:30].strip()
-                    north = unit_data[i][30:40].strip()
-
-                self.row_data['main'].addRow({
-                    rdt.CHAINAGE: chain, rdt.ELEVATION: elev,
-                    rdt.EASTING: east, rdt.NORTHING: north
-                }, no_copy=True)
-
-        except NotImplementedError:
-            logger.ERROR('Unable to read Unit Data(dataRowObject creation) - NotImplementedError')
-            raise
-
-        return out_line
+        return SpillUnit.ROW_SPEC.readRows(
+            self.row_data['main'], unit_data, file_line, self.unit_length
+        )
 
     def getData(self):
         """Retrieve the data in this unit.
@@ -179,8 +163,7 @@ class SpillUnit (AUnit):
             list containing the formatted unit rows.
         """
         out_data = []
-        for i in range(0, num_rows):
-            out_data.append(self.row_data['main'].getPrintableRow(i))
+        out_data.extend(self.row_data['main'].getPrintableRows(0, num_rows))
 
         return out_data
 
@@ -125,28 +125,10 @@ class FmpUnitFactory(object):
 
         # Check if we know what the unit is. If we do, instantiate it, if not
         # return the current line number and False to let the loader know
-        found = False
-
-        # Make sure the given FILE_KEY is found (it should be if we're here)
-        if file_key in self.units.keys():
-            u = self.units[file_key]
-
-            # If FILE_KEY2 is none there's only a single type of this unit so
-            # grab it
-            if u[0][0] is None:
-                unit_type = u[0][1]
-                found = True
-            else:
-
-                # If not then find which one it is and  grab that
-                key2 = contents[file_line + 1].split()[0].strip()
-                for s in u:
-                    if s[0] == key2:
-                        unit_type = s[1]
-                        found = True
+        unit_type = self.unitClass(contents, file_line, file_key)
 
         # If something went wrong send back as part of UnknownUnit instead
-        if not found:
+        if unit_type is None:
             return file_line, False
 
         read_kwargs = {}
@@ -160,6 +142,7 @@ class FmpUnitFactory(object):
         unit = unit_type(**constructor_kwargs)
         
         # If the unit fails to load print the first line out to help with debugging
+        start_line = file_line
         try:
             file_line = unit.readUnitData(contents, file_line, **read_kwargs)
         except ValueError as err:
@@ -176,8 +159,52 @@ class FmpUnitFactory(object):
         if file_key != 'INITIAL':
             self.findIcLabels(unit)
 
+        # Numeric row data takes a lot less memory stored in arrays
+        for rows in unit.row_data.values():
+            rows.compact()
+
+        # Keep the lines that the unit was read from so that it can be written
+        # out as it was if it isn't changed. The HeaderUnit returns the next
+        # line rather than the last one it read
+        end_line = file_line - 1 if file_key == 'HEADER' else file_line
+        unit.setSourceLines(contents[start_line:end_line + 1])
+
         return file_line, unit
 
+    def unitClass(self, contents, file_line, file_key):
+        """Find the AUnit class that should be used to read a unit.
+
+        Some units share the same FILE_KEY (e.g. the different bridge types)
+        and are told apart by the FILE_KEY2 value on the following line.
+
+        Args:
+            contents(list): the .dat file contents.
+            file_line(int): the line that the unit starts on.
+            file_key(str): the first word on file_line.
+
+        Return:
+            AUnit class that matches the unit at file_line, or None if the
+                unit type is not supported.
+        """
+        # Make sure the given FILE_KEY is found (it should be if we're here)
+        if not file_key in self.units.keys():
+            return None
+
+        u = self.units[file_key]
+
+        # If FILE_KEY2 is none there's only a single type of this unit so
+        # grab it
+        if u[0][0] is None:
+            return u[0][1]
+
+        # If not then find which one it is and  grab that
+        unit_type = None
+        key2 = contents[file_line + 1].split()[0].strip()
+        for s in u:
+            if s[0] == key2:
+                unit_type = s[1]
+        return unit_type
+
     @staticmethod
     def createUnit(unit_type, **kwargs):
         """Create a new AUnit.
@@ -190,12 +217,9 @@ class FmpUnitFactory(object):
             head_data: dict of head_data values to set in the AUnit.
             row_data: dict of row_data keys containing lists of row data to
                 set in the unit.
-            no_copy(bool): When adding any row_data given to a new unit the
-                no_copy flag will be given to the RowDataCollection.addRow()
-                method. When True it stops the call to deepcopy while updating
-                the rows. It's probably not needed when creating a new unit and
-                it can be time-consuming. The default is True. See 
-                RowDataCollection.addRow() for more details.
+            no_copy(bool): no longer used. The row_data is added with
+                RowDataCollection.addColumns(), which doesn't need to make
+                copies to put the rows back if there's a problem.
 
         The row_data kwarg is expected to be set out like the following::
 
@@ -213,10 +237,10 @@ class FmpUnitFactory(object):
             }
 
         I.e. dict's of row_data types to update, containing a list of row_vals
-        data to set. These will be used to call the addRow() method in the
-        AUnit. The contents of the list entries will be specific to the
-        unit_type. For more information see the addRow() method and row_data
-        setup of specific AUnit's.
+        data to set. These will be added with the addColumns() method of the
+        AUnit's RowDataCollection. The contents of the list entries will be
+        specific to the unit_type. For more information see the addRow() method
+        and row_data setup of specific AUnit's.
 
         Args:
             unit_type(str): the AUnit.UNIT_TYPE to create.
@@ -237,7 +261,6 @@ class FmpUnitFactory(object):
         row_data = kwargs.get('row_data', None)
         unit.name = kwargs.get('name', 'unknown')
         unit.name_ds = kwargs.get('name_ds', 'unknown')
-        no_copy = kwargs.get('no_copy', True)
 
         if unit.unit_category == 'river':
             unit.reach_number = kwargs.get('reach_number', -1)
@@ -255,9 +278,16 @@ class FmpUnitFactory(object):
             # For different RowDataCollections
             for row_key, row_data in row_data.items():
                 if row_key in rowdata_keys:
-                    # For different rows to add
-                    for entry in row_data:
-                        unit.row_data[row_key].addRow(entry, no_copy=no_copy)
+                    # Add all of the rows at once. Values missing from a row
+                    # will get the default value
+                    columns = {}
+                    for i, entry in enumerate(row_data):
+                        for key, val in entry.items():
+                            columns.setdefault(key, [None] * i).append(val)
+                        for col in columns.values():
+                            if len(col) == i:
+                                col.append(None)
+                    unit.row_data[row_key].addColumns(columns)
 
         return unit
 
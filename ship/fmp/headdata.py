@@ -45,8 +45,8 @@ class HeadDataItem(object):
             dtype(int): one of the datatructures.DATA_TYPES.
             default: a default value to apply when none is given.
             allow_blank(bool): whether to allow blank/non-value entries.
-            update_callback(func): a function to vall when a value is updated.
-                This is not currently used.
+            update_callback(func): a function to call when a value is updated.
+                It's called with this HeadDataItem and the new value.
 
         Args:
             initial_value: the initial value to set.
@@ -75,7 +75,8 @@ class HeadDataItem(object):
 
         value = self._checkValue(initial_value)
         self._value = value
-        self._update_callback = kwargs.get('update_callback', None)
+        self.update_callback = kwargs.get('update_callback', None)
+        self.has_changed = False
 
     @property
     def value(self):
@@ -90,6 +91,9 @@ class HeadDataItem(object):
         """
         val = self._checkValue(val)
         self._value = val
+        self.has_changed = True
+        if self.update_callback is not None:
+            self.update_callback(self, val)
 
     def format(self, auto_newline=False):
         """Return the value converted to unicode str and formatted.
@@ -9,6 +9,11 @@
             Stores all of the direct associates of a particular unit. See the
             linkedUnits() method in DatCollection for more information.
 
+        - UnitNetwork:
+            Graph of the links between the units in a DatCollection. Used to
+            look up the associates of a unit without checking every other unit
+            in the model.
+
  Author:  
      Duncan Runnacles
 
@@ -68,3 +73,262 @@ class LinkedUnits(object):
             self.junctions.append((unit, None))
             if additionals:
                 self.junctions[-1][1] = additionals
+
+
+class UnitNetwork(object):
+    """Graph of the links between units, built from their linkLabels().
+
+    Each unit is stored against the labels that it references (its
+    linkLabels()) and the labels that it sits at (its name and name_ds). This
+    means that the units associated with any other unit can be found by
+    looking up its labels, rather than comparing it against every unit in the
+    model.
+
+    The graph is updated as units are added or removed. If the link labels of
+    a unit that is already in the graph are changed, updateUnit() should be
+    called for it. The DatCollection does this whenever one of its units
+    tells it that its labels have changed.
+
+    JunctionUnit's are stored separately from the other units as they are
+    only used to group the units that they reference. They are not included
+    in the linked or named units of other units.
+    """
+
+    def __init__(self, units=[]):
+        """Constructor.
+
+        Args:
+            units=[](list): AUnit's to add to the graph.
+        """
+        self._links = {}
+        """The non-blank linkLabels() of each unit in the graph."""
+
+        self._label_units = {}
+        """Units (excluding junctions) that reference each label."""
+
+        self._junction_units = {}
+        """Junctions that reference each label."""
+
+        self._node_units = {}
+        """Units (excluding junctions) with a name or name_ds of each label."""
+
+        self._nodes = {}
+        """The labels that each unit has been stored in _node_units under."""
+
+        for u in units:
+            self.addUnit(u)
+
+    def __contains__(self, unit):
+        return unit in self._links
+
+    def addUnit(self, unit):
+        """Add a unit and its links to the graph.
+
+        Args:
+            unit(AUnit): the unit to add.
+        """
+        if unit in self._links:
+            self.removeUnit(unit)
+        links = dict(
+            (k, v) for k, v in unit.linkLabels().items() if v.strip() != ''
+        )
+        self._links[unit] = links
+
+        is_junction = unit.unit_type == 'junction'
+        lookup = self._junction_units if is_junction else self._label_units
+        for label in set(links.values()):
+            if not label in lookup:
+                lookup[label] = []
+            lookup[label].append(unit)
+
+        if is_junction:
+            self._nodes[unit] = []
+        else:
+            nodes = [unit.name]
+            if unit.name_ds != 'unknown' and unit.name_ds != unit.name:
+                nodes.append(unit.name_ds)
+            self._nodes[unit] = nodes
+            for label in nodes:
+                if not label in self._node_units:
+                    self._node_units[label] = []
+                self._node_units[label].append(unit)
+
+    def removeUnit(self, unit):
+        """Remove a unit and its links from the graph.
+
+        Args:
+            unit(AUnit): the unit to remove.
+        """
+        links = self._links.pop(unit, None)
+        if links is None:
+            return
+        lookup = self._label_units
+        if unit.unit_type == 'junction':
+            lookup = self._junction_units
+        for label in set(links.values()):
+            self._removeFrom(lookup, label, unit)
+        for label in self._nodes.pop(unit, []):
+            self._removeFrom(self._node_units, label, unit)
+
+    def updateUnit(self, unit):
+        """Update the links stored for a unit that is already in the graph.
+
+        Should be called if the linkLabels() of the unit have been changed.
+
+        Args:
+            unit(AUnit): the unit to update.
+        """
+        self.removeUnit(unit)
+        self.addUnit(unit)
+
+    def linkLabels(self, unit):
+        """Get the non-blank linkLabels() of a unit, as stored in the graph.
+
+        Args:
+            unit(AUnit): the unit to get the labels for.
+
+        Return:
+            dict - of the linkLabels() of the unit that are not blank.
+        """
+        return self._links.get(unit, {})
+
+    def namedUnits(self, unit):
+        """Get all of the units that share a link label with the given unit.
+
+        JunctionUnit's are not included. See junctions().
+
+        Args:
+            unit(AUnit): the unit to find the associates of.
+
+        Return:
+            list - of AUnit's that reference one of the same labels as unit.
+        """
+        found = set([unit])
+        named = []
+        for label in self._uniqueLabels(unit):
+            for u in self._label_units.get(label, []):
+                if not u in found:
+                    found.add(u)
+                    named.append(u)
+        return named
+
+    def junctions(self, unit):
+        """Get all of the junctions that reference the given unit.
+
+        Args:
+            unit(AUnit): the unit to find the junctions of.
+
+        Return:
+            list - of tuples where [0] is the JunctionUnit and [1] is a list
+                of the units referenced by that junction.
+        """
+        found = set()
+        junctions = []
+        for label in self._uniqueLabels(unit):
+            for j in self._junction_units.get(label, []):
+                if not j in found:
+                    found.add(j)
+                    junctions.append((j, self.junctionMembers(j)))
+        return junctions
+
+    def junctionMembers(self, junction):
+        """Get all of the units referenced by a JunctionUnit.
+
+        Args:
+            junction(JunctionUnit): the junction to get the members of.
+
+        Return:
+            list - of AUnit's with a name or name_ds that is referenced by
+                the junction.
+        """
+        return self._unitsAt(self.linkLabels(junction).values())
+
+    def upstreamUnits(self, unit):
+        """Get the units that flow directly into the given unit.
+
+        These are the units with a name_ds that is the same as the name of
+        the given unit.
+
+        Args:
+            unit(AUnit): the unit to find the upstream units of.
+
+        Return:
+            list - of AUnit's upstream of unit.
+        """
+        return [
+            u for u in self._node_units.get(unit.name, [])
+            if not u is unit and u.name_ds == unit.name
+        ]
+
+    def downstreamUnits(self, unit):
+        """Get the units that the given unit flows directly into.
+
+        These are the units with a name that is the same as the name_ds of
+        the given unit.
+
+        Args:
+            unit(AUnit): the unit to find the downstream units of.
+
+        Return:
+            list - of AUnit's downstream of unit.
+        """
+        if unit.name_ds == 'unknown':
+            return []
+        return [
+            u for u in self._node_units.get(unit.name_ds, [])
+            if not u is unit and u.name == unit.name_ds
+        ]
+
+    def spillUnits(self, unit):
+        """Get the units referenced by the spill labels of the given unit.
+
+        Args:
+            unit(AUnit): the unit to find the spill links of.
+
+        Return:
+            list - of AUnit's with a name or name_ds referenced by the spill
+                labels of unit (e.g. 'spill1' in a RiverUnit).
+        """
+        return self._linksByKey(unit, 'spill')
+
+    def lateralUnits(self, unit):
+        """Get the units referenced by the lateral labels of the given unit.
+
+        Args:
+            unit(AUnit): the unit to find the lateral links of.
+
+        Return:
+            list - of AUnit's with a name or name_ds referenced by the lateral
+                labels of unit (e.g. 'lateral1' in a RiverUnit).
+        """
+        return self._linksByKey(unit, 'lateral')
+
+    def _uniqueLabels(self, unit):
+        labels = []
+        for label in self.linkLabels(unit).values():
+            if not label in labels:
+                labels.append(label)
+        return labels
+
+    def _linksByKey(self, unit, key):
+        labels = [v for k, v in self.linkLabels(unit).items() if key in k]
+        return [u for u in self._unitsAt(labels) if not u is unit]
+
+    def _unitsAt(self, labels):
+        found = set()
+        units = []
+        for label in labels:
+            for u in self._node_units.get(label, []):
+                if not u in found:
+                    found.add(u)
+                    units.append(u)
+        return units
+
+    def _removeFrom(self, lookup, label, unit):
+        units = lookup.get(label, [])
+        for i, u in enumerate(units):
+            if u is unit:
+                del units[i]
+                break
+        if not units:
+            lookup.pop(label, None)
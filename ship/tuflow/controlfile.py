@@ -41,6 +41,7 @@ logger = logging.getLogger(__name__)
 from ship.tuflow.tuflowfilepart import TuflowPart, TuflowFile, TuflowLogic, \
     TuflowVariable, ModelFile, UnknownPart
 from ship.utils import filetools
+from ship.datastructures.positionindex import PositionIndex
 
 
 class ControlFile(object):
@@ -148,67 +149,46 @@ class ControlFile(object):
         Return:
             list - of filepaths that matched.
         """
-        active_only = kwargs.get('active_only', True)
-        callback = kwargs.get('callback_func', None)
-        by_parent = kwargs.get('by_parent', False)
-        exclude = kwargs.get('exclude', [])
-        if filepart_type is None:
-            filepart_type = []
-        elif not isinstance(filepart_type, list):
-            filepart_type = [filepart_type]
+        parts = self.iterPartType(instance_type, filepart_type, no_duplicates,
+                                  se_vals, **kwargs)
+        if kwargs.get('by_parent', False):
+            return self._groupByParent((p, p) for p in parts)
+        else:
+            return list(parts)
 
-        duplicate_list = []
-        fetch_sibling = False
-        vars = []
-        parents = {}
-        for part in self.parts:
-            if active_only and not part.active:
-                continue
-            if not isinstance(part, instance_type):
-                continue
-            if filepart_type and not part.filepart_type in filepart_type:
-                continue
-            if part.filepart_type in exclude:
-                continue
+    def iterPartType(self, instance_type, filepart_type=None, no_duplicates=True,
+                     se_vals=None, **kwargs):
+        """Get a generator of the TuflowPart's that match the criteria.
 
-            if se_vals is not None:
-                if not self.checkPartLogic(part, se_vals):
-                    continue
+        The same as fetchPartType(), except that the parts are found as the
+        generator is consumed and 'by_parent' is ignored.
 
+        Return:
+            generator - of the TuflowPart's that matched.
+        """
+        callback = kwargs.get('callback_func', None)
+        duplicates = set()
+        fetch_sibling = False
+        found = []
+        for part in self._filterParts(instance_type, filepart_type, se_vals, **kwargs):
             if no_duplicates:
-                if part.duplicate_comparison in duplicate_list and not fetch_sibling:
+                comparison = part.duplicate_comparison
+                if comparison in duplicates and not fetch_sibling:
                     continue
                 else:
-                    if not part.duplicate_comparison in duplicate_list:
-                        duplicate_list.append(part.duplicate_comparison)
+                    duplicates.add(comparison)
                     # If a part has a sibling note that here so that it doesn't
-                    # get missed by the duplicate_list check
+                    # get missed by the duplicates check
                     if part.associates.sibling_next is not None:
                         fetch_sibling = True
                     else:
                         fetch_sibling = False
 
             if callback:
-                take = callback(vars, part)
-                if take:
-                    if by_parent:
-                        if not part.associates.parent.filenameAndExtension() in parents.keys():
-                            parents[part.associates.parent.filenameAndExtension()] = []
-                        parents[part.associates.parent.filenameAndExtension()].append(part)
-                    else:
-                        vars.append(part)
-            else:
-                if by_parent:
-                    if not part.associates.parent.filenameAndExtension() in parents.keys():
-                        parents[part.associates.parent.filenameAndExtension()] = []
-                    parents[part.associates.parent.filenameAndExtension()].append(part)
-                else:
-                    vars.append(part)
-
-        if by_parent:
-            return parents
-        else:
-            return vars
+                if not callback(found, part):
+                    continue
+                found.append(part)
+            yield part
 
     def customPartSearch(self, callback_func, include_unknown=False):
         """Return TuflowPart's based on the return value of callback_func.
@@ -288,21 +268,78 @@ class ControlFile(object):
         Return:
             list - of filepaths that matched.
         """
-        active_only = kwargs.get('active_only', True)
-        by_parent = kwargs.get('by_parent', False)
-        exclude = kwargs.get('exclude', [])
+        paths = self._matchingPaths(filepart_type, absolute, no_duplicates,
+                                    no_blanks, se_vals, **kwargs)
+        if kwargs.get('by_parent', False):
+            return self._groupByParent(paths)
+        else:
+            return [p for part, p in paths]
+
+    def iterFilepaths(self, filepart_type=None, absolute=False, no_duplicates=True,
+                      no_blanks=True, se_vals=None, **kwargs):
+        """Get a generator of the TuflowFile filepaths that match the criteria.
+
+        The same as filepaths(), except that the paths are found as the
+        generator is consumed and 'by_parent' is ignored.
+
+        Return:
+            generator - of the filepaths that matched.
+        """
+        paths = self._matchingPaths(filepart_type, absolute, no_duplicates,
+                                    no_blanks, se_vals, **kwargs)
+        for part, p in paths:
+            yield p
+
+    def _matchingPaths(self, filepart_type, absolute, no_duplicates, no_blanks,
+                       se_vals, **kwargs):
+        """Get a generator of tuple(TuflowFile, filepath) for filepaths()."""
         user_vars = kwargs.get('user_vars', None)
+        seen = set()
+        for part in self._filterParts(TuflowFile, filepart_type, se_vals, **kwargs):
+            if absolute:
+                p = part.absolutePath(user_vars)
+            else:
+                p = part.filenameAndExtension(user_vars)
+
+            if no_duplicates:
+                if p in seen:
+                    continue
+                seen.add(p)
+            if no_blanks and p.strip() == '':
+                continue
+            yield part, p
+
+    def _filterParts(self, instance_type, filepart_type, se_vals, **kwargs):
+        """Get a generator of the parts that pass the common search checks.
+
+        **kwargs:
+            active_only=True(bool): if True inactive parts are skipped.
+            exclude(list): filepart_type's to skip.
+
+        Args:
+            instance_type(TuflowPart): class derived from TuflowPart to restrict
+                the search to.
+            filepart_type: the FILEPART_TYPES value, or list of values, to
+                check. If None all types are included.
+            se_vals(dict): containing scenario and event values to define the
+                search criteria.
+
+        Return:
+            generator - of the TuflowPart's that passed.
+        """
+        active_only = kwargs.get('active_only', True)
+        exclude = set(kwargs.get('exclude', []))
         if filepart_type is None:
-            filepart_type = []
-        elif not isinstance(filepart_type, list):
-            filepart_type = [filepart_type]
-        paths = []
-        parents = {}
+            filepart_type = set()
+        elif isinstance(filepart_type, list):
+            filepart_type = set(filepart_type)
+        else:
+            filepart_type = set([filepart_type])
+
         for part in self.parts:
             if active_only and not part.active:
                 continue
-            p = None
-            if not isinstance(part, TuflowFile):
+            if not isinstance(part, instance_type):
                 continue
             if filepart_type and not part.filepart_type in filepart_type:
                 continue
@@ -311,28 +348,25 @@ class ControlFile(object):
             if se_vals is not None:
                 if not self.checkPartLogic(part, se_vals):
                     continue
+            yield part
 
-            if absolute:
-                p = part.absolutePath(user_vars)
-            else:
-                p = part.filenameAndExtension(user_vars)
+    def _groupByParent(self, found):
+        """Group search results by the filename of their parent.
 
-            if no_duplicates and p in paths:
-                continue
-            if no_blanks and p.strip() == '':
-                continue
-            if p is not None:
-                if by_parent:
-                    if not part.associates.parent.filenameAndExtension() in parents.keys():
-                        parents[part.associates.parent.filenameAndExtension()] = []
-                    parents[part.associates.parent.filenameAndExtension()].append(p)
-                else:
-                    paths.append(p)
+        Args:
+            found(iterable): of tuple(TuflowPart, value) for each result.
 
-        if by_parent:
-            return parents
-        else:
-            return paths
+        Return:
+            dict - containing a list of the values for each parent, keyed on
+                the parent filenameAndExtension().
+        """
+        parents = {}
+        for part, value in found:
+            key = part.associates.parent.filenameAndExtension()
+            if not key in parents:
+                parents[key] = []
+            parents[key].append(value)
+        return parents
 
     def checkPartLogic(self, part, se_vals):
         """Check that the part or it's parents are inside the current logic terms.
@@ -519,7 +553,7 @@ class ControlFile(object):
 
         self.parts.remove(remove_part)
         if last_index + 1 >= len(self.parts.parts):
-            self.parts.parts.append(remove_part)
+            self.parts.append(remove_part)
         else:
             # It's not last_index + 1 becuase we lost an index when removing
             # the old one
@@ -762,7 +796,7 @@ class ControlFile(object):
         # Then remove them
         to_delete.reverse()
         for logic in to_delete:
-            self.logic.parts.remove(logic)
+            self.logic.remove(logic)
 
         # Finally the control_files
         to_delete, _, _ = self.allParentHashes(model_file.hash, self.control_files)
@@ -798,13 +832,13 @@ class ControlFile(object):
 
         if after is not None:
             indices = self.controlFileIndices(after, end=True)
-            self.parts.parts[indices['end_part']: indices['end_part']] = control_file.parts
-            self.logic.parts[indices['end_logic']: indices['end_logic']] = control_file.logic
+            self.parts.insertParts(indices['end_part'], control_file.parts)
+            self.logic.insertParts(indices['end_logic'], control_file.logic)
             self.control_files[indices['end_cfile']: indices['end_cfile']] = control_file.control_files
         elif before is not None:
             indices = self.controlFileIndices(before, start=True)
-            self.parts.parts[indices['start_part']: indices['start_part']] = control_file.parts
-            self.logic.parts[indices['start_logic']: indices['start_logic']] = control_file.logic
+            self.parts.insertParts(indices['start_part'], control_file.parts)
+            self.logic.insertParts(indices['start_logic'], control_file.logic)
             self.control_files[indices['start_cfile']: indices['start_cfile']] = control_file.control_files
 
     def replaceControlFile(self, model_file, control_file, replace_modelfile):
@@ -832,13 +866,24 @@ class PartHolder(object):
         self._max = len(self.parts)
         self._current = 0
 
+        # Positions of the part hashes in self.parts, grouped by the hash of
+        # their parent (None if there's no parent). Use the methods of this
+        # class to change the parts so that it stays in step with them.
+        self._positions = PositionIndex()
+
     def __iter__(self):
         """Return an iterator for the units list"""
         return iter(self.parts)
 
+    def __contains__(self, part):
+        return isinstance(part, TuflowPart) and part.hash in self._positions
+
     def __delitem__(self, key):
-        del self.parts[key]
-        self._max -= 1
+        if isinstance(key, slice):
+            del self.parts[key]
+            self._rebuildIndex()
+        else:
+            self._deletePart(self._checkIndex(key))
 
     def __next__(self):
         """Iterate to the next unit"""
@@ -869,7 +914,9 @@ class PartHolder(object):
         """
         if not isinstance(value, TuflowPart):
             raise ValueError('Item must be of type TuflowPart')
-        self.parts[key] = value
+        index = self._checkIndex(key)
+        self._deletePart(index)
+        self._insertPart(index, value)
 
     def append(self, filepart):
         """Adds part to the end of the parts list. 
@@ -881,7 +928,7 @@ class PartHolder(object):
         """
         if not isinstance(filepart, TuflowPart):
             raise ValueError('filepart must be TuflowPart type')
-        self.parts.append(filepart)
+        self._insertPart(len(self.parts), filepart)
 
     def add(self, filepart, **kwargs):
         """
@@ -892,73 +939,95 @@ class PartHolder(object):
         before = kwargs.get('before', None)
         suppress_add_same = kwargs.get('suppress_add_same', False)
 
-        if filepart in self.parts:
+        if filepart in self:
             if not suppress_add_same:
                 raise ValueError('filepart %s already exists.' % filepart.hash)
 
         # Insert after the after filepart
         if after is not None:
             index = self.index(after)
-            if index == len(self.parts):
-                filepart.associates.logic = after.associates.logic
-                self.parts.append(filepart)
-            else:
-                filepart.associates.logic = after.associates.logic
-                self.parts.insert(index + 1, filepart)
+            filepart.associates.logic = after.associates.logic
+            self._insertPart(index + 1, filepart)
 
         # Insert before the before filepart
         elif before is not None:
             index = self.index(before)
             filepart.associates.logic = before.associates.logic
-            self.parts.insert(index, filepart)
+            self._insertPart(index, filepart)
         else:
             # insert in the list after the last instance of filepart.parent
-            found_parent = False
-            if not self.parts:
-                self.parts.append(filepart)
-            else:
-                index = self.lastIndexOfParent(filepart.associates.parent)
-                if index == -1 or index + 1 >= len(self.parts):
-                    self.parts.append(filepart)
-                else:
-                    self.parts.insert(index + 1, filepart)
+            index = self.lastIndexOfParent(filepart.associates.parent)
+            if index == -1:
+                index = len(self.parts) - 1
+            self._insertPart(index + 1, filepart)
+
+    def insertParts(self, index, parts):
+        """Insert a sequence of parts into the collection.
+
+        Args:
+            index(int): the index to insert the parts at. Negative indexes
+                work in the same way as list.insert().
+            parts(list): the TuflowPart's to insert, in order.
+        """
+        if index < 0:
+            index = max(len(self.parts) + index, 0)
+        for i, p in enumerate(list(parts)):
+            if not isinstance(p, TuflowPart):
+                raise ValueError('filepart must be TuflowPart type')
+            self._insertPart(index + i, p)
 
     def replace(self, part, replace_part):
         """
         """
-        index = self.parts.index(replace_part)
+        index = self.index(replace_part)
         if index == -1:
             raise ValueError('part does not exist in collection')
 
         part.associates.logic = replace_part.associates.logic
-        self.parts.pop(index)
-        self.parts.insert(index, part)
+        self._deletePart(index)
+        self._insertPart(index, part)
+
+    def move(self, part, **kwargs):
+        """Move a part to a new position in the collection.
+
+        **kwargs:
+            'after': the part to move it after.
+            'before': the part to move it before.
+            'take_logic'(bool): if True the moved part will be given the logic
+                of the 'after' or 'before' part. Default is True.
 
-    def move(self, part, **kwargs):  # after):
-        after = kwargs('after', None)
-        before = kwargs('before', None)
+        If both after and before are supplied, after will take precedence.
+
+        Raises:
+            AttributeError: if neither 'after' or 'before' are given.
+            ValueError: if part or the 'after'/'before' part are not in the
+                collection.
+        """
+        after = kwargs.get('after', None)
+        before = kwargs.get('before', None)
         if after is None and before is None:
             raise AttributeError('Either before or after part must be given')
-        take_logic = kwargs('take_logic', True)
+        take_logic = kwargs.get('take_logic', True)
+        adjacent = after if after is not None else before
+
+        if self.index(part) == -1 or self.index(adjacent) == -1:
+            raise ValueError('part does not exist in collection')
 
-        pindex = self.index(part)
-        aindex = self.index(after)
-        self.parts.insert(aindex, self.parts.pop(pindex))
+        self._deletePart(self.index(part))
+        if take_logic:
+            part.associates.logic = adjacent.associates.logic
+        index = self.index(adjacent)
+        if after is not None:
+            index += 1
+        self._insertPart(index, part)
 
     def index(self, part):
         if not isinstance(part, TuflowPart):
             raise ValueError('part must be TuflowPart type')
-        try:
-            return self.parts.index(part)
-        except ValueError:
-            return -1
+        return self._positions.index(part.hash)
 
     def lastIndexOfParent(self, parent):
-        index = -1
-        for i, p in enumerate(self.parts):
-            if p.associates.parent == parent:
-                index = i
-        return index
+        return self._positions.lastIndexOfGroup(self._parentKey(parent))
 
 
 #     def get(self, filepart, filepart_type=None):
@@ -972,9 +1041,59 @@ class PartHolder(object):
         """
         """
         index = self.index(filepart)
-        fpart = self.parts[index]
-        del self.parts[index]
-        return fpart
+        if index == -1:
+            raise ValueError('part does not exist in collection')
+        return self._deletePart(index)
+
+    def _parentKey(self, parent):
+        return None if parent is None else parent.hash
+
+    def _checkIndex(self, index):
+        if index < 0:
+            index += len(self.parts)
+        if index < 0 or index >= len(self.parts):
+            raise IndexError('list index out of range')
+        return index
+
+    def _insertPart(self, index, part):
+        """Insert a part into self.parts and update the lookup tables.
+
+        The parent of the part is recorded when it's added. If it's changed
+        afterwards lastIndexOfParent() won't know about it.
+
+        Args:
+            index(int): the index to insert the part at. Negative indexes
+                work in the same way as list.insert().
+            part(TuflowPart): the part to insert.
+        """
+        if index < 0:
+            index = max(len(self.parts) + index, 0)
+        index = min(index, len(self.parts))
+        self.parts.insert(index, part)
+        self._max = len(self.parts)
+        self._positions.insert(index, part.hash,
+                               self._parentKey(part.associates.parent))
+
+    def _deletePart(self, index):
+        """Delete the part at index and update the lookup tables.
+
+        Args:
+            index(int): the index of the part to delete.
+
+        Return:
+            TuflowPart - the deleted part.
+        """
+        part = self.parts.pop(index)
+        self._max = len(self.parts)
+        self._positions.delete(index)
+        return part
+
+    def _rebuildIndex(self):
+        """Rebuild the lookup tables from scratch."""
+        self._positions.clear()
+        self._max = len(self.parts)
+        for i, p in enumerate(self.parts):
+            self._positions.insert(i, p.hash, self._parentKey(p.associates.parent))
 
 
 class LogicHolder(object):
@@ -987,6 +1106,10 @@ class LogicHolder(object):
         self.remove_callback = remove_callback
         self.add_callback = add_callback
 
+        # The logic parts with each hash, for partFromHash(). Don't change
+        # self.parts directly or it will be out of date.
+        self._hashes = {}
+
     def __iter__(self):
         """Return an iterator for the units list"""
         return iter(self.parts)
@@ -1020,7 +1143,9 @@ class LogicHolder(object):
         """
         if not isinstance(value, TuflowPart):
             raise ValueError('Item must be of type TuflowPart')
+        self._removeHash(self.parts[key])
         self.parts[key] = value
+        self._addHash(value)
 
     def getAllParts(self, hash_only):
         output = []
@@ -1032,16 +1157,64 @@ class LogicHolder(object):
         return output
 
     def partFromHash(self, hash):
-        for p in self.parts:
-            if p.hash == hash:
-                return p
-        return None
+        parts = self._hashes.get(hash, None)
+        if not parts:
+            return None
+        return parts[0]
 
     def add(self, logic):
         for l in logic:
             l.remove_callback = self.remove_callback
             l.add_callback = self.add_callback
             self.parts.append(l)
+            self._addHash(l)
+        self._max = len(self.parts)
+
+    def insertParts(self, index, logic):
+        """Insert a sequence of logic parts.
+
+        Unlike add() the callbacks of the logic are not changed.
+
+        Args:
+            index(int): the index to insert the logic at. Negative indexes
+                work in the same way as list.insert().
+            logic(list): the TuflowLogic parts to insert, in order.
+        """
+        logic = list(logic)
+        self.parts[index:index] = logic
+        for l in logic:
+            self._addHash(l)
+        self._max = len(self.parts)
+
+    def remove(self, logic):
+        """Remove a logic part.
+
+        Args:
+            logic(TuflowLogic): the part to remove.
+
+        Raises:
+            ValueError: if logic is not in the collection.
+        """
+        self.parts.remove(logic)
+        self._removeHash(logic)
+        self._max = len(self.parts)
+
+    def _addHash(self, logic):
+        if not logic.hash in self._hashes:
+            self._hashes[logic.hash] = []
+        self._hashes[logic.hash].append(logic)
+
+    def _removeHash(self, logic):
+        parts = self._hashes.get(logic.hash, [])
+        for i, p in enumerate(parts):
+            if p is logic:
+                del parts[i]
+                break
+        else:
+            if parts:
+                del parts[0]
+        if not parts:
+            self._hashes.pop(logic.hash, None)
 
 
 class TcfControlFile(ControlFile):
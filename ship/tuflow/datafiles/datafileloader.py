@@ -142,6 +142,31 @@ def readXsFile(datafile):
     comment_types = []
     xs_enum = dataobj.XsEnum()
 
+    def addRecords(records, row_collection):
+        """Adds the values in each record to the row_collection.
+
+        The records are split into columns first so they can all be added
+        with one call to RowDataCollection.addColumns().
+        """
+        columns = dict((k, []) for k in xs_enum.ITERABLE)
+        columns['row_no'] = []
+        for i, record in enumerate(records):
+            for j, entry in enumerate(record):
+                if not j in columns:
+                    raise KeyError('Key %s does not exist in collection' % (j))
+                columns[j].append(entry)
+
+            # Need to catch the fact that skew does not exist in some versions.
+            if len(record) < len(xs_enum.ITERABLE):
+                logger.info('1d_xs does not have skew column - adding default value')
+                for k in range(len(record), len(xs_enum.ITERABLE)):
+                    columns[k].append(None)
+
+            columns['row_no'].append(i)
+
+        row_collection.addColumns(columns)
+        return row_collection
+
     def loadShapeFile(file_path, row_collection):
         """Loads cross section data from Shapefile .dbf format.
 
@@ -153,22 +178,7 @@ def readXsFile(datafile):
             logger.error('Unable to load file at: ' + file_path)
             raise IOError('Unable to load file at: ' + file_path)
 
-        for i, t in enumerate(table.records):
-            count = 0
-            for entry in t.values():
-                row_collection._addValue(count, entry)
-                count += 1
-
-            # Need to catch the fact that skew does not exist in some versions.
-            if count < len(xs_enum.ITERABLE):
-                logger.info('1d_xs does not have skew column - adding default value')
-                for k in range(count, len(xs_enum.ITERABLE)):
-                    row_collection._addValue(k)
-
-#             print t['Source'] + ' : ' + t['Type'] + ' : ' + t['Column_1']
-            row_collection._addValue('row_no', i)
-
-        return row_collection
+        return addRecords([list(t.values()) for t in table.records], row_collection)
 
     def loadMapinfoFile(file_path, row_collection):
         """Load cross section data from Mapinfo .mid format.
@@ -176,25 +186,13 @@ def readXsFile(datafile):
         try:
             with open(file_path, 'rb') as csv_file:
                 csv_file = csv.reader(csv_file)
-                for i, row in enumerate(csv_file):
-
-                    for j, entry in enumerate(row):
-                        row_collection._addValue(j, entry)
-
-                    # Need to catch the fact that skew does not exist in some versions.
-                    if len(row) < len(xs_enum.ITERABLE):
-                        logger.info('1d_xs does not have skew column - adding deafult value')
-                        for k in range(len(row), len(xs_enum.ITERABLE)):
-                            row_collection._addValue(k)
-
-    #                 print row[0] + ' : ' + row[1] + ' : ' + row[3]
-                    row_collection._addValue('row_no', i)
+                records = [row for row in csv_file]
 
         except IOError:
             logger.error('Unable to load file at: ' + file_path)
             raise IOError('Unable to load file at: ' + file_path)
 
-        return row_collection
+        return addRecords(records, row_collection)
 
     def setupRowCollection():
         """Setup the RowDataCollection for loading the data into.
@@ -15,10 +15,13 @@ logger = logging.getLogger(__name__)
 
 class TuflowFactory(object):
 
+    filepart_types = TuflowFilepartTypes()
+    """Shared lookup of the known commands, so it's only compiled once."""
+
     @classmethod
     def getTuflowPart(cls, line, parent, part_type=None, logic=None):
 
-        filepart_types = TuflowFilepartTypes()
+        filepart_types = cls.filepart_types
         line = line.strip()
         upline = line.upper()
         if part_type is None:
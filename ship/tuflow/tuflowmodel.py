@@ -28,6 +28,7 @@
 
 from __future__ import unicode_literals
 
+import re
 from itertools import chain
 
 from ship.tuflow.tuflowfilepart import TuflowFile, TuflowKeyValue, TuflowUserVariable, TuflowModelVariable
@@ -512,6 +513,10 @@ class TuflowFilepartTypes(object):
         ]
         self.types[fpt.MODEL_VARIABLE] = ['MODEL SCENARIOS', 'MODEL EVENTS', ]
 
+        # Compiled from self.types the first time find() is called
+        self._matchers = None
+        self._command_types = None
+
     def find(self, find_val, file_type='*'):
         """Checks if the given value is known or not.
 
@@ -538,22 +543,50 @@ class TuflowFilepartTypes(object):
             Tuple (Bool, int) True if found. Int is the class constant 
                 indicating what type the value was found under.
         """
+        if self._matchers is None:
+            self._compile()
+
         find_val = find_val.upper()
         if file_type == '*':
-            for key, part_type in self.types.items():
-                found = [i for i in part_type if find_val.startswith(i)]
-                if found:
-                    retval = key
-                    if found[0] in self.ambiguous_keys:
-                        retval = self._checkAmbiguity(found[0], find_val, key)
-                    return True, retval
+            found = self._matchers['*'].match(find_val)
+            if found:
+                found = found.group(0)
+                retval = self._command_types[found]
+                if found in self.ambiguous_keys:
+                    retval = self._checkAmbiguity(found, find_val, retval)
+                return True, retval
             return (False, None)
         else:
-            found = [i for i in self.types[file_type] if find_val.startswith(i)]
-            if found:
+            if self._matchers[file_type].match(find_val):
                 return True, file_type
             return (False, None)
 
+    def _compile(self):
+        """Compiles the known keywords into the regexes used by find().
+
+        Each regex is an alternation of the keywords anchored to the start of
+        the value. The alternatives are tried in order, so the keywords are
+        added in the same order that the categories and keywords in
+        self.types would be checked one by one; the first category containing
+        a keyword that the value starts with, and the first of those keywords,
+        is the one matched.
+        """
+        self._matchers = {}
+        self._command_types = {}
+        commands = []
+        for key, part_type in self.types.items():
+            self._matchers[key] = self._alternation(part_type)
+            for c in part_type:
+                self._command_types.setdefault(c, key)
+                commands.append(c)
+        self._matchers['*'] = self._alternation(commands)
+
+    def _alternation(self, commands):
+        """Get a regex matching values that start with any of the commands."""
+        if not commands:
+            return re.compile('(?!)')  # Never matches
+        return re.compile('|'.join(re.escape(c) for c in commands))
+
     def _checkAmbiguity(self, found, find_val, key):
         """Resolves any ambiguity in the keys."""
         f = find_val.replace(' ', '')
@@ -0,0 +1,284 @@
+"""
+
+ Summary:
+    Cache of parsed tuflow control files.
+
+    Most of the .tgc, .tbc, etc files in a tuflow project are shared by
+    lots of .tcf files. Loading each tcf would normally read and parse all of
+    them again. ControlFileCache keeps the TuflowPart's created when a
+    control file is parsed so that the next load of the same, unchanged,
+    file can use a copy of them instead.
+
+    Entries are keyed on the absolute path of the control file and are only
+    used if its size and modified time still match. They are kept in memory
+    for the life of the process and can also be stored on disk with a
+    DatCache.
+
+    The parts are stored pickled, with the ModelFile that they were read
+    from swapped for a placeholder. When an entry is used the placeholder is
+    replaced with the new ModelFile, so the parts are re-parented to it, and
+    each part is given a new hash.
+
+ TODO:
+
+ Updates:
+
+"""
+from __future__ import unicode_literals
+
+import os
+import io
+import uuid
+import pickle
+from collections import OrderedDict
+
+from ship.tuflow import tuflowfilepart as tuflowpart
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+PARENT_ID = 'control_part'
+"""Persistent id used in place of the ModelFile the parts were read from."""
+
+
+class ControlFileCache(object):
+    """Stores the results of parsing tuflow control files.
+
+    An entry is the tuple(contents, logic, actions) returned by
+    TuflowLoader._readControlFile(). Files are cached separately for each
+    root and model_type of the ModelFile referencing them, as these are
+    copied into the parts when they're created.
+    """
+
+    FORMAT_VERSION = 1
+    """Changed whenever the format of the cached data changes."""
+
+    DEFAULT_MAX_ENTRIES = 500
+    """Default maximum number of entries kept in memory."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        """Constructor.
+
+        Args:
+            max_entries=DEFAULT_MAX_ENTRIES(int): maximum number of control
+                files kept in memory. The least recently used are removed
+                first.
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def fileStamp(self, control_part):
+        """Get the details used to check whether a cache entry is current.
+
+        Args:
+            control_part(ModelFile): the control file that will be read.
+
+        Return:
+            dict - containing the 'path', 'size' and 'mtime' of the file, or
+                None if the file can't be found.
+        """
+        path = os.path.abspath(control_part.absolutePath())
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return {
+            'version': ControlFileCache.FORMAT_VERSION, 'path': path,
+            'size': stat.st_size, 'mtime': stat.st_mtime,
+        }
+
+    def isCurrent(self, control_part):
+        """Check whether there is a current in memory entry for a file.
+
+        Args:
+            control_part(ModelFile): the control file that will be read.
+
+        Return:
+            bool - True if load() will return the file from memory.
+        """
+        stamp = self.fileStamp(control_part)
+        if stamp is None:
+            return False
+        entry = self._entries.get(self._key(stamp, control_part), None)
+        return entry is not None and entry[0] == stamp
+
+    def load(self, control_part, disk_cache=None):
+        """Get a copy of the parsed contents of a control file.
+
+        Args:
+            control_part(ModelFile): the control file that will be read. The
+                parts returned will have this as their parent.
+            disk_cache=None(DatCache): if given it will be checked for the
+                file when it's not in memory.
+
+        Return:
+            tuple(list, list, list) - see TuflowLoader._readControlFile(), or
+                None if there isn't a current entry for the file.
+        """
+        stamp = self.fileStamp(control_part)
+        if stamp is None:
+            return None
+        key = self._key(stamp, control_part)
+
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry[0] != stamp:
+            entry = None
+        if entry is None and disk_cache is not None:
+            cached = disk_cache.load(stamp, self._variant(control_part))
+            if cached is not None:
+                entry = (stamp, cached[0])
+        if entry is None:
+            return None
+
+        try:
+            results = loadParts(entry[1], control_part)
+        except Exception as err:
+            logger.warning('Unable to read cache entry for %s: %s' % (stamp['path'], err))
+            return None
+
+        # Re-insert to mark it as the most recently used
+        self._entries[key] = entry
+        logger.debug('Loaded from cache: ' + stamp['path'])
+        return results
+
+    def store(self, control_part, results, disk_cache=None):
+        """Add the parsed contents of a control file to the cache.
+
+        This must be called straight after parsing the file, before the parts
+        are added to a ControlFile. Failing to store the entry is logged but
+        not raised, as the cache is only an optimisation.
+
+        Args:
+            control_part(ModelFile): the control file that was read.
+            results(tuple): returned by TuflowLoader._readControlFile().
+            disk_cache=None(DatCache): if given the entry will be stored in
+                it as well.
+
+        Return:
+            bool - True if the entry was stored.
+        """
+        stamp = self.fileStamp(control_part)
+        if stamp is None:
+            return False
+        try:
+            data = dumpParts(results, control_part)
+        except Exception as err:
+            logger.debug('Unable to cache %s: %s' % (stamp['path'], err))
+            return False
+
+        self._entries.pop(self._key(stamp, control_part), None)
+        self._entries[self._key(stamp, control_part)] = (stamp, data)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        if disk_cache is not None:
+            disk_cache.store(stamp, data, variant=self._variant(control_part))
+        return True
+
+    def clear(self):
+        """Remove all of the entries held in memory."""
+        self._entries = OrderedDict()
+
+    def _variant(self, control_part):
+        return '%s|%s' % (control_part.model_type, control_part.root)
+
+    def _key(self, stamp, control_part):
+        return (os.path.normcase(stamp['path']), self._variant(control_part))
+
+
+class _PartPickler(pickle.Pickler):
+    """Pickler that leaves out the ModelFile the parts were read from."""
+
+    def __init__(self, f, control_part):
+        pickle.Pickler.__init__(self, f, pickle.HIGHEST_PROTOCOL)
+        self.control_part = control_part
+
+    def persistent_id(self, obj):
+        if obj is self.control_part:
+            return PARENT_ID
+        return None
+
+
+class _PartUnpickler(pickle.Unpickler):
+    """Unpickler that puts the new ModelFile back in place of the old one."""
+
+    def __init__(self, f, control_part):
+        pickle.Unpickler.__init__(self, f)
+        self.control_part = control_part
+
+    def persistent_load(self, pid):
+        if pid == PARENT_ID:
+            return self.control_part
+        raise pickle.UnpicklingError('Unknown persistent id: %s' % pid)
+
+
+def dumpParts(results, control_part):
+    """Pickle the results of parsing a control file.
+
+    Args:
+        results(tuple): returned by TuflowLoader._readControlFile().
+        control_part(ModelFile): the control file that was read.
+
+    Return:
+        bytes - the pickled results.
+    """
+    # Only the associates registered while reading the file are kept; these
+    # will be added to the new parent's observers when loaded.
+    observers = [o for o in control_part.observers if _isChild(o, control_part)]
+    f = io.BytesIO()
+    _PartPickler(f, control_part).dump((results, observers))
+    return f.getvalue()
+
+
+def loadParts(data, control_part):
+    """Unpickle the results of parsing a control file.
+
+    The parts are re-parented to control_part and given new hashes.
+
+    Args:
+        data(bytes): returned by dumpParts().
+        control_part(ModelFile): the control file to use as the parent.
+
+    Return:
+        tuple - see TuflowLoader._readControlFile().
+    """
+    results, observers = _PartUnpickler(io.BytesIO(data), control_part).load()
+    control_part.observers.extend(observers)
+
+    renewHashes(results[0] + results[1])
+    return results
+
+
+def renewHashes(parts):
+    """Give a set of parts new hashes, updating any logic that holds them.
+
+    The logic that the parts are in is updated as well, so logic blocks that
+    weren't closed in the file are included.
+
+    Args:
+        parts(list): the TuflowPart's to update.
+    """
+    new_hashes = {}
+    logic = []
+    for p in parts:
+        while p is not None and not p.hash in new_hashes:
+            old_hash = p.hash
+            p.hash = uuid.uuid4()
+            new_hashes[old_hash] = p.hash
+            new_hashes[p.hash] = p.hash
+            if isinstance(p, tuflowpart.TuflowLogic):
+                logic.append(p)
+            p = p.associates.logic
+
+    for l in logic:
+        l.parts = [new_hashes.get(h, h) for h in l.parts]
+
+
+def _isChild(observer, control_part):
+    return isinstance(observer, tuflowpart.AssociatedParts) and \
+        observer.parent is control_part
@@ -0,0 +1,210 @@
+"""
+
+ Summary:
+    On-disk cache of loaded .dat/.ied file DatCollection's.
+
+    Loading a large .dat file means parsing every unit in it. If the file
+    hasn't changed since the last time it was loaded the DatCollection can be
+    read back from the cache instead, which only costs one unpickle.
+
+    Entries are keyed on the absolute path of the file and are only used if
+    the size, modified time and content hash of the file still match the ones
+    stored with the entry. The cache folder has a maximum size; when it goes
+    over this the least recently used entries are deleted.
+
+ TODO:
+
+ Updates:
+
+"""
+from __future__ import unicode_literals
+
+import os
+import pickle
+import hashlib
+import tempfile
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+class DatCache(object):
+    """Stores loaded DatCollection's in a folder on disk.
+
+    Each entry is a file in cache_dir containing two pickles. The first is a
+    small dict describing the file that was loaded (see fileStamp()) so that
+    stale entries can be spotted without reading the whole model. The second
+    is the loaded DatCollection and the loader warnings.
+    """
+
+    FORMAT_VERSION = 3
+    """Changed whenever the format of the cached data changes."""
+
+    DEFAULT_MAX_SIZE = 500 * 1024 * 1024
+    """Default maximum size of the cache folder in bytes."""
+
+    EXTENSION = '.datcache'
+
+    def __init__(self, cache_dir, max_size=DEFAULT_MAX_SIZE):
+        """Constructor.
+
+        Args:
+            cache_dir(str): the folder to store the cache entries in. It will
+                be created if it doesn't exist.
+            max_size=DEFAULT_MAX_SIZE(int): maximum size of all entries in
+                the cache folder in bytes.
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+    def fileStamp(self, file_path):
+        """Get the details used to check whether a cache entry is current.
+
+        Args:
+            file_path(str): the path of the file that will be loaded.
+
+        Return:
+            dict - containing the 'path', 'size', 'mtime' and 'hash' of the
+                file.
+
+        Raises:
+            IOError/OSError: if the file can't be read.
+        """
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        sha = hashlib.sha1()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(chunk)
+        return {
+            'version': DatCache.FORMAT_VERSION, 'path': file_path,
+            'size': stat.st_size, 'mtime': stat.st_mtime,
+            'hash': sha.hexdigest()
+        }
+
+    def load(self, stamp, variant=''):
+        """Get the cached contents for a file if they are still current.
+
+        If the entry exists but doesn't match the stamp it will be deleted.
+
+        Args:
+            stamp(dict): the fileStamp() of the file being loaded.
+            variant=''(str): identifies different ways of loading the same
+                file (e.g. lazy or full loads), which are cached separately.
+
+        Return:
+            tuple(DatCollection, list) - the cached collection and loader
+                warnings, or None if there is no current entry.
+        """
+        entry_path = self._entryPath(stamp['path'], variant)
+        if not os.path.exists(entry_path):
+            return None
+
+        try:
+            with open(entry_path, 'rb') as f:
+                if pickle.load(f) != stamp:
+                    logger.debug('Cache entry is out of date: ' + entry_path)
+                    f.close()
+                    self._remove(entry_path)
+                    return None
+                units, warnings = pickle.load(f)
+        except Exception as err:
+            logger.warning('Unable to read cache entry %s: %s' % (entry_path, err))
+            self._remove(entry_path)
+            return None
+
+        # Mark the entry as recently used for eviction
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+        return units, warnings
+
+    def store(self, stamp, units, warnings=[], variant=''):
+        """Add the contents of a loaded file to the cache.
+
+        Failing to write the entry is logged but not raised, as the cache is
+        only an optimisation.
+
+        Args:
+            stamp(dict): the fileStamp() of the file, taken before loading.
+            units(DatCollection): the loaded collection.
+            warnings=[](list): warnings raised by the loader.
+            variant=''(str): see load().
+
+        Return:
+            bool - True if the entry was stored.
+        """
+        entry_path = self._entryPath(stamp['path'], variant)
+        temp_path = None
+        try:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir)
+
+            # Write to a temporary file first so that other processes never
+            # see a partially written entry
+            fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(stamp, f, pickle.HIGHEST_PROTOCOL)
+                pickle.dump((units, warnings), f, pickle.HIGHEST_PROTOCOL)
+            self._replace(temp_path, entry_path)
+        except Exception as err:
+            logger.warning('Unable to write cache entry %s: %s' % (entry_path, err))
+            if temp_path is not None:
+                self._remove(temp_path)
+            return False
+
+        self.evict()
+        return True
+
+    def evict(self):
+        """Delete the least recently used entries until under max_size."""
+        entries = []
+        total = 0
+        for e in self._entries():
+            try:
+                stat = os.stat(e)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, e))
+            total += stat.st_size
+
+        entries.sort()
+        for mtime, size, e in entries:
+            if total <= self.max_size:
+                break
+            self._remove(e)
+            total -= size
+
+    def clear(self):
+        """Delete all of the entries in the cache."""
+        for e in self._entries():
+            self._remove(e)
+
+    def _entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        return [
+            os.path.join(self.cache_dir, f) for f in os.listdir(self.cache_dir)
+            if f.endswith(DatCache.EXTENSION)
+        ]
+
+    def _entryPath(self, file_path, variant):
+        key = os.path.normcase(os.path.abspath(file_path)) + '|' + variant
+        key = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + DatCache.EXTENSION)
+
+    def _replace(self, src, dst):
+        if hasattr(os, 'replace'):
+            os.replace(src, dst)
+        else:
+            if os.path.exists(dst):
+                os.remove(dst)
+            os.rename(src, dst)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
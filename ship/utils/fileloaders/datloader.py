@@ -36,12 +36,44 @@ from ship.fmp.fmpunitfactory import FmpUnitFactory
 from ship.utils import utilfunctions as uf
 from ship.fmp.datunits.isisunit import UnknownUnit
 from ship.fmp.datcollection import DatCollection
+from ship.fmp.datcollection import LazyUnit
+
+try:
+    from concurrent import futures
+except ImportError:
+    futures = None
 
 import logging
 logger = logging.getLogger(__name__)
 """logging references with a __name__ set to this module."""
 
 
+def _readUnits(args):
+    """Read a chunk of units for DatLoader.buildParallelDat().
+
+    This is module level so that it can be run in a worker process.
+
+    Args:
+        args(tuple): (contents, units) where contents is the list of lines
+            containing the units and units is a list of (file_key,
+            start_line, file_order) tuples for each unit, relative to
+            contents.
+
+    Return:
+        list - of (AUnit, file_line) tuples, in the order given, where
+            file_line is the last contents index read by the unit.
+    """
+    contents, units = args
+    unit_factory = FmpUnitFactory()
+    out = []
+    for file_key, start_line, file_order in units:
+        file_line, unit = unit_factory.createUnitFromFile(
+            contents, start_line, file_key, file_order
+        )
+        out.append((unit, file_line))
+    return out
+
+
 class DatLoader(ATool, ALoader):
     """
     Isis data file (.DAT) I/O methods.
@@ -56,6 +88,9 @@ class DatLoader(ATool, ALoader):
     aren't being used yet.
     """
 
+    PARALLEL_CHUNK_LINES = 2000
+    """Minimum number of lines read by each worker in buildParallelDat()."""
+
     def __init__(self):
         """Constructor."""
 
@@ -89,8 +124,18 @@ class DatLoader(ATool, ALoader):
         will just be collected in the universal 'UnknownUnit' and printed
         back out the same as it came in.
 
+        arg_dict accepts:
+
+            'lazy'(bool): if True the file will only be indexed when loaded.
+                The units will be read the first time that they are accessed.
+                See buildLazyDat() for more details. Default is False.
+            'workers'(int): if more than 1 the units will be read in
+                parallel by this many processes. See buildParallelDat() for
+                more details. Ignored if 'lazy' is True. Default is 1.
+
         Args:
             file_path (str): path to the .dat file to load.
+            arg_dict={}(Dict): keyword referenced arguments (see above).
 
         Returns:
             units - UnitCollection containing the dat file units or False if
@@ -133,6 +178,11 @@ class DatLoader(ATool, ALoader):
     def buildDat(self, contents, arg_dict={}):
         """
         """
+        if arg_dict.get('lazy', False):
+            return self.buildLazyDat(contents)
+        if arg_dict.get('workers', 1) > 1:
+            return self.buildParallelDat(contents, arg_dict['workers'])
+
         self.contents = contents
 
         # Counter for the number of rows that have been read from the
@@ -208,6 +258,190 @@ class DatLoader(ATool, ALoader):
         del self.unknown_data
         return self.units
 
+    def buildLazyDat(self, contents, unit_factory=None):
+        """Index the .dat file contents without reading the units.
+
+        Does a quick scan of the first word on each line to find where the
+        units start and adds a LazyUnit for each one to the DatCollection. 
+        The LazyUnit's are read the first time that they are accessed 
+        through the DatCollection. Any that are never accessed will be 
+        written back out exactly as they were read.
+
+        The header, comment and gis info units are cheap to read, and needed
+        to find the extent of some of the other units, so they are read
+        straight away. All other units end on the line before the next unit
+        that is found. If a unit uses less lines than this when it's read the
+        rest will be put into an UnknownUnit.
+
+        Args:
+            contents(list): the lines of the .dat file.
+            unit_factory=None(FmpUnitFactory): the factory that the
+                LazyUnit's should be read with. A new one is used if not given.
+
+        Return:
+            DatCollection - containing LazyUnit's for the units in the file.
+        """
+        self.contents = contents
+        self.unknown_data = []
+
+        if unit_factory is None:
+            unit_factory = FmpUnitFactory()
+        unit_vars = unit_factory.getUnitIdentifiers()
+        no_of_lines = len(self.contents)
+
+        i = 0
+        if not self.is_ied:
+            i, self.temp_unit = unit_factory.createUnitFromFile(self.contents, 0, 'HEADER', 0)
+            self.updateSubContents()
+
+        # The LazyUnit waiting for the start of the next unit to find its end
+        open_unit = None
+        while i < no_of_lines:
+            line = self.contents[i]
+            if line.strip():
+                first_word = line.split()[0].strip()
+            else:
+                first_word = 'Nothing'
+
+            unit_class = None
+            if first_word in unit_vars:
+                unit_class = unit_factory.unitClass(self.contents, i, first_word)
+
+            # Not the start of a unit. It either belongs to the unit
+            # currently being indexed or goes into an UnknownUnit
+            if unit_class is None:
+                if open_unit is None:
+                    self.unknown_data.append(line.rstrip('\n'))
+                    if first_word in unit_vars:
+                        i += 1
+                        self.unknown_data.append(self.contents[i].rstrip('\n'))
+                elif first_word in unit_vars:
+                    i += 1
+                i += 1
+                continue
+
+            if open_unit is not None:
+                open_unit.end_line = i - 1
+                open_unit = None
+            if self.unknown_data:
+                self.createUnknownSection()
+                self.updateSubContents()
+
+            if first_word in ('COMMENT', 'GISINFO'):
+                i, self.temp_unit = unit_factory.createUnitFromFile(
+                    self.contents, i, first_word, self.cur_no_of_units
+                )
+                self.updateSubContents()
+
+            else:
+                self.temp_unit = LazyUnit(
+                    self.units, self.contents, unit_factory, unit_class,
+                    first_word, i, no_of_lines - 1, self.cur_no_of_units
+                )
+                if first_word == 'INITIAL':
+                    # Initial conditions length is known from the node count
+                    i += unit_factory.unit_count + 1
+                    self.temp_unit.end_line = i
+                else:
+                    open_unit = self.temp_unit
+                self.updateSubContents()
+
+            i += 1
+
+        if self.unknown_data:
+            self.createUnknownSection()
+            self.updateSubContents()
+
+        del self.unknown_data
+        return self.units
+
+    def buildParallelDat(self, contents, workers):
+        """Read the units in the .dat file contents on a process pool.
+
+        The file is indexed with buildLazyDat() to find where each unit
+        starts and ends. The units are then split into chunks of consecutive
+        units, which are read by the worker processes.
+
+        The results are put back into the DatCollection in file order and
+        the initial conditions labels are found from them in the same order
+        as a normal load. The InitialConditionsUnit is read last, once all
+        of the labels are known. This means that the DatCollection will be
+        the same as the one created by buildDat().
+
+        If the file is too small to split up, or concurrent.futures is not
+        available, the chunks will be read in this process instead.
+
+        Args:
+            contents(list): the lines of the .dat file.
+            workers(int): the maximum number of processes to use.
+
+        Return:
+            DatCollection - containing the units in the file.
+        """
+        unit_factory = FmpUnitFactory()
+        self.buildLazyDat(contents, unit_factory)
+        lazy_units = [
+            u for u in self.units.units
+            if isinstance(u, LazyUnit) and u.unit_type != 'initial_conditions'
+        ]
+
+        chunks = self._parallelChunks(lazy_units, workers)
+        chunk_args = []
+        for chunk in chunks:
+            offset = chunk[0].start_line
+            chunk_args.append((
+                contents[offset:chunk[-1].end_line + 1],
+                [(u.file_key, u.start_line - offset, u.file_order) for u in chunk]
+            ))
+
+        if futures is None or len(chunks) < 2:
+            results = [_readUnits(args) for args in chunk_args]
+        else:
+            with futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_readUnits, chunk_args))
+
+        for chunk, result in zip(chunks, results):
+            offset = chunk[0].start_line
+            for lazy_unit, (unit, file_line) in zip(chunk, result):
+                # Each worker had its own factory so the labels need adding
+                # to this one, in file order, for the initial conditions
+                unit_factory.findIcLabels(unit)
+                self.units.swapLazyUnit(lazy_unit, unit, file_line + offset)
+
+        # Reads the InitialConditionsUnit, if there is one
+        self.units.unit('initial_conditions')
+        return self.units
+
+    def _parallelChunks(self, lazy_units, workers):
+        """Split the units into groups of consecutive units to read together.
+
+        Aims for a few chunks per worker, so that they can be balanced
+        between the processes, but with no less than PARALLEL_CHUNK_LINES in
+        each one.
+
+        Args:
+            lazy_units(list): the LazyUnit's to split up, in file order.
+            workers(int): the number of processes that will read them.
+
+        Return:
+            list - of lists of LazyUnit's.
+        """
+        if not lazy_units:
+            return []
+        total_lines = lazy_units[-1].end_line - lazy_units[0].start_line + 1
+        no_of_chunks = min(workers * 4, total_lines // self.PARALLEL_CHUNK_LINES)
+        chunk_lines = total_lines / float(max(no_of_chunks, 1))
+
+        chunks = [[]]
+        chunk_end = lazy_units[0].start_line + chunk_lines
+        for u in lazy_units:
+            if chunks[-1] and u.start_line >= chunk_end:
+                chunks.append([])
+                while u.start_line >= chunk_end:
+                    chunk_end += chunk_lines
+            chunks[-1].append(u)
+        return chunks
+
     def createUnknownSection(self):
         """Builds unidentified sections from the .DAT file.
 
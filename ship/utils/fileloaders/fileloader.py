@@ -24,6 +24,7 @@ from ship.utils import utilfunctions as uuf
 from ship.utils.fileloaders import tuflowloader
 from ship.utils.fileloaders import iefloader
 from ship.utils.fileloaders import datloader
+from ship.utils.fileloaders.datcache import DatCache
 
 import logging
 logger = logging.getLogger(__name__)
@@ -47,6 +48,15 @@ class FileLoader(object):
     def loadFile(self, filepath, arg_dict={}):
         """Load a file from disk.
 
+        .dat and .ied files can be cached on disk so that loading the same,
+        unchanged, file again doesn't need to parse it. arg_dict accepts:
+
+            'cache_dir'(str): folder to store the cached DatCollection's in.
+                If not given the cache is not used.
+            'cache_size'(int): maximum size of the cache folder in bytes. The
+                least recently used entries will be deleted when it's larger.
+                Default is DatCache.DEFAULT_MAX_SIZE.
+
         Args:
             filepath (str): the path to the file to load.
             arg_dict={}(Dict): contains keyword referenced arguments needed by
@@ -73,9 +83,49 @@ class FileLoader(object):
             logger.error('File type %s is not currently supported for loading' % ext)
             raise AttributeError('File type %s is not currently supported for loading' % ext)
 
+        if ext.lower() in ('dat', 'ied') and arg_dict.get('cache_dir', None):
+            cache = DatCache(
+                arg_dict['cache_dir'],
+                arg_dict.get('cache_size', DatCache.DEFAULT_MAX_SIZE)
+            )
+            return self._loadCachedDat(cache, filepath, arg_dict)
+
         loader = self._known_files[ext]()
         contents = loader.loadFile(filepath, arg_dict)
         self.warnings = loader.warnings
 
         del loader
         return contents
+
+    def _loadCachedDat(self, cache, filepath, arg_dict):
+        """Load a .dat/.ied file from the cache, or load it and cache it.
+
+        Args:
+            cache(DatCache): the cache to use.
+            filepath(str): the path to the file to load.
+            arg_dict(dict): see loadFile().
+
+        Return:
+            DatCollection - loaded from filepath.
+        """
+        variant = 'lazy' if arg_dict.get('lazy', False) else 'full'
+        try:
+            stamp = cache.fileStamp(filepath)
+        except (IOError, OSError):
+            # Let the loader deal with missing files as usual
+            stamp = None
+
+        if stamp is not None:
+            cached = cache.load(stamp, variant)
+            if cached is not None:
+                logger.debug('Loaded from cache: ' + filepath)
+                units, self.warnings = cached
+                return units
+
+        ext = uuf.fileExtensionWithoutPeriod(filepath).lower()
+        loader = self._known_files[ext]()
+        contents = loader.loadFile(filepath, arg_dict)
+        self.warnings = loader.warnings
+        if stamp is not None and contents:
+            cache.store(stamp, contents, self.warnings, variant)
+        return contents
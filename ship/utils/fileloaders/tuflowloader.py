@@ -4,12 +4,19 @@ import logging
 import os
 import uuid
 
+try:
+    from concurrent import futures
+except ImportError:
+    futures = None
+
 from ship.tuflow import FILEPART_TYPES as fpt
 from ship.utils import utilfunctions as uf
 from ship.tuflow.tuflowmodel import TuflowModel, TuflowFilepartTypes, UserVariables
 from ship.tuflow import controlfile as control
 from ship.tuflow import tuflowfilepart as tuflowpart
 from ship.utils.fileloaders.loader import ALoader
+from ship.utils.fileloaders.controlfilecache import ControlFileCache
+from ship.utils.fileloaders.datcache import DatCache
 from ship.utils import filetools
 from ship.tuflow import tuflowfactory as tfactory
 
@@ -18,6 +25,12 @@ logger = logging.getLogger(__name__)
 
 class TuflowLoader(ALoader):
 
+    control_file_cache = ControlFileCache()
+    """Parsed control files shared by all loaders in this process.
+
+    Only used when 'cache' or 'cache_dir' are given to loadModel().
+    """
+
     def __init__(self):
         super(TuflowLoader, self).__init__()
         self.types = TuflowFilepartTypes()
@@ -42,6 +55,8 @@ class TuflowLoader(ALoader):
 #         self.event_vals = {}
         self.tuflow_model = None
         self._control_files = []
+        self._cache = None
+        self._disk_cache = None
 
     def loadFile(self, tcf_path, arg_dict={}):
         """Main loader function defined by the ALoader interface.
@@ -53,7 +68,31 @@ class TuflowLoader(ALoader):
         return self.loadModel(tcf_path, arg_dict)
 
     def loadModel(self, tcf_path, arg_dict={}):
-        """Load a full tuflow model from the given tcf path."""
+        """Load a full tuflow model from the given tcf path.
+
+        arg_dict accepts:
+
+            'scenario'(dict): scenario values to use, e.g. {'s1': 'opt1'}.
+            'event'(dict): event values to use, e.g. {'e1': 'Q100'}.
+            'workers'(int): if more than 1 the control files will be read
+                on this many threads. See _fetchTuflowModel() for more
+                details. Default is 1.
+            'cache'(bool): if True control files that have already been
+                parsed by a loader in this process, and haven't changed since,
+                won't be parsed again. See ControlFileCache. Default is False.
+            'cache_dir'(str): folder to store the parsed control files in as
+                well, so that they can be used by other processes. Setting
+                this turns on 'cache'.
+            'cache_size'(int): maximum size of the cache_dir folder in bytes.
+                Default is DatCache.DEFAULT_MAX_SIZE.
+
+        Args:
+            tcf_path (str): path to the .tcf file to load.
+            arg_dict={}(Dict): keyword referenced arguments (see above).
+
+        Returns:
+            TuflowModel - the loaded model.
+        """
         self._resetLoader()
 
         if 'scenario' in arg_dict.keys():
@@ -93,7 +132,14 @@ class TuflowLoader(ALoader):
         self._file_queue.enqueue(main_file)
 
         # Read the control files and their contents into memory
-        self._fetchTuflowModel(root)
+        if arg_dict.get('cache', False) or arg_dict.get('cache_dir', None):
+            self._cache = TuflowLoader.control_file_cache
+            if arg_dict.get('cache_dir', None):
+                self._disk_cache = DatCache(
+                    arg_dict['cache_dir'],
+                    arg_dict.get('cache_size', DatCache.DEFAULT_MAX_SIZE)
+                )
+        self._fetchTuflowModel(root, arg_dict.get('workers', 1))
 
         # Order the input and create the actual ControlFile objects
         self._orderModel(tcf_path)
@@ -182,36 +228,113 @@ class TuflowLoader(ALoader):
         #
     '''
 
-    def _fetchTuflowModel(self, root):
+    def _fetchTuflowModel(self, root, workers=1):
         """Read all of the control files into memory.
+
+        If workers is more than 1, and concurrent.futures is available, the
+        control files are read on a thread pool. Whenever a control file has
+        been parsed, reads are started for any control files in the queue, so
+        they are read while the others are being parsed. This helps a lot
+        when the files are on a network drive. The files are still parsed one
+        at a time in the same order, so the model is exactly the same.
+
+        If a cache has been set up in loadModel() control files found in it
+        aren't read or parsed at all.
+
+        Args:
+            root(str): the root directory of the model.
+            workers=1(int): the number of threads to read the files on.
         """
         self.missing_model_files = []
+        reader = None
+        if futures is not None and workers > 1:
+            reader = futures.ThreadPoolExecutor(max_workers=workers)
+        reads = {}
 
-        # Keep processing control files until there are none left in the queue
-        while not self._file_queue.isEmpty():
-            control_part = self._file_queue.dequeue()
-            cpath = control_part.absolutePath()
-            raw_contents = self.getFile(cpath)
+        try:
+            # Keep processing control files until there are none left in the queue
+            while not self._file_queue.isEmpty():
+                if reader is not None:
+                    for part in self._file_queue:
+                        path = part.absolutePath()
+                        if path in reads:
+                            continue
+                        if self._cache is not None and self._cache.isCurrent(part):
+                            continue
+                        reads[path] = reader.submit(self.getFile, path)
+
+                control_part = self._file_queue.dequeue()
+                cpath = control_part.absolutePath()
+                results = None
+                if self._cache is not None:
+                    results = self._cache.load(control_part, self._disk_cache)
+
+                if results is None:
+                    if cpath in reads:
+                        raw_contents = reads[cpath].result()
+                    else:
+                        raw_contents = self.getFile(cpath)
+
+                    # If we couldn't load the file add it to the missing list
+                    if raw_contents == False:
+                        self.missing_model_files.append(cpath)
+                        continue
+
+                    results = self._readControlFile(raw_contents, root, control_part)
+                    if self._cache is not None:
+                        self._cache.store(control_part, results, self._disk_cache)
+
+                contents, logic, actions = results
+                self._applyActions(actions)
+                self._load_list[cpath] = contents
+                self._logic_list[cpath] = logic
+                self._file_list[cpath] = control_part
+        finally:
+            if reader is not None:
+                reader.shutdown()
 
-            # If we couldn't load the file add it to the missing list
-            if raw_contents == False:
-                self.missing_model_files.append(cpath)
-                continue
+        del self._file_queue
 
-            contents, logic = self._readControlFile(raw_contents, root, control_part)
-            self._load_list[cpath] = contents
-            self._logic_list[cpath] = logic
-            self._file_list[cpath] = control_part
+    def _applyActions(self, actions):
+        """Update the loader with the parts found in a control file.
 
-        del self._file_queue
+        Args:
+            actions(list): the tuple(key, part)'s returned by
+                _readControlFile(). MODEL parts are added to the file queue
+                and variables to the user_variables.
+        """
+        for key, part in actions:
+            if key == fpt.MODEL:
+                self._file_queue.enqueue(part)
+            elif key == fpt.MODEL_VARIABLE:
+                if not self.user_variables.has_cmd_args:
+                    self.user_variables.add(part)
+            elif key == fpt.USER_VARIABLE:
+                self.user_variables.add(part)
 
     def _readControlFile(self, raw_contents, root, control_part):
         """Load the content of a control file.
+
+        This only creates the parts. It doesn't change the state of the
+        loader, so that the results can be cached; the parts that need to
+        be passed on to it are returned in actions instead.
+
+        Args:
+            raw_contents(list): the lines of the control file.
+            root(str): the root directory of the model.
+            control_part(ModelFile): the control file being read.
+
+        Return:
+            tuple(list, list, list) - the parts in the file, the logic blocks
+                in the file and a list of tuple(key, part) for each MODEL,
+                MODEL_VARIABLE and USER_VARIABLE part in the order they were
+                found (see _applyActions()).
         """
         contents = []
         unknown_store = []
         logic = []
         logic_done = []
+        actions = []
         factory = tfactory.TuflowFactory()
 
         def createUnknown(unknown_store, l):
@@ -281,16 +404,8 @@ class TuflowLoader(ALoader):
             # All other FilePart types
             else:
                 parts = factory.getTuflowPart(line, control_part, key, current_logic)
-                if key == fpt.MODEL:
-                    for p in parts:
-                        self._file_queue.enqueue(p)
-                if key == fpt.MODEL_VARIABLE:
-                    for p in parts:
-                        if not self.user_variables.has_cmd_args:
-                            self.user_variables.add(p)
-                if key == fpt.USER_VARIABLE:
-                    for p in parts:
-                        self.user_variables.add(p)
+                if key in (fpt.MODEL, fpt.MODEL_VARIABLE, fpt.USER_VARIABLE):
+                    actions.extend((key, p) for p in parts)
 
             for p in parts:
                 contents.append(p)
@@ -298,7 +413,7 @@ class TuflowLoader(ALoader):
                     current_logic.addPart(p, skip_callback=True)
 
         unknown_store = createUnknown(unknown_store, current_logic)
-        return contents, logic_done
+        return contents, logic_done, actions
 
     '''
         #
@@ -38,6 +38,8 @@
 from __future__ import unicode_literals
 
 import os
+import uuid
+import shutil
 import logging
 
 from ship.utils import utilfunctions as uf
@@ -78,34 +80,71 @@ def getFile(file_path):
     return file_contents
 
 
-def writeFile(contents, file_path, add_newline=True):
+def writeFile(contents, file_path, add_newline=True, buffer_lines=1000):
     """Text file writer
 
     Writes a list to file, adding a new-line add the end of each list item.
 
+    contents can be any iterable, including a generator, so the lines don't
+    all need to be held in memory. They are joined and written in blocks of
+    buffer_lines to cut down on the number of writes.
+
+    The lines are written to a temporary file in the same folder, which then
+    replaces file_path. If there's an error while the contents are being
+    written (e.g. a generator raises part way through) the temporary file is
+    deleted and any existing file at file_path is left as it was.
+
     Args:
         contents (List) - lines to be written.
         filename (str) - Name of file to create.
         add_newline=True (Bool): adds a '\n' to the end of each line written
             if set to True.
+        buffer_lines=1000(int): the number of lines to write at a time.
 
     Raises:
         IOError: if problem in reading file.
         TypeError: if string not given for file_path
     """
+    end = '\n' if add_newline else ''
+    temp_path = None
     try:
-        with open(file_path, 'w') as f:
+        temp_path = os.path.join(
+            os.path.dirname(os.path.abspath(file_path)),
+            '.%s.%s.tmp' % (os.path.basename(file_path), uuid.uuid4().hex)
+        )
+        with open(temp_path, 'w') as f:
+            buffer = []
             for line in contents:
-                if add_newline:
-                    f.write(line + '\n')
-                else:
-                    f.write(line)
+                buffer.append(line + end)
+                if len(buffer) >= buffer_lines:
+                    f.write(''.join(buffer))
+                    buffer = []
+            if buffer:
+                f.write(''.join(buffer))
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, temp_path)
+        _replaceFile(temp_path, file_path)
+        temp_path = None
     except IOError:
         logger.error('Write file IOError')
         raise IOError
     except TypeError:
         logger.error('Write file TypeError')
         raise TypeError
+    finally:
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _replaceFile(source, target):
+    """Move source over target, replacing it if it exists."""
+    if hasattr(os, 'replace'):
+        os.replace(source, target)
+    else:
+        # Python 2 os.rename() won't replace an existing file on Windows
+        if os.name == 'nt' and os.path.exists(target):
+            os.remove(target)
+        os.rename(source, target)
 
 ###############################
 #  Path Functions and classes #
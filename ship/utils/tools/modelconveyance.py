@@ -0,0 +1,204 @@
+"""
+
+ Summary:
+     Calculates conveyance for all of the river sections in an FMP model and
+     reports any sections with negative conveyance.
+
+     The geometry of each section is taken from the row data of the units in
+     a DatCollection and passed to openchannel.calcConveyance. Sections can
+     be calculated on a process pool and the results can be cached, so only
+     the sections that have changed need to be calculated again.
+
+ TODO:
+
+ Updates:
+
+"""
+from __future__ import unicode_literals
+
+import hashlib
+from collections import OrderedDict
+
+try:
+    from concurrent import futures
+except ImportError:
+    futures = None
+
+from ship.utils.tools import openchannel
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+CHUNK_SIZE = 50
+"""Number of sections sent to a worker process at a time."""
+
+
+def sectionGeometry(unit, active_only=False):
+    """Get the section geometry needed to calculate conveyance for a unit.
+
+    Args:
+        unit(RiverUnit): the section to get the geometry of.
+        active_only=False(bool): if True only the part of the section between
+            the deactivation markers, if there are any, will be used.
+
+    Return:
+        dict - containing the 'x_vals', 'y_vals', 'n_vals' and 'panel_vals'
+            lists used by openchannel.calcConveyance.
+    """
+    rows = unit.row_data['main']
+    geometry = {
+        'x_vals': rows.dataObjectAsList(rdt.CHAINAGE),
+        'y_vals': rows.dataObjectAsList(rdt.ELEVATION),
+        'n_vals': rows.dataObjectAsList(rdt.ROUGHNESS),
+        'panel_vals': rows.dataObjectAsList(rdt.PANEL_MARKER),
+    }
+    if active_only:
+        start = 0
+        end = len(geometry['x_vals'])
+        for i, val in enumerate(rows.dataObjectAsList(rdt.DEACTIVATION)):
+            if val == 'LEFT':
+                start = i
+            elif val == 'RIGHT':
+                end = i + 1
+        for k in geometry.keys():
+            geometry[k] = geometry[k][start:end]
+    return geometry
+
+
+def geometryKey(geometry, **kwargs):
+    """Get a key identifying a section geometry and calculation settings.
+
+    The same geometry and kwargs will always give the same key, so it can be
+    used to cache results between runs.
+
+    Args:
+        geometry(dict): returned by sectionGeometry().
+        **kwargs: any other arguments that change the results.
+
+    Return:
+        str - the key.
+    """
+    parts = [(k, geometry[k]) for k in sorted(geometry.keys())]
+    parts += [(k, kwargs[k]) for k in sorted(kwargs.keys())]
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def _calcSections(args):
+    """Calculate conveyance for a chunk of sections.
+
+    This is module level so that it can be run in a worker process.
+
+    Args:
+        args(tuple): (list of geometry dicts, kwargs dict for calcConveyance).
+
+    Return:
+        list - the calcConveyance results for each geometry.
+    """
+    geometries, kwargs = args
+    results = []
+    for g in geometries:
+        kw = dict(kwargs)
+        kw.update(g)
+        results.append(openchannel.calcConveyance(**kw))
+    return results
+
+
+def calcModelConveyance(dat, workers=1, cache=None, active_only=False,
+                        **kwargs):
+    """Calculate conveyance for all of the river sections in a model.
+
+    Args:
+        dat(DatCollection): the model to calculate conveyance for.
+        workers=1(int): number of processes to calculate the sections on. If
+            more than one, and concurrent.futures is available, the sections
+            will be split into chunks and calculated on a process pool.
+        cache=None(dict): if given, results are looked up in and stored in
+            this, keyed on geometryKey(). Sections that haven't changed since
+            they were last calculated will not be calculated again. Any object
+            that behaves like a dict with str keys can be used, e.g. a shelve
+            to keep the results on disk.
+        active_only=False(bool): see sectionGeometry().
+        **kwargs: passed on to openchannel.calcConveyance (e.g.
+            interpolate_space, tolerance, no_panels).
+
+    Return:
+        tuple(OrderedDict, list) - the first is the conveyance results, in
+            the same format as openchannel.calcConveyance, for each section
+            keyed on tuple(name, index), where index is the position of the
+            unit in dat, in the order they're in the model. The index is
+            included because section names don't have to be unique. The
+            second is negativeConveyance() of the results.
+    """
+    sections = dat.unitsByType('river')
+    keys = []
+    todo = OrderedDict()
+    found = {}
+    for s in sections:
+        geometry = sectionGeometry(s, active_only)
+        key = geometryKey(geometry, **kwargs)
+        keys.append(key)
+        if key in found or key in todo:
+            continue
+        if cache is not None and key in cache:
+            found[key] = cache[key]
+        else:
+            todo[key] = geometry
+
+    if todo:
+        geometries = list(todo.values())
+        chunks = [
+            (geometries[i:i + CHUNK_SIZE], kwargs)
+            for i in range(0, len(geometries), CHUNK_SIZE)
+        ]
+        if futures is None or workers < 2 or len(chunks) < 2:
+            results = [_calcSections(c) for c in chunks]
+        else:
+            with futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_calcSections, chunks))
+
+        results = [r for chunk in results for r in chunk]
+        for key, result in zip(todo.keys(), results):
+            found[key] = result
+            if cache is not None:
+                cache[key] = result
+
+    conveyance = OrderedDict()
+    for s, key in zip(sections, keys):
+        conveyance[(s.name, dat.index(s))] = found[key]
+    return conveyance, negativeConveyance(conveyance)
+
+
+def negativeConveyance(conveyance):
+    """Summarise the sections that have negative conveyance.
+
+    Args:
+        conveyance(dict): tuple(name, index) keys and calcConveyance results
+            values, as returned by calcModelConveyance().
+
+    Return:
+        list - containing a dict for each section with negative conveyance,
+            with:
+                name: the section name.
+                index: the index of the section in the model.
+                stages: list of the stages flagged as negative.
+                max_reduction: the largest drop in conveyance from one stage
+                    to the next.
+    """
+    negatives = []
+    for (name, index), (results, has_negative) in conveyance.items():
+        if not has_negative:
+            continue
+        stages = []
+        max_reduction = 0.0
+        for i, (k, stage, negative) in enumerate(results):
+            if negative:
+                stages.append(stage)
+                max_reduction = max(max_reduction, results[i - 1][0] - k)
+        negatives.append({
+            'name': name, 'index': index, 'stages': stages,
+            'max_reduction': max_reduction
+        })
+    return negatives
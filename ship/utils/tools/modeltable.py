@@ -0,0 +1,208 @@
+"""
+
+ Summary:
+     Exports the row data of the units in an FMP model to numpy arrays and
+     pandas DataFrames.
+
+     The row data of each unit can be converted with
+     RowDataCollection.toArrays() and toDataFrame(). This module adds column
+     names for the ROW_DATA_TYPES and builds a long format table of the row
+     data of all of the units in a model, with a row for each row of each
+     unit, so that model-wide statistics (e.g. the distribution of roughness
+     values) can be calculated in one go.
+
+     numpy is needed for the arrays and pandas for the DataFrames. Neither
+     are needed by the rest of the library.
+
+ TODO:
+
+ Updates:
+
+"""
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+COLUMN_NAMES = dict((k, v.lower()) for k, v in rdt.reverse_mapping.items())
+"""Column names for the ROW_DATA_TYPES, e.g. rdt.CHAINAGE is 'chainage'."""
+
+UNIT_COLUMNS = ['unit_name', 'unit_type', 'row']
+"""The columns added to the model table to identify the unit rows."""
+
+
+def unitArrays(unit, rowdata_key='main', copy=True):
+    """Get the row data of a unit as numpy arrays.
+
+    Args:
+        unit(AUnit): the unit to get the row data of.
+        rowdata_key='main'(str): the row_data collection to use.
+        copy=True(bool): if False the numeric arrays are read-only views of
+            the unit values. Rows can't be added to or deleted from the unit
+            while they exist. See RowDataCollection.toArrays().
+
+    Return:
+        OrderedDict - containing a numpy array of values for each column,
+            keyed on the COLUMN_NAMES.
+
+    Raises:
+        ImportError: if numpy is not installed.
+        KeyError: if the unit doesn't have rowdata_key row data.
+    """
+    arrays = unit.row_data[rowdata_key].toArrays(copy=copy)
+    return OrderedDict((COLUMN_NAMES.get(k, k), v) for k, v in arrays.items())
+
+
+def unitDataFrame(unit, rowdata_key='main', copy=True):
+    """Get the row data of a unit as a pandas DataFrame.
+
+    Args:
+        unit(AUnit): the unit to get the row data of.
+        rowdata_key='main'(str): the row_data collection to use.
+        copy=True(bool): if False the numeric columns may be views of the
+            unit values. Rows can't be added to or deleted from the unit
+            until the DataFrame is deleted. See
+            RowDataCollection.toDataFrame().
+
+    Return:
+        pandas.DataFrame - with a column for each of the row data types,
+            named with the COLUMN_NAMES.
+
+    Raises:
+        ImportError: if pandas is not installed.
+        KeyError: if the unit doesn't have rowdata_key row data.
+    """
+    return unit.row_data[rowdata_key].toDataFrame(names=COLUMN_NAMES, copy=copy)
+
+
+def modelArrays(dat, unit_types=None, rowdata_key='main', keys=None):
+    """Get the row data of all of the units in a model as numpy arrays.
+
+    The arrays are in long format: there is an entry for each row of each
+    unit, in the order the units are in the model. As well as the row data
+    there are 'unit_name', 'unit_type' and 'row' (the index of the row in
+    the unit) arrays. Units that don't have a type of row data are given
+    NaN for numeric types and None for others.
+
+    Args:
+        dat(DatCollection): the model to get the row data from.
+        unit_types=None(list): the unit types to include. If None all units
+            with rowdata_key row data will be included.
+        rowdata_key='main'(str): the row_data collection to use.
+        keys=None(list): the ROW_DATA_TYPES to include. If None all of the
+            types found in the units will be included.
+
+    Return:
+        OrderedDict - containing the UNIT_COLUMNS and then a numpy array for
+            each row data type, keyed on the COLUMN_NAMES.
+
+    Raises:
+        ImportError: if numpy is not installed.
+    """
+    if np is None:
+        raise ImportError('numpy is needed to convert the row data to arrays')
+    if unit_types is None:
+        units = [u for u in dat]
+    else:
+        units = dat.unitsByType(unit_types)
+
+    names = []
+    types = []
+    rows = []
+    chunks = OrderedDict()
+    total = 0
+    for unit in units:
+        collection = unit.row_data.get(rowdata_key, None)
+        if collection is None:
+            continue
+        count = collection.row_count
+        if count < 1:
+            continue
+
+        unit_keys = collection.collectionTypes()
+        if keys is not None:
+            unit_keys = [k for k in unit_keys if k in keys]
+        # The views are released when they go out of scope, after they've
+        # been copied into the model arrays
+        arrays = collection.toArrays(unit_keys, copy=False)
+        for key, values in arrays.items():
+            chunks.setdefault(key, []).append((total, values))
+
+        names.extend([unit.name] * count)
+        types.extend([unit.unit_type] * count)
+        rows.append(np.arange(count))
+        total += count
+
+    out = OrderedDict()
+    out['unit_name'] = np.array(names, dtype=object)
+    out['unit_type'] = np.array(types, dtype=object)
+    out['row'] = np.concatenate(rows) if rows else np.array([], dtype=int)
+    for key, key_chunks in chunks.items():
+        out[COLUMN_NAMES.get(key, key)] = _joinChunks(key_chunks, total)
+    return out
+
+
+def modelTable(dat, unit_types=None, rowdata_key='main', keys=None):
+    """Get the row data of all of the units in a model as a DataFrame.
+
+    Example:
+        >>> table = modelTable(dat, unit_types=['river'])
+        >>> table.groupby('unit_name')['elevation'].min()
+
+    Args:
+        See modelArrays().
+
+    Return:
+        pandas.DataFrame - with a row for each row of each unit and the
+            columns returned by modelArrays().
+
+    Raises:
+        ImportError: if pandas is not installed.
+    """
+    if pd is None:
+        raise ImportError('pandas is needed to convert the row data to a DataFrame')
+    return pd.DataFrame(modelArrays(dat, unit_types, rowdata_key, keys), copy=False)
+
+
+def _joinChunks(chunks, total):
+    """Join the arrays of a row data type from each unit into one array.
+
+    Args:
+        chunks(list): containing tuple(start, array) for each unit that has
+            the row data type, where start is the index of the unit's first
+            row in the model arrays.
+        total(int): the number of rows in the model arrays.
+
+    Return:
+        numpy.array - of length total, with NaN or None for the rows of units
+            that didn't have the row data type.
+    """
+    numeric = all(c[1].dtype.kind in 'iuf' for c in chunks)
+    dtype = np.result_type(*[c[1] for c in chunks]) if numeric else object
+    if sum(len(c[1]) for c in chunks) == total:
+        return np.concatenate([c[1] for c in chunks]).astype(dtype, copy=False)
+
+    if numeric:
+        dtype = np.result_type(dtype, float)
+        out = np.full(total, np.nan, dtype=dtype)
+    else:
+        out = np.full(total, None, dtype=object)
+    for start, values in chunks:
+        out[start:start + len(values)] = values
+    return out
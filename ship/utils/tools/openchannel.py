@@ -3,7 +3,8 @@
  Summary:
      Contains methods for calculating characteristics of open channel flow.
      
-     Currently only used to calculate conveyance for a channel section.
+     Used to calculate conveyance and other hydraulic properties for a
+     channel section.
 
  Author:  
      Duncan Runnacles
@@ -17,10 +18,20 @@
  TODO:
 
  Updates:
+     Added HydraulicTable for getting area, wetted perimeter, top width and
+     hydraulic radius as well as conveyance.
+     Conveyance is calculated with a sweep up through the sorted depths by
+     default (see calcConveyance sweep kwarg). The numpy version of the
+     calculation has been removed and the vectorize kwarg is deprecated.
 
 """
 
 import math
+import heapq
+import bisect
+import hashlib
+import warnings
+from collections import OrderedDict
 
 import logging
 logger = logging.getLogger(__name__)
@@ -28,36 +39,55 @@ logger = logging.getLogger(__name__)
 import ship.utils.utilfunctions as utilfunc
 
 
-def interpolateGaps(y_vals, space):
+def interpolateGaps(y_vals, space, count=0):
     """ Fill in any large gaps in the depths list
 
+    The depths are built in one pass over the sorted y values, so the time
+    taken is proportional to the number of depths returned.
+
     Args:
         y_vals(list): elevation values.
         space(float): maximum allowable difference between interpolation values.
+            Any gap larger than this is filled with values stepping down from
+            the top of the gap by space. If zero no gaps will be filled.
+        count=0(int): if greater than one, count depths evenly spaced between
+            the lowest and highest elevation will be added as well.
 
     Return:
         list of new y values to calculate conveyance for.
     """
-
     depths = sorted(y_vals)
-    location = len(y_vals) - 1
-    while location > 0:
-        diff = depths[location] - depths[location - 1]
-        if diff > space:
-            no_insert = int(diff / space)
-
-            for j in range(0, no_insert):
-                baseline = depths[location]
-                depths.insert(location, baseline - space)
-            location -= 1
-        else:
-            location -= 1
+    if len(depths) < 2:
+        return depths
+
+    if space > 0:
+        filled = [depths[0]]
+        for lower, upper in zip(depths[:-1], depths[1:]):
+            diff = upper - lower
+            if diff > space:
+                no_insert = int(diff / space)
+                gap = []
+                baseline = upper
+                for j in range(0, no_insert):
+                    baseline = baseline - space
+                    gap.append(baseline)
+                gap.reverse()
+                filled.extend(gap)
+            filled.append(upper)
+        depths = filled
+
+    if count > 1:
+        start = depths[0]
+        step = (depths[-1] - start) / float(count - 1)
+        grid = [start + step * i for i in range(1, count - 1)]
+        depths = list(heapq.merge(depths, grid))
 
     return depths
 
 
 def calcConveyance(x_vals, y_vals, panel_vals=[], n_vals=None, depths=[],
-                   no_panels=False, interpolate_space=0, tolerance=0.0):
+                   no_panels=False, interpolate_space=0, tolerance=0.0,
+                   vectorize=None, interpolate_count=0, sweep=True):
     """Calculate conveyance over a range of depths from min to max elevation.
 
     Args:
@@ -73,6 +103,17 @@ def calcConveyance(x_vals, y_vals, panel_vals=[], n_vals=None, depths=[],
         tolerance=0.0(float): tolerance used to identify negative conveyance.
             if the reduction in conveyance is less than tolerance it will not
             be flagged.
+        vectorize=None(bool): deprecated and ignored. Use sweep instead.
+        interpolate_count=0(int): if greater than one this number of depths
+            evenly spaced between the min and max elevation will be added to
+            the depths calculated. Can be used with or instead of
+            interpolate_space.
+        sweep=True(bool): if True the conveyance is calculated with a sweep
+            up through the sorted depths, updating the wetted area and
+            perimeter from the previous depth (see _sweepPanelProperties).
+            This is the fastest method, especially for sections with lots of
+            points. If False each depth is calculated in turn, which is
+            slower but kept as a reference for checking the sweep.
 
     Return:
         Tuple:  
@@ -100,64 +141,14 @@ def calcConveyance(x_vals, y_vals, panel_vals=[], n_vals=None, depths=[],
         if len(depths) < 1:
             depths = sorted(y_vals)
 
-        if interpolate_space > 0:
-            depths = interpolateGaps(y_vals, interpolate_space)
+        if interpolate_space > 0 or interpolate_count > 1:
+            depths = interpolateGaps(y_vals, interpolate_space, interpolate_count)
         else:
             depths = sorted(y_vals)
 
-        # If not n vals supplied set up some defaults
-        if not isinstance(n_vals, list):
-            if not n_vals == None:
-                n_vals = [n_vals] * len(x_vals)
-            else:
-                n_vals = [0.04] * len(x_vals)
-
+        n_vals = _roughnessValues(x_vals, n_vals)
         return depths, n_vals
 
-    def buildSections(x_vals, y_vals, n_vals, panel_vals, no_panels):
-        """Create the section setups needed based on the inputs
-
-        Args:
-            x_vals(list): cross section chainage values.
-            y_vals(list): corresponding elevation values
-            n_vals=[](list): corresponding mannings n values.
-            panel_vals=[](list): corresponding panel locations.
-            no_panels(Bool): If false any panels found will not be included
-                in the calculations.
-
-        Return:
-            list of all of the panel section data as tuple(x(list), y(list),
-                n(list)).
-        """
-
-        all_sections = []
-
-        # If there's only one panel wanted only create one section from all
-        # of the data provided. Otherwise create multiple sections split on
-        # panel markers indices
-        if len(panel_vals) < 1 or no_panels == True:
-            x_arr = x_vals
-            y_arr = y_vals
-            n_arr = n_vals
-            all_sections.append([x_arr, y_arr, n_arr])
-
-        else:
-            indices = [i for i, x in enumerate(panel_vals) if x == True]
-            start = 0
-            for i in indices:
-                x_arr = x_vals[start:i + 1]
-                y_arr = y_vals[start:i + 1]
-                n_arr = n_vals[start:i]
-                all_sections.append([x_arr, y_arr, n_arr])
-                start = i
-
-            x_arr = x_vals[start:]
-            y_arr = y_vals[start:]
-            n_arr = n_vals[start:]
-            all_sections.append([x_arr, y_arr, n_arr])
-
-        return all_sections
-
     def calcSectionK(section, depth):
         """Calculate conveyance (K) for each section at the given depth.
 
@@ -233,8 +224,12 @@ def calcConveyance(x_vals, y_vals, panel_vals=[], n_vals=None, depths=[],
                 # print 'Stage = %f  :  Area = %f  :  WP = %f  :  NxWP = %f' % (depth, area, wp, nxwp)
         return panel_data
 
+    _warnVectorize(vectorize)
     depths, n_vals = checkVars(x_vals, n_vals, depths)
-    all_sections = buildSections(x_vals, y_vals, n_vals, panel_vals, no_panels)
+    all_sections = _buildSections(x_vals, y_vals, n_vals, panel_vals, no_panels)
+
+    if sweep:
+        return _sweepConveyance(all_sections, depths, tolerance)
 
     # Loop through the depths calculating K and add the sum af the conveyance
     # from each panel together and put results in a list to return to the
@@ -277,3 +272,425 @@ def calcConveyance(x_vals, y_vals, panel_vals=[], n_vals=None, depths=[],
         # print 'Conveyance at depth: %f  =  %f\n' % (d, depth_k)
 
     return results, has_negative
+
+
+def _roughnessValues(x_vals, n_vals):
+    """Get a roughness value for each x value.
+
+    If n_vals is not a list it's used for every x value. If it's None the
+    default value of 0.04 is used.
+    """
+    if not isinstance(n_vals, list):
+        if not n_vals == None:
+            n_vals = [n_vals] * len(x_vals)
+        else:
+            n_vals = [0.04] * len(x_vals)
+    return n_vals
+
+
+def _buildSections(x_vals, y_vals, n_vals, panel_vals, no_panels):
+    """Create the section setups needed based on the inputs
+
+    Args:
+        x_vals(list): cross section chainage values.
+        y_vals(list): corresponding elevation values
+        n_vals=[](list): corresponding mannings n values.
+        panel_vals=[](list): corresponding panel locations.
+        no_panels(Bool): If false any panels found will not be included
+            in the calculations.
+
+    Return:
+        list of all of the panel section data as tuple(x(list), y(list),
+            n(list)).
+    """
+
+    all_sections = []
+
+    # If there's only one panel wanted only create one section from all
+    # of the data provided. Otherwise create multiple sections split on
+    # panel markers indices
+    if len(panel_vals) < 1 or no_panels == True:
+        x_arr = x_vals
+        y_arr = y_vals
+        n_arr = n_vals
+        all_sections.append([x_arr, y_arr, n_arr])
+
+    else:
+        indices = [i for i, x in enumerate(panel_vals) if x == True]
+        start = 0
+        for i in indices:
+            x_arr = x_vals[start:i + 1]
+            y_arr = y_vals[start:i + 1]
+            n_arr = n_vals[start:i]
+            all_sections.append([x_arr, y_arr, n_arr])
+            start = i
+
+        x_arr = x_vals[start:]
+        y_arr = y_vals[start:]
+        n_arr = n_vals[start:]
+        all_sections.append([x_arr, y_arr, n_arr])
+
+    return all_sections
+
+
+def _panelProperties(section, depths):
+    """Calculate the total area, wp, n * wp and top width of a panel.
+
+    Does the same calculations as calcSectionK in calcConveyance, but for
+    all of the depths and also returns the top width.
+
+    Args:
+        section(list): the panel section data as tuple(x(list), y(list),
+            n(list)), as setup by _buildSections().
+        depths(list): the depths to calculate the properties at.
+
+    Return:
+        tuple(list, list, list, list) - area, wp, n * wp and top width, with
+            a value for each depth.
+    """
+    area = [0.0] * len(depths)
+    wp = [0.0] * len(depths)
+    nxwp = [0.0] * len(depths)
+    top_width = [0.0] * len(depths)
+
+    for i in range(1, len(section[0])):
+        x1 = section[0][i]
+        x2 = section[0][i - 1]
+        y1 = section[1][i]
+        y2 = section[1][i - 1]
+        n = section[2][i - 1]
+        miny, maxy, same_val = utilfunc.findMax(y1, y2)
+
+        for j, depth in enumerate(depths):
+            if depth < miny:
+                continue
+
+            height = maxy - miny
+            width = abs(x1 - x2)
+            top = maxy
+            if depth < maxy:
+                height2 = depth - miny
+                width = width * (height2 / height)
+                height = height2
+                top = depth
+
+            if same_val:
+                panel_wp = width
+                panel_area = 0
+            else:
+                panel_wp = math.sqrt(height**2.0 + width**2.0)
+                panel_area = ((height * width) / 2)
+            if top < depth:
+                panel_area += ((depth - top) * width)
+
+            area[j] += panel_area
+            wp[j] += panel_wp
+            nxwp[j] += n * panel_wp
+            top_width[j] += width
+
+    return area, wp, nxwp, top_width
+
+
+def _sweepPanelProperties(section, depths):
+    """Calculate the total area, wp, n * wp and top width of a panel.
+
+    The same as _panelProperties, but calculated with a sweep up through
+    the depths. Below the top of a piece of the section the wetted width
+    and perimeter increase linearly with depth, so between the elevations
+    where pieces start and stop getting wet the totals can be updated from
+    the previous depth rather than calculated again from every x/y pair.
+    This makes the time taken roughly O((depths + points) log points)
+    rather than O(depths x points).
+
+    Args:
+        section(list): the panel section data as tuple(x(list), y(list),
+            n(list)), as setup by _buildSections().
+        depths(list): the depths to calculate the properties at. Must be
+            sorted.
+
+    Return:
+        tuple(list, list, list, list) - area, wp, n * wp and top width, with
+            a value for each depth.
+    """
+    # Events are (elevation, top width, wp, n * wp, and the rates of change
+    # of top width, wp and n * wp with depth) to add when the water reaches
+    # the elevation.
+    events = []
+    for i in range(1, len(section[0])):
+        width = abs(section[0][i] - section[0][i - 1])
+        n = section[2][i - 1]
+        miny, maxy, same_val = utilfunc.findMax(section[1][i], section[1][i - 1])
+        if same_val:
+            # Flat so it's all wet as soon as the water reaches it
+            events.append((miny, width, width, n * width, 0.0, 0.0, 0.0))
+        else:
+            # Width and wp increase with depth until it's fully wet
+            height = maxy - miny
+            dwidth = width / height
+            dwp = math.sqrt(height**2.0 + width**2.0) / height
+            events.append((miny, 0.0, 0.0, 0.0, dwidth, dwp, n * dwp))
+            events.append((maxy, 0.0, 0.0, 0.0, -dwidth, -dwp, -n * dwp))
+    events.sort(key=lambda e: e[0])
+
+    area = []
+    wp = []
+    nxwp = []
+    top_width = []
+    level = None
+    totals = [0.0, 0.0, 0.0, 0.0]     # area, top width, wp, n * wp
+    rates = [0.0, 0.0, 0.0]           # top width, wp, n * wp
+    e = 0
+
+    def rise(level, new_level):
+        """Raise the water level, adding the change in the totals."""
+        if level is None or new_level <= level:
+            return
+        diff = new_level - level
+        totals[0] += (totals[1] + rates[0] * diff / 2.0) * diff
+        totals[1] += rates[0] * diff
+        totals[2] += rates[1] * diff
+        totals[3] += rates[2] * diff
+
+    for depth in depths:
+        while e < len(events) and events[e][0] <= depth:
+            event = events[e]
+            rise(level, event[0])
+            level = event[0]
+            totals[1] += event[1]
+            totals[2] += event[2]
+            totals[3] += event[3]
+            rates[0] += event[4]
+            rates[1] += event[5]
+            rates[2] += event[6]
+            e += 1
+        rise(level, depth)
+        if level is not None:
+            level = max(level, depth)
+
+        area.append(totals[0])
+        wp.append(totals[2])
+        nxwp.append(totals[3])
+        top_width.append(totals[1])
+
+    return area, wp, nxwp, top_width
+
+
+def _sweepConveyance(all_sections, depths, tolerance):
+    """Calculate conveyance for all depths with a sweep up through them.
+
+    Does the same calculations as calcConveyance, but using
+    _sweepPanelProperties. The results will be the same apart from floating
+    point rounding.
+
+    Args:
+        all_sections(list): the panel section data as tuple(x(list),
+            y(list), n(list)), as setup in calcConveyance.
+        depths(list): the depths to calculate conveyance for.
+        tolerance(float): see calcConveyance.
+
+    Return:
+        Tuple - the same as calcConveyance.
+    """
+    # The sweep needs sorted depths and each is only calculated once
+    unique_d = sorted(set(depths))
+    unique_k = [0.0] * len(unique_d)
+    for section in all_sections:
+        area, wp, nxwp, top_width = _sweepPanelProperties(section, unique_d)
+        for i, k in enumerate(_panelK(area, wp, nxwp)):
+            unique_k[i] += k
+
+    lookup = dict(zip(unique_d, unique_k))
+    return _conveyanceResults([lookup[d] for d in depths], depths, tolerance)
+
+
+def _conveyanceResults(depth_k, depths, tolerance):
+    """Build the calcConveyance results from the conveyance at each depth.
+
+    Args:
+        depth_k(list): the conveyance at each depth.
+        depths(list): the depths, in the order they were calculated.
+        tolerance(float): see calcConveyance.
+
+    Return:
+        Tuple - the same as calcConveyance.
+    """
+    results = []
+    has_negative = False
+    previous_k = -1
+    for k, depth in zip(depth_k, depths):
+        negative = False
+        if not previous_k == -1 and previous_k > k:
+            if (previous_k - k) > tolerance:
+                negative = True
+                has_negative = True
+        previous_k = k
+        results.append([k, depth, negative])
+
+    return results, has_negative
+
+
+def _warnVectorize(vectorize):
+    """Warn that the vectorize kwarg has been given but isn't used."""
+    if vectorize is not None:
+        warnings.warn(
+            'vectorize is deprecated and ignored; use sweep instead',
+            DeprecationWarning, stacklevel=3
+        )
+
+
+def _panelK(area, wp, nxwp):
+    """Calculate panel conveyance from lists of its totals."""
+    panel_k = []
+    for a, p, nxp in zip(area, wp, nxwp):
+        if not p == 0.0:
+            panel_k.append(((a**5.0 / p**2.0)**(1.0 / 3.0)) * (p / nxp))
+        else:
+            panel_k.append(0.0)
+    return panel_k
+
+
+class HydraulicTable(object):
+    """Hydraulic properties of a cross section over a range of depths.
+
+    All of the properties are calculated in one pass over the section, with
+    a sweep up through the depths by default (see calcConveyance sweep kwarg).
+
+    Each of the properties is a list with a value for each of the depths,
+    which are sorted and unique:
+        depths: the water levels the properties are calculated at.
+        area: the flow area.
+        wetted_perimeter: the wetted perimeter.
+        top_width: the width of the water surface.
+        hydraulic_radius: area / wetted_perimeter (0.0 when dry).
+        conveyance: the conveyance, calculated per panel like calcConveyance.
+
+    Tables returned by hydraulicTable() are shared, so shouldn't be changed.
+    """
+
+    PROPERTIES = ['area', 'wetted_perimeter', 'top_width',
+                  'hydraulic_radius', 'conveyance']
+
+    def __init__(self, x_vals, y_vals, panel_vals=[], n_vals=None, depths=[],
+                 no_panels=False, interpolate_space=0, interpolate_count=0,
+                 vectorize=None, sweep=True):
+        """Constructor.
+
+        Args:
+            x_vals(list): cross section chainage values.
+            y_vals(list): corresponding elevation values
+            panel_vals=[](list): corresponding panel locations.
+            n_vals=None(list): corresponding mannings n values.
+            depths=[](list): depths to calculate the properties at. If empty
+                the section elevations, and any interpolated between them, are
+                used.
+            no_panels(Bool): see calcConveyance.
+            interpolate_space=0(float): see interpolateGaps.
+            interpolate_count=0(int): see interpolateGaps.
+            vectorize=None(bool): deprecated and ignored.
+            sweep=True(bool): see calcConveyance.
+        """
+        _warnVectorize(vectorize)
+        if len(depths) < 1:
+            depths = interpolateGaps(y_vals, interpolate_space, interpolate_count)
+        self.depths = sorted(set(depths))
+
+        n_vals = _roughnessValues(x_vals, n_vals)
+        all_sections = _buildSections(x_vals, y_vals, n_vals, panel_vals, no_panels)
+
+        count = len(self.depths)
+        self.area = [0.0] * count
+        self.wetted_perimeter = [0.0] * count
+        self.top_width = [0.0] * count
+        self.conveyance = [0.0] * count
+        properties = _sweepPanelProperties if sweep else _panelProperties
+        for section in all_sections:
+            area, wp, nxwp, top_width = properties(section, self.depths)
+            panel_k = _panelK(area, wp, nxwp)
+            for i in range(count):
+                self.area[i] += area[i]
+                self.wetted_perimeter[i] += wp[i]
+                self.top_width[i] += top_width[i]
+                self.conveyance[i] += panel_k[i]
+        self.hydraulic_radius = [
+            a / p if not p == 0.0 else 0.0
+            for a, p in zip(self.area, self.wetted_perimeter)
+        ]
+
+    def __len__(self):
+        return len(self.depths)
+
+    def rows(self):
+        """Generator for the properties at each depth.
+
+        Yields:
+            dict - with a 'depth' key and a key for each of PROPERTIES.
+        """
+        for i, d in enumerate(self.depths):
+            row = {'depth': d}
+            for p in HydraulicTable.PROPERTIES:
+                row[p] = getattr(self, p)[i]
+            yield row
+
+    def valueAt(self, name, depth):
+        """Get the value of a property at any depth.
+
+        Values between the depths in the table are linearly interpolated.
+
+        Args:
+            name(str): one of PROPERTIES.
+            depth(float): the water level to get the value at.
+
+        Return:
+            float - the value of the property at depth.
+
+        Raises:
+            ValueError: if depth is outside the range of the table.
+            AttributeError: if name isn't a property of the table.
+        """
+        values = getattr(self, name)
+        if not self.depths or depth < self.depths[0] or depth > self.depths[-1]:
+            raise ValueError('Depth %s is outside the range of the table' % depth)
+
+        i = bisect.bisect_left(self.depths, depth)
+        if self.depths[i] == depth:
+            return values[i]
+        d1, d2 = self.depths[i - 1], self.depths[i]
+        return values[i - 1] + (values[i] - values[i - 1]) * (depth - d1) / (d2 - d1)
+
+
+TABLE_CACHE_SIZE = 256
+"""Maximum number of tables kept by hydraulicTable()."""
+
+_table_cache = OrderedDict()
+
+
+def hydraulicTable(x_vals, y_vals, panel_vals=[], n_vals=None, **kwargs):
+    """Get the HydraulicTable for a section.
+
+    Tables are memoized on a hash of the section geometry and kwargs, so
+    asking for the same section again returns the same table without
+    recalculating it. If any of the section values change the hash will
+    too and a new table will be calculated. The TABLE_CACHE_SIZE most
+    recently used tables are kept.
+
+    Args:
+        x_vals(list): cross section chainage values.
+        y_vals(list): corresponding elevation values
+        panel_vals=[](list): corresponding panel locations.
+        n_vals=None(list): corresponding mannings n values.
+        **kwargs: passed on to HydraulicTable.
+
+    Return:
+        HydraulicTable - for the section.
+    """
+    key = [x_vals, y_vals, panel_vals, n_vals]
+    key += [(k, kwargs[k]) for k in sorted(kwargs.keys())]
+    key = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+    table = _table_cache.pop(key, None)
+    if table is None:
+        table = HydraulicTable(x_vals, y_vals, panel_vals, n_vals, **kwargs)
+    _table_cache[key] = table
+    while len(_table_cache) > TABLE_CACHE_SIZE:
+        _table_cache.popitem(last=False)
+    return table
@@ -0,0 +1,263 @@
+"""
+
+ Summary:
+     Spatial index of the units in an FMP model by easting and northing.
+
+     River sections (and other units with EASTING and NORTHING row data)
+     store the location of each surveyed point. SectionIndex puts these
+     points in a uniform grid so that the units nearest to a location, in a
+     bounding box or within a distance of a location can be found by only
+     checking the points in nearby grid cells, rather than every row of
+     every unit.
+
+ TODO:
+
+ Updates:
+
+"""
+from __future__ import unicode_literals
+
+import math
+
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+
+import logging
+logger = logging.getLogger(__name__)
+"""logging references with a __name__ set to this module."""
+
+
+class SectionIndex(object):
+    """Grid based spatial index of the units in a DatCollection.
+
+    Each unit is indexed on the EASTING and NORTHING values of its 'main'
+    row data. Rows where both are zero or missing are ignored, as that's
+    what FMP writes when there's no location. Distances to a unit are the
+    distance to its closest indexed point.
+
+    Queries return units in order of distance or, for inBox(), in the order
+    they were added to the index.
+    """
+
+    def __init__(self, dat=None, cell_size=None, unit_types=None):
+        """Constructor.
+
+        Args:
+            dat=None(DatCollection): the model to index. If None an empty
+                index is created and units can be added with build().
+            cell_size=None(float): size of the grid cells. If None it is
+                chosen so that there are, on average, a few points per cell.
+            unit_types=None(list): the unit types to index. If None all units
+                with EASTING and NORTHING row data are indexed.
+        """
+        self.cell_size = cell_size
+        self._units = []
+        self._points = []
+        self._grid = {}
+        self._bounds = None
+        if dat is not None:
+            if unit_types is None:
+                units = [u for u in dat]
+            else:
+                units = dat.unitsByType(unit_types)
+            self.build(units)
+
+    def __len__(self):
+        """Number of units in the index."""
+        return len(self._units)
+
+    def build(self, units):
+        """Build the index from a list of units.
+
+        Any units already in the index are replaced.
+
+        Args:
+            units(list): the AUnit's to index. Units without EASTING and
+                NORTHING row data or without any located points are skipped.
+        """
+        self._units = []
+        self._points = []
+        for unit in units:
+            points = unitPoints(unit)
+            if not points:
+                continue
+            unit_id = len(self._units)
+            self._units.append(unit)
+            for e, n in points:
+                self._points.append((e, n, unit_id))
+
+        self._grid = {}
+        self._bounds = None
+        if not self._points:
+            return
+
+        eastings = [p[0] for p in self._points]
+        northings = [p[1] for p in self._points]
+        self._bounds = (min(eastings), min(northings), max(eastings), max(northings))
+        if self.cell_size is None:
+            width = self._bounds[2] - self._bounds[0]
+            height = self._bounds[3] - self._bounds[1]
+            cell_size = max(width, height) / math.sqrt(len(self._points))
+            self._cell = cell_size if cell_size > 0 else 1.0
+        else:
+            self._cell = float(self.cell_size)
+
+        for i, p in enumerate(self._points):
+            self._grid.setdefault(self._cellOf(p[0], p[1]), []).append(i)
+
+    def nearest(self, easting, northing, count=1, max_distance=None):
+        """Find the units closest to a location.
+
+        Searches outwards from the grid cell containing the location, one
+        ring of cells at a time, until no closer unit can be found.
+
+        Args:
+            easting(float): the easting of the location.
+            northing(float): the northing of the location.
+            count=1(int): the number of units to return.
+            max_distance=None(float): if given units further away than this
+                will not be returned.
+
+        Return:
+            list - of tuple(distance, unit) for the closest count units,
+                closest first.
+        """
+        if not self._points or count < 1:
+            return []
+
+        cx, cy = self._cellOf(easting, northing)
+        min_x, min_y = self._cellOf(self._bounds[0], self._bounds[1])
+        max_x, max_y = self._cellOf(self._bounds[2], self._bounds[3])
+        max_ring = max(abs(cx - min_x), abs(cx - max_x), abs(cy - min_y), abs(cy - max_y))
+        start_ring = max(0, min_x - cx, cx - max_x, min_y - cy, cy - max_y)
+
+        found = {}
+        for ring in range(start_ring, max_ring + 1):
+            for cell in self._ringCells(cx, cy, ring, min_x, min_y, max_x, max_y):
+                self._addDistances(cell, easting, northing, found)
+
+            # Anything in the next ring is at least this far away
+            best = sorted(found.values())
+            if len(best) >= count and best[count - 1] <= ring * self._cell:
+                break
+            if max_distance is not None and ring * self._cell > max_distance:
+                break
+
+        return self._sortedUnits(found, max_distance)[:count]
+
+    def inBox(self, min_easting, min_northing, max_easting, max_northing):
+        """Find the units with a point inside a bounding box.
+
+        Args:
+            min_easting(float): the west side of the box.
+            min_northing(float): the south side of the box.
+            max_easting(float): the east side of the box.
+            max_northing(float): the north side of the box.
+
+        Return:
+            list - of the units, in the order they were added to the index.
+        """
+        unit_ids = set()
+        for i in self._boxPoints(min_easting, min_northing, max_easting, max_northing):
+            e, n, unit_id = self._points[i]
+            if min_easting <= e <= max_easting and min_northing <= n <= max_northing:
+                unit_ids.add(unit_id)
+        return [self._units[i] for i in sorted(unit_ids)]
+
+    def withinDistance(self, easting, northing, distance):
+        """Find the units with a point within a distance of a location.
+
+        Args:
+            easting(float): the easting of the location.
+            northing(float): the northing of the location.
+            distance(float): the maximum distance from the location.
+
+        Return:
+            list - of tuple(distance, unit), closest first.
+        """
+        found = {}
+        for i in self._boxPoints(easting - distance, northing - distance,
+                                 easting + distance, northing + distance):
+            self._addDistance(i, easting, northing, found)
+        return self._sortedUnits(found, distance)
+
+    def _cellOf(self, easting, northing):
+        return (int(math.floor(easting / self._cell)),
+                int(math.floor(northing / self._cell)))
+
+    def _ringCells(self, cx, cy, ring, min_x, min_y, max_x, max_y):
+        """Get the cells in a square ring around a cell that are in the grid."""
+        if ring == 0:
+            cells = [(cx, cy)]
+        else:
+            cells = []
+            for x in range(cx - ring, cx + ring + 1):
+                cells.append((x, cy - ring))
+                cells.append((x, cy + ring))
+            for y in range(cy - ring + 1, cy + ring):
+                cells.append((cx - ring, y))
+                cells.append((cx + ring, y))
+        return [
+            c for c in cells
+            if min_x <= c[0] <= max_x and min_y <= c[1] <= max_y
+        ]
+
+    def _boxPoints(self, min_easting, min_northing, max_easting, max_northing):
+        """Get the indexes of the points in the cells overlapping a box."""
+        if not self._points:
+            return []
+        min_x, min_y = self._cellOf(max(min_easting, self._bounds[0]),
+                                    max(min_northing, self._bounds[1]))
+        max_x, max_y = self._cellOf(min(max_easting, self._bounds[2]),
+                                    min(max_northing, self._bounds[3]))
+        points = []
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                points.extend(self._grid.get((x, y), []))
+        return points
+
+    def _addDistances(self, cell, easting, northing, found):
+        for i in self._grid.get(cell, []):
+            self._addDistance(i, easting, northing, found)
+
+    def _addDistance(self, i, easting, northing, found):
+        """Update found with the distance to a point if it's the closest."""
+        e, n, unit_id = self._points[i]
+        dist = math.hypot(e - easting, n - northing)
+        if unit_id not in found or dist < found[unit_id]:
+            found[unit_id] = dist
+
+    def _sortedUnits(self, found, max_distance):
+        out = [
+            (dist, unit_id) for unit_id, dist in found.items()
+            if max_distance is None or dist <= max_distance
+        ]
+        out.sort()
+        return [(dist, self._units[unit_id]) for dist, unit_id in out]
+
+
+def unitPoints(unit):
+    """Get the located points of a unit.
+
+    Args:
+        unit(AUnit): the unit to get the points of.
+
+    Return:
+        list - of tuple(easting, northing) for each row of the 'main' row
+            data that has a location. Empty if the unit doesn't have EASTING
+            and NORTHING row data.
+    """
+    rows = unit.row_data.get('main', None)
+    if rows is None:
+        return []
+    if rows.indexOfDataObject(rdt.EASTING) is None or \
+            rows.indexOfDataObject(rdt.NORTHING) is None:
+        return []
+
+    points = []
+    eastings = rows.dataObjectAsList(rdt.EASTING)
+    northings = rows.dataObjectAsList(rdt.NORTHING)
+    for e, n in zip(eastings, northings):
+        if e is None or n is None or (e == 0 and n == 0):
+            continue
+        points.append((e, n))
+    return points
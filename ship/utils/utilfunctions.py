@@ -430,6 +430,11 @@ class FileQueue(object):
         """
         return len(self.items)
 
+    def __iter__(self):
+        """Iterate the items from the front of the queue without removing them.
+        """
+        return reversed(self.items)
+
 
 class LoadStack(object):
     """Stack class for loading logic."""
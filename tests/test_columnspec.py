@@ -0,0 +1,62 @@
+from __future__ import unicode_literals
+
+import unittest
+
+from ship.datastructures.columnspec import ColumnSpec
+from ship.datastructures import rowdatacollection as rdc
+from ship.datastructures import dataobject as do
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+
+
+class ColumnSpecTests(unittest.TestCase):
+
+    def setUp(self):
+        self.spec = ColumnSpec([
+            (rdt.CHAINAGE, 0, 10), (rdt.ELEVATION, 10, 20),
+            (rdt.EASTING, 20, 30, None),
+        ])
+        self.lines = [
+            '     0.000    20.000   100.000',
+            '     2.000    10.000',
+            '     4.000    20.000          ',
+        ]
+
+    def createCollection(self):
+        return rdc.RowDataCollection.bulkInitCollection([
+            do.FloatData(rdt.CHAINAGE, format_str='{:>10}', no_of_dps=3),
+            do.FloatData(rdt.ELEVATION, format_str='{:>10}', no_of_dps=3),
+            do.FloatData(rdt.EASTING, format_str='{:>10}', no_of_dps=2, default=0.00),
+            do.FloatData(rdt.ROUGHNESS, format_str='{:>10}', no_of_dps=3, default=0.039),
+        ])
+
+    def test_parseLine(self):
+        self.assertListEqual(self.spec.parseLine(self.lines[0]), ['0.000', '20.000', '100.000'])
+        self.assertListEqual(self.spec.parseLine(self.lines[1]), ['2.000', '10.000', None])
+
+        spec = ColumnSpec([(rdt.RAIN, 0, 10)])
+        self.assertListEqual(spec.parseLine('     1.500'), ['1.500'])
+
+    def test_parseLines(self):
+        cols = self.spec.parseLines(self.lines)
+        self.assertListEqual(cols[rdt.CHAINAGE], ['0.000', '2.000', '4.000'])
+        self.assertListEqual(cols[rdt.EASTING], ['100.000', None, None])
+        self.assertListEqual(self.spec.parseLines([])[rdt.ELEVATION], [])
+
+    def test_readRows(self):
+        col = self.createCollection()
+        col.setDummyRow({rdt.CHAINAGE: 0, rdt.ELEVATION: 0})
+        unit_data = ['header', '         3'] + self.lines + ['next']
+
+        out_line = self.spec.readRows(col, unit_data, 2, 3)
+        self.assertEqual(out_line, 5)
+        self.assertFalse(col.has_dummy)
+        self.assertEqual(col.row_count, 3)
+        self.assertListEqual(col.dataObjectAsList(rdt.ELEVATION), [20.0, 10.0, 20.0])
+        self.assertListEqual(col.dataObjectAsList(rdt.EASTING), [100.0, 0.0, 0.0])
+        self.assertListEqual(col.dataObjectAsList(rdt.ROUGHNESS), [0.039] * 3)
+
+    def test_readRowsMissingKey(self):
+        spec = ColumnSpec([(rdt.CHAINAGE, 0, 10), (rdt.RAIN, 10, 20)])
+        col = self.createCollection()
+        self.assertRaises(KeyError, spec.readRows, col, self.lines, 0, 3)
+        self.assertEqual(col.row_count, 0)
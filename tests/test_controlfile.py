@@ -0,0 +1,168 @@
+from __future__ import unicode_literals
+
+import types
+import unittest
+
+from ship.tuflow.controlfile import ControlFile, PartHolder, LogicHolder
+from ship.tuflow import tuflowfilepart as tfp
+from ship.tuflow import FILEPART_TYPES as fpt
+
+
+class PartHolderTests(unittest.TestCase):
+    '''Tests the PartHolder lookups stay in step with the parts list.
+    '''
+
+    def setUp(self):
+        self.tcf = tfp.ModelFile(None, **{'path': 'tcffile.tcf', 'command': None,
+                                          'comment': None, 'model_type': 'TCF',
+                                          'root': 'fake'})
+        self.tgc = tfp.ModelFile(self.tcf, **{'path': 'tgcfile.tgc', 'command': None,
+                                              'comment': None, 'model_type': 'TGC',
+                                              'root': 'fake'})
+        self.holder = PartHolder()
+        self.tcf_parts = [tfp.UnknownPart(self.tcf, data='tcf') for i in range(3)]
+        self.tgc_parts = [tfp.UnknownPart(self.tgc, data='tgc') for i in range(3)]
+        for p in self.tcf_parts[:2] + self.tgc_parts + self.tcf_parts[2:]:
+            self.holder.append(p)
+
+    def checkIndexes(self):
+        parts = self.holder.parts
+        for p in self.tcf_parts + self.tgc_parts:
+            index = parts.index(p) if p in parts else -1
+            self.assertEqual(self.holder.index(p), index)
+        for parent in (self.tcf, self.tgc):
+            last = -1
+            for i, p in enumerate(parts):
+                if p.associates.parent == parent:
+                    last = i
+            self.assertEqual(self.holder.lastIndexOfParent(parent), last)
+
+    def test_add(self):
+        new_tgc = tfp.UnknownPart(self.tgc, data='tgc')
+        self.holder.add(new_tgc)
+        self.assertEqual(self.holder.index(new_tgc), 5)
+        self.tgc_parts.append(new_tgc)
+        self.checkIndexes()
+
+        new_tcf = tfp.UnknownPart(self.tcf, data='tcf')
+        self.holder.add(new_tcf, before=self.tgc_parts[1])
+        self.assertEqual(self.holder.index(new_tcf), 3)
+        self.tcf_parts.append(new_tcf)
+        self.checkIndexes()
+
+        new_tcf2 = tfp.UnknownPart(self.tcf, data='tcf')
+        self.holder.add(new_tcf2, after=self.tcf_parts[0])
+        self.assertEqual(self.holder.index(new_tcf2), 1)
+        self.tcf_parts.append(new_tcf2)
+        self.checkIndexes()
+
+        self.assertTrue(new_tcf2 in self.holder)
+        self.assertRaises(ValueError, self.holder.add, new_tcf2)
+
+    def test_removeAndReplace(self):
+        removed = self.holder.remove(self.tgc_parts[2])
+        self.assertIs(removed, self.tgc_parts[2])
+        self.assertFalse(removed in self.holder)
+        self.checkIndexes()
+        self.assertRaises(ValueError, self.holder.remove, removed)
+
+        self.holder.replace(removed, self.tgc_parts[0])
+        self.assertIs(self.holder[2], removed)
+        self.checkIndexes()
+
+        del self.holder[0]
+        self.holder[-1] = self.tgc_parts[0]
+        self.checkIndexes()
+
+    def test_move(self):
+        self.holder.move(self.tcf_parts[2], after=self.tcf_parts[0])
+        self.assertIs(self.holder[1], self.tcf_parts[2])
+        self.checkIndexes()
+
+        self.holder.move(self.tgc_parts[2], before=self.tcf_parts[0])
+        self.assertIs(self.holder[0], self.tgc_parts[2])
+        self.checkIndexes()
+
+        self.assertRaises(AttributeError, self.holder.move, self.tgc_parts[0])
+
+    def test_insertParts(self):
+        new_parts = [tfp.UnknownPart(self.tgc, data='tgc') for i in range(2)]
+        self.holder.insertParts(-1, new_parts)
+        self.assertListEqual(self.holder.parts[-3:-1], new_parts)
+        self.tgc_parts.extend(new_parts)
+        self.checkIndexes()
+
+    def test_duplicates(self):
+        '''Check the first position is found when a part is added twice.'''
+        self.holder.append(self.tgc_parts[0])
+        self.checkIndexes()
+        self.holder.remove(self.tgc_parts[0])
+        self.assertEqual(self.holder.index(self.tgc_parts[0]), 5)
+        self.checkIndexes()
+
+
+class LogicHolderTests(unittest.TestCase):
+
+    def test_partFromHash(self):
+        tcf = tfp.ModelFile(None, **{'path': 'tcffile.tcf', 'command': None,
+                                     'comment': None, 'model_type': 'TCF',
+                                     'root': 'fake'})
+        logic = [tfp.IfLogic(tcf, command='If Scenario', terms=['s1']) for i in range(3)]
+        holder = LogicHolder()
+        holder.add(logic[:2])
+        holder.insertParts(0, logic[2:])
+        self.assertListEqual(holder.parts, [logic[2], logic[0], logic[1]])
+        for l in logic:
+            self.assertIs(holder.partFromHash(l.hash), l)
+
+        holder.remove(logic[0])
+        self.assertIsNone(holder.partFromHash(logic[0].hash))
+        holder[0] = logic[0]
+        self.assertIs(holder.partFromHash(logic[0].hash), logic[0])
+        self.assertIsNone(holder.partFromHash(logic[2].hash))
+
+
+class ControlFileQueryTests(unittest.TestCase):
+    '''Tests the files and filepaths searches.
+    '''
+
+    def setUp(self):
+        self.tgc = tfp.ModelFile(None, **{'path': 'tgcfile.tgc', 'command': None,
+                                          'comment': None, 'model_type': 'TGC',
+                                          'root': 'fake'})
+        self.control = ControlFile('TGC')
+        self.gis = []
+        for name in ('one', 'two', 'one', 'three', 'two'):
+            part = tfp.GisFile(self.tgc, **{
+                'path': 'gis/%s.shp' % name, 'command': 'Read GIS Z Shape',
+                'root': 'fake', 'filepart_type': fpt.GIS
+            })
+            self.control.parts.append(part)
+            self.gis.append(part)
+
+    def test_filepaths(self):
+        self.assertListEqual(self.control.filepaths(),
+                             ['one.shp', 'two.shp', 'three.shp'])
+        self.assertListEqual(self.control.filepaths(no_duplicates=False),
+                             ['one.shp', 'two.shp', 'one.shp', 'three.shp', 'two.shp'])
+        self.assertDictEqual(self.control.filepaths(by_parent=True),
+                             {'tgcfile.tgc': ['one.shp', 'two.shp', 'three.shp']})
+        self.assertListEqual(self.control.filepaths(exclude=[fpt.GIS]), [])
+
+        paths = self.control.iterFilepaths()
+        self.assertIsInstance(paths, types.GeneratorType)
+        self.assertEqual(next(paths), 'one.shp')
+
+    def test_files(self):
+        self.assertListEqual(self.control.files(),
+                             [self.gis[0], self.gis[1], self.gis[3]])
+        self.assertListEqual(self.control.files(filepart_type=fpt.GIS,
+                                                no_duplicates=False), self.gis)
+
+        # The callback is given the parts found so far
+        files = self.control.files(callback_func=lambda found, part: len(found) < 2)
+        self.assertListEqual(files, self.gis[:2])
+
+        parts = self.control.iterPartType(tfp.TuflowFile)
+        self.assertIsInstance(parts, types.GeneratorType)
+        self.assertListEqual(list(parts), [self.gis[0], self.gis[1], self.gis[3]])
@@ -0,0 +1,113 @@
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ship.utils.fileloaders.controlfilecache import ControlFileCache
+from ship.utils.fileloaders.datcache import DatCache
+from ship.utils.fileloaders.tuflowloader import TuflowLoader
+from ship.tuflow import tuflowfilepart as tuflowpart
+from ship.tuflow import FILEPART_TYPES as fpt
+
+
+class ControlFileCacheTests(unittest.TestCase):
+    '''Tests for reusing the parts read from tuflow control files.
+    '''
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.lines = [
+            'Read GIS Z Shape == gis\\zshape_1.shp',
+            'If Scenario == scen1',
+            '    Read GIS Z Line == gis\\zline_1.shp',
+            'End If',
+            'Geometry Control File == ..\\model\\test.tgc',
+            'Set Variable myvar == 2',
+        ]
+        with open(os.path.join(self.temp_dir, 'test.tcf'), 'w') as f:
+            f.write('\n'.join(self.lines))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def controlPart(self):
+        return tuflowpart.ModelFile(None, **{
+            'path': 'test.tcf', 'command': None, 'comment': None,
+            'model_type': 'TCF', 'root': self.temp_dir
+        })
+
+    def readParts(self, control_part):
+        return TuflowLoader()._readControlFile(self.lines, self.temp_dir, control_part)
+
+    def checkParts(self, results, control_part, original):
+        contents, logic, actions = results
+        self.assertEqual(len(contents), len(original[0]))
+        self.assertEqual(len(logic), 1)
+        self.assertListEqual([a[0] for a in actions], [fpt.MODEL, fpt.USER_VARIABLE])
+
+        for new, old in zip(contents, original[0]):
+            self.assertIs(new.associates.parent, control_part)
+            self.assertNotEqual(new.hash, old.hash)
+            self.assertEqual(new.getPrintableContents(), old.getPrintableContents())
+        self.assertEqual(len(control_part.observers), len(contents) + len(logic))
+        self.assertIs(actions[0][1], contents[2])
+
+        # The logic holds the new hashes of its parts
+        self.assertIs(contents[1].associates.logic, logic[0])
+        self.assertListEqual(logic[0].parts, [contents[1].hash])
+        self.assertEqual(contents[2].absolutePath(), original[0][2].absolutePath())
+
+    def test_loadAndStore(self):
+        '''Check copies of the parts are re-parented to the new ModelFile.'''
+        cache = ControlFileCache()
+        control_part = self.controlPart()
+        self.assertIsNone(cache.load(control_part))
+        self.assertFalse(cache.isCurrent(control_part))
+
+        original = self.readParts(control_part)
+        self.assertTrue(cache.store(control_part, original))
+        self.assertTrue(cache.isCurrent(self.controlPart()))
+
+        new_part = self.controlPart()
+        self.checkParts(cache.load(new_part), new_part, original)
+
+        # The original parts are left alone
+        self.assertIs(original[0][0].associates.parent, control_part)
+        self.assertEqual(len(control_part.observers), len(original[0]) + 1)
+
+        # Changing the file should invalidate the entry
+        with open(os.path.join(self.temp_dir, 'test.tcf'), 'a') as f:
+            f.write('\nRead GIS Z Shape == gis\\zshape_2.shp')
+        self.assertFalse(cache.isCurrent(new_part))
+        self.assertIsNone(cache.load(self.controlPart()))
+
+    def test_diskCache(self):
+        '''Check entries can be loaded from disk by a new cache.'''
+        disk_cache = DatCache(os.path.join(self.temp_dir, 'cache'))
+        control_part = self.controlPart()
+        original = self.readParts(control_part)
+        ControlFileCache().store(control_part, original, disk_cache)
+
+        cache = ControlFileCache()
+        new_part = self.controlPart()
+        self.checkParts(cache.load(new_part, disk_cache), new_part, original)
+        self.assertTrue(cache.isCurrent(self.controlPart()))
+
+    def test_maxEntries(self):
+        '''Check the least recently used entries are removed first.'''
+        cache = ControlFileCache(max_entries=2)
+        parts = []
+        for model_type in ('TCF', 'TGC', 'TBC'):
+            control_part = self.controlPart()
+            control_part.model_type = model_type
+            cache.store(control_part, self.readParts(control_part))
+            parts.append(control_part)
+            if model_type == 'TGC':
+                self.assertIsNotNone(cache.load(parts[0]))
+
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(cache.isCurrent(parts[0]))
+        self.assertFalse(cache.isCurrent(parts[1]))
+        self.assertTrue(cache.isCurrent(parts[2]))
@@ -133,3 +133,70 @@ class DataObjectsTest(unittest.TestCase):
         expected_output = ''
         self.assertEqual(self.txt.getPrintableValue(1), expected_output, 'Special getPrintableValue() 1 failure')
         self.failUnlessRaises(IndexError, lambda: self.txt.getPrintableValue(3))
+
+    def test_float_compact(self):
+        self.flt.addValue(1.5)
+        self.flt.addValue(2.5)
+        self.assertFalse(self.flt.is_compact)
+        self.assertTrue(self.flt.compact())
+        self.assertTrue(self.flt.is_compact)
+
+        # The same api should work on the compact values
+        self.flt.addValue(0.5, 0)
+        self.flt.setValue(3.5, 2)
+        self.flt.deleteValue(1)
+        self.assertListEqual(list(self.flt), [0.5, 3.5])
+        self.assertEqual(self.flt.getValue(1), 3.5)
+        self.assertEqual(self.flt.getPrintableValue(1), '     3.500')
+
+        view = self.flt.buffer()
+        self.assertListEqual(view.tolist(), [0.5, 3.5])
+        view.release()
+
+        # Values that can't go in the array should switch back to a list
+        blank = do.FloatData(rdt.CHAINAGE, format_str='{:>10}', default='')
+        blank.addValue(1.0)
+        self.assertTrue(blank.compact())
+        blank.addValue()
+        self.assertFalse(blank.is_compact)
+        self.assertListEqual(list(blank), [1.0, ''])
+        self.assertFalse(blank.compact())
+        self.assertRaises(ValueError, blank.buffer)
+
+    def test_int_compact(self):
+        num = do.IntData(rdt.CHAINAGE, format_str='{:>10}')
+        num.addValue(3)
+        num.addValue('4')
+        self.assertTrue(num.compact())
+        num.setValue(5, 0)
+        self.assertListEqual(list(num), [5, 4])
+        self.assertIsInstance(num.getValue(0), int)
+
+    def test_printableValues(self):
+        '''Check formatting a list of values matches getPrintableValue().'''
+        values = {
+            self.flt: [103.142, -2.5, 0.0],
+            self.sym: [True, False, True],
+            self.con: ['LEFT', '', 'BED'],
+            self.txt: ['1435', '', 'abc'],
+        }
+        for obj, vals in values.items():
+            obj.data_collection = vals
+            expected = [obj.getPrintableValue(i) for i in range(len(vals))]
+            self.assertListEqual(obj.printableValues(vals), expected)
+        self.assertListEqual(self.flt.printableValues([1.0, 2.5]), ['     1.000', '     2.500'])
+
+        # Blanks and scientific notation aren't printf formatted
+        blank = do.FloatData(rdt.CHAINAGE, format_str='{:>10}', no_of_dps=2, default='')
+        self.assertListEqual(blank.printableValues([1.0, '']), ['      1.00', '          '])
+        sn = do.FloatData(rdt.CHAINAGE, format_str='{:>10}', no_of_dps=2, use_sn=1000)
+        self.assertListEqual(sn.printableValues([1.0, 12345.0]), ['      1.00', '   1.23e04'])
+        num = do.IntData(rdt.CHAINAGE, format_str='{:<5}')
+        self.assertListEqual(num.printableValues([3, 45]), ['3    ', '45   '])
+
+    def test_printfFormat(self):
+        self.assertEqual(do.printfFormat('{:>10}', '.3f'), '%10.3f')
+        self.assertEqual(do.printfFormat('{:<5}', 'd'), '%-5d')
+        self.assertEqual(do.printfFormat('{}', 'd'), '%d')
+        self.assertIsNone(do.printfFormat('{:>10.2}', 'd'))
+        self.assertIsNone(do.printfFormat(', {0}', 'd'))
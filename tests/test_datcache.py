@@ -0,0 +1,76 @@
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ship.utils.fileloaders.datcache import DatCache
+from ship.fmp.datcollection import DatCollection
+from ship.fmp import fmpunitfactory as iuf
+
+
+class DatCacheTests(unittest.TestCase):
+    '''Tests for storing loaded DatCollection's on disk.
+    '''
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, 'cache')
+        self.dat_path = os.path.join(self.temp_dir, 'model.dat')
+
+        riv1 = iuf.FmpUnitFactory.createUnit('river', name='riv1')
+        riv2 = iuf.FmpUnitFactory.createUnit('river', name='riv2')
+        self.dat = DatCollection.initialisedDat(self.dat_path, [riv1, riv2])
+        self.writeDat(self.dat)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def writeDat(self, dat):
+        with open(self.dat_path, 'w') as f:
+            f.write('\n'.join(dat.getPrintableContents()) + '\n')
+
+    def test_loadAndStore(self):
+        '''Check entries are only returned while the file is unchanged.'''
+        cache = DatCache(self.cache_dir)
+        stamp = cache.fileStamp(self.dat_path)
+        self.assertIsNone(cache.load(stamp))
+
+        self.assertTrue(cache.store(stamp, self.dat, ['warning']))
+        units, warnings = cache.load(cache.fileStamp(self.dat_path))
+        self.assertListEqual(warnings, ['warning'])
+        self.assertEqual(units.unit('riv2').name, 'riv2')
+        self.assertListEqual(units.getPrintableContents(),
+                             self.dat.getPrintableContents())
+
+        # Different variants of the same file are stored separately
+        self.assertIsNone(cache.load(stamp, 'lazy'))
+
+        # Changing the file should invalidate the entry
+        self.dat.unit('riv1').name = 'riv1_new'
+        self.writeDat(self.dat)
+        self.assertIsNone(cache.load(cache.fileStamp(self.dat_path)))
+        self.assertListEqual(cache._entries(), [])
+
+    def test_evict(self):
+        '''Check the least recently used entries are removed first.'''
+        cache = DatCache(self.cache_dir)
+        stamps = []
+        for i in range(3):
+            stamps.append(cache.fileStamp(self.dat_path))
+            cache.store(stamps[-1], self.dat, variant=str(i))
+            entry = cache._entryPath(stamps[-1]['path'], str(i))
+            os.utime(entry, (i * 10, i * 10))
+        entry_size = os.path.getsize(entry)
+
+        # Using the first entry should make the second the oldest
+        self.assertIsNotNone(cache.load(stamps[0], '0'))
+        cache.max_size = entry_size * 2
+        cache.evict()
+        self.assertIsNotNone(cache.load(stamps[0], '0'))
+        self.assertIsNone(cache.load(stamps[1], '1'))
+        self.assertIsNotNone(cache.load(stamps[2], '2'))
+
+        cache.clear()
+        self.assertListEqual(cache._entries(), [])
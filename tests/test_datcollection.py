@@ -305,3 +305,117 @@ class IsisUnitCollectionTest(unittest.TestCase):
         self.assertEqual(links3.main_unit, riv6)
         self.assertEqual(links3.us_unit, riv5)
         self.assertEqual(links3.ds_unit, riv7)
+
+    def test_unitNetwork(self):
+        """Check the unit network stays correct as the collection is changed."""
+        dat = DatCollection.initialisedDat(self.fake_path)
+        riv1 = iuf.FmpUnitFactory.createUnit('river', name='riv1')
+        riv2 = iuf.FmpUnitFactory.createUnit('river', name='riv2')
+        riv1.head_data['spill1'].value = 'spill1_us'
+        riv1.head_data['lateral1'].value = 'riv2'
+        spill1 = iuf.FmpUnitFactory.createUnit('spill', name='spill1_us',
+                                               name_ds='riv2')
+        junc1 = iuf.FmpUnitFactory.createUnit('junction', name='riv2')
+        junc1.head_data['names'].append('spill1_us')
+        dat.addUnit(riv1)
+        dat.addUnit(spill1)
+        dat.addUnit(riv2)
+
+        network = dat.unitNetwork()
+        self.assertListEqual(network.spillUnits(riv1), [spill1])
+        self.assertListEqual(network.lateralUnits(riv1), [spill1, riv2])
+        self.assertListEqual(network.downstreamUnits(spill1), [riv2])
+        self.assertListEqual(network.upstreamUnits(riv2), [spill1])
+        self.assertListEqual(network.junctions(riv2), [])
+
+        # Added and removed units should be picked up without a rebuild
+        dat.addUnit(junc1)
+        self.assertIs(dat.unitNetwork(), network)
+        self.assertListEqual(network.junctions(riv2), [(junc1, [spill1, riv2])])
+        dat.removeUnit(spill1)
+        self.assertIs(dat.unitNetwork(), network)
+        self.assertListEqual(network.spillUnits(riv1), [])
+        self.assertListEqual(network.junctionMembers(junc1), [riv2])
+
+        # Changed labels should only update the unit that changed
+        riv1.head_data['spill1'].value = 'riv2'
+        self.assertIs(dat.unitNetwork(), network)
+        self.assertListEqual(network.spillUnits(riv1), [riv2])
+
+        # Units outside the collection don't affect it
+        riv3 = iuf.FmpUnitFactory.createUnit('river', name='riv3')
+        riv3.head_data['spill1'].value = 'riv1'
+        self.assertIs(dat.unitNetwork(), network)
+        self.assertListEqual(network.namedUnits(riv1), [riv2])
+        links = dat.linkedUnits(riv1)
+        self.assertListEqual(links.named_units, [riv2])
+
+    def test_nameLookups(self):
+        """Check lookups stay correct as the collection is changed."""
+        self.dat.addUnit(self.riv1)
+        self.dat.addUnit(self.riv2)
+        self.dat.addUnit(self.brg1)
+        self.dat.addUnit(self.riv3, index=2)
+        self.assertEqual(self.dat.index('riv3', 'river'), 2)
+        self.assertEqual(self.dat.index(self.riv1), 3)
+        self.assertEqual(self.dat.index('brg1'), 5)
+        self.assertEqual(self.dat.index('brg1', 'river'), -1)
+        self.assertEqual(self.dat.unit('brg1', unit_category='bridge'), self.brg1)
+
+        self.dat.removeUnit(self.riv3)
+        self.assertEqual(self.dat.index(self.riv1), 2)
+        self.assertEqual(self.dat.index('riv3', 'river'), -1)
+        self.assertFalse(self.dat.unit('riv3'))
+        with self.assertRaises(ValueError):
+            self.dat.index(self.riv3)
+
+        # Renamed units should be found by their new name only
+        self.riv2.name = 'riv2_renamed'
+        self.assertFalse(self.dat.unit('riv2'))
+        self.assertEqual(self.dat.unit('riv2_renamed'), self.riv2)
+        self.assertEqual(self.dat.index('riv2_renamed', 'river'), 3)
+
+        # Replacing a unit should update the lookups
+        brg = iuf.FmpUnitFactory.createUnit('arch', name='brg1', name_ds='new_ds')
+        self.dat.setUnit(brg)
+        self.assertEqual(self.dat.unit('brg1'), brg)
+        self.assertEqual(self.dat.index(brg), 4)
+        with self.assertRaises(ValueError):
+            self.dat.index(self.brg1)
+        with self.assertRaises(KeyError):
+            self.dat.setUnit(self.riv3)
+
+    def test_renameUnits(self):
+        """Check renamed units are updated in the lookups without a rebuild."""
+        dat = DatCollection.initialisedDat(self.fake_path)
+        riv1 = iuf.FmpUnitFactory.createUnit('river', name='riv1')
+        riv2 = iuf.FmpUnitFactory.createUnit('river', name='riv2')
+        junc1 = iuf.FmpUnitFactory.createUnit('junction', name='riv1')
+        for u in (riv1, riv2, junc1):
+            dat.addUnit(u)
+        network = dat.unitNetwork()
+        self.assertListEqual(network.junctions(riv1), [(junc1, [riv1])])
+
+        # Editing the junction names list should update both lookups
+        junc1.head_data['names'][0] = 'junc1'
+        junc1.head_data['names'].append('riv2')
+        self.assertIs(dat.unit('junc1'), junc1)
+        self.assertIs(dat.unit('riv1'), riv1)
+        self.assertIs(dat.unitNetwork(), network)
+        self.assertListEqual(network.junctions(riv1), [])
+        self.assertListEqual(network.junctions(riv2), [(junc1, [riv2])])
+
+        riv2.name = 'riv2_renamed'
+        self.assertIs(dat.unitNetwork(), network)
+        self.assertListEqual(network.junctions(riv2), [])
+        self.assertIs(dat.unit('riv2_renamed'), riv2)
+
+        # Copies and removed units aren't linked to the collection
+        riv3 = riv1.copy()
+        riv3.name = 'riv3'
+        self.assertListEqual(riv3.observers, [])
+        self.assertIs(dat.unit('riv1'), riv1)
+        dat.removeUnit(riv1)
+        self.assertListEqual(riv1.observers, [])
+        riv1.name = 'riv1_removed'
+        self.assertFalse(dat.unit('riv1_removed'))
@@ -0,0 +1,212 @@
+from __future__ import unicode_literals
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from ship.utils.fileloaders.datloader import DatLoader
+from ship.utils.fileloaders.datcache import DatCache
+from ship.utils.filetools import PathHolder
+from ship.fmp.datcollection import DatCollection, LazyUnit
+from ship.fmp import fmpunitfactory as iuf
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+
+
+class DatLoaderTests(unittest.TestCase):
+    '''Tests for building a DatCollection from .dat file contents.
+    '''
+
+    def setUp(self):
+        '''Create the contents of a small .dat file to load.
+        '''
+        self.prefix = '/'
+        if os.name != 'posix':
+            self.prefix = 'c:' + os.sep
+        self.fake_path = os.path.join(self.prefix, 'fake', 'path', 'to', 'datfile.dat')
+
+        row_data = {
+            'main': [
+                {rdt.CHAINAGE: 0.0, rdt.ELEVATION: 20.0, rdt.ROUGHNESS: 0.04},
+                {rdt.CHAINAGE: 2.0, rdt.ELEVATION: 10.0, rdt.ROUGHNESS: 0.04},
+                {rdt.CHAINAGE: 4.0, rdt.ELEVATION: 20.0, rdt.ROUGHNESS: 0.04},
+            ]
+        }
+        riv1 = iuf.FmpUnitFactory.createUnit('river', name='riv1', row_data=row_data)
+        riv2 = iuf.FmpUnitFactory.createUnit('river', name='riv2', row_data=row_data)
+        riv3 = iuf.FmpUnitFactory.createUnit('river', name='riv3', row_data=row_data)
+        brg1 = iuf.FmpUnitFactory.createUnit('arch', name='brg1', name_ds='brg1ds')
+        dat = DatCollection.initialisedDat(self.fake_path, [riv1, riv2, brg1, riv3])
+        contents = dat.getPrintableContents()
+
+        # Add a unit that isn't supported after riv2 so it's loaded as unknown
+        self.unknown_lines = ['QTBDY', 'riv2', '         1', '     1.000     0.000']
+        index = [i for i, c in enumerate(contents) if c.startswith('BRIDGE')][0]
+        contents = contents[:index] + self.unknown_lines + contents[index:]
+        self.contents = [c + '\n' for c in contents]
+
+    def loadDat(self, arg_dict={}, chunk_lines=None):
+        loader = DatLoader()
+        if chunk_lines is not None:
+            loader.PARALLEL_CHUNK_LINES = chunk_lines
+        loader.units = DatCollection(PathHolder(self.fake_path))
+        return loader.buildDat(list(self.contents), arg_dict)
+
+    def test_buildLazyDat(self):
+        '''Check that the lazy load only reads units when they are accessed.'''
+        dat = self.loadDat({'lazy': True})
+        lazy = [u for u in dat.units if isinstance(u, LazyUnit)]
+        self.assertEqual(len(lazy), 5)
+        self.assertEqual([u.name for u in lazy], ['riv1', 'riv2', 'brg1', 'riv3', 'initial_conditions'])
+        self.assertEqual(lazy[2].file_key, 'BRIDGE')
+        self.assertEqual(lazy[2].unit_type, 'arch')
+
+        # Reading one unit should leave the others alone
+        brg = dat.unit('brg1')
+        self.assertEqual(brg.unit_type, 'arch')
+        self.assertEqual(brg.name_ds, 'brg1ds')
+        self.assertIs(dat.units[4], brg)
+        lazy = [u for u in dat.units if isinstance(u, LazyUnit)]
+        self.assertEqual(len(lazy), 4)
+
+        # Unread units should be written out as they were read
+        out = dat.getPrintableContents()
+        self.assertListEqual(out, [c.rstrip('\n') for c in self.contents])
+
+    def test_buildLazyDatUnknown(self):
+        '''Lines that don't belong to a unit should end up in an UnknownUnit.'''
+        dat = self.loadDat({'lazy': True})
+        riv2 = dat.unit('riv2')
+        self.assertEqual(riv2.row_data['main'].row_count, 3)
+        unknown = dat.units[dat.index(riv2) + 1]
+        self.assertEqual(unknown.unit_type, 'unknown')
+        self.assertListEqual(unknown.getData(), self.unknown_lines)
+
+    def test_buildLazyDatMatchesFull(self):
+        '''Reading every lazy unit should give the same model as a full load.'''
+        full = self.loadDat()
+        dat = self.loadDat({'lazy': True})
+
+        ic = dat.unit('initial_conditions')
+        self.assertEqual(ic.node_count, full.unit('initial_conditions').node_count)
+        self.assertFalse([u for u in dat.units if isinstance(u, LazyUnit)])
+        self.assertListEqual([u.unit_type for u in dat], [u.unit_type for u in full])
+        self.assertListEqual(dat.getPrintableContents(), full.getPrintableContents())
+
+        # Attributes accessed straight from the units list load the unit too
+        dat = self.loadDat({'lazy': True})
+        self.assertEqual(dat.units[2].row_data['main'].row_count, 3)
+        self.assertNotIsInstance(dat.units[2], LazyUnit)
+
+    def test_unchangedUnitsWrittenAsRead(self):
+        '''Only units that have been changed should be formatted again.'''
+        # Add some spacing that getData() wouldn't write out
+        index = [i for i, c in enumerate(self.contents) if c.startswith('riv1')][0]
+        self.contents[index] = self.contents[index].rstrip('\n') + '    \n'
+        source = [c.rstrip('\n') for c in self.contents]
+        dat = self.loadDat()
+        self.assertFalse([u for u in dat if u.has_changed and u.unit_type != 'unknown'])
+        self.assertListEqual(dat.getPrintableContents(), source)
+
+        riv2 = dat.unit('riv2')
+        riv2.row_data['main'].dataObject(rdt.ROUGHNESS)[1] = 0.05
+        self.assertTrue(riv2.has_changed)
+        out = dat.getPrintableContents()
+        self.assertListEqual(out[:index + 1], source[:index + 1])
+        self.assertIn('     2.000    10.000     0.050', '\n'.join(out))
+
+        # Renaming is picked up even though it isn't a HeadDataItem
+        riv1 = dat.unit('riv1')
+        self.assertFalse(riv1.has_changed)
+        riv1.name = 'riv1_new'
+        self.assertTrue(riv1.has_changed)
+        self.assertEqual(dat.getPrintableContents()[index], 'riv1_new')
+
+        riv1.setChangeStatus(False)
+        self.assertFalse(riv1.has_changed)
+        riv1.head_data['distance'].value = 12.0
+        self.assertTrue(riv1.has_changed)
+
+    def test_unchangedAfterPickle(self):
+        '''Units should still be written as read after pickling or caching.'''
+        index = [i for i, c in enumerate(self.contents) if c.startswith('riv1')][0]
+        self.contents[index] = self.contents[index].rstrip('\n') + '    \n'
+        source = [c.rstrip('\n') for c in self.contents]
+        dat = self.loadDat()
+        dat.unit('riv2').name = 'riv2_new'
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            cache = DatCache(temp_dir)
+            stamp = {'path': self.fake_path}
+            cache.store(stamp, dat, [])
+            cached = cache.load(stamp)[0]
+        finally:
+            shutil.rmtree(temp_dir)
+
+        for loaded in (pickle.loads(pickle.dumps(dat)), cached, dat.unit('riv1').copy()):
+            if isinstance(loaded, DatCollection):
+                changed = [u.name for u in loaded if u.has_changed and u.unit_type != 'unknown']
+                self.assertListEqual(changed, ['riv2_new'])
+                out = loaded.getPrintableContents()
+                self.assertEqual(out[index], source[index])
+                self.assertListEqual(out[:index + 1], source[:index + 1])
+            else:
+                self.assertFalse(loaded.has_changed)
+
+    def test_writeStreamed(self):
+        '''Check the streamed output matches getPrintableContents().'''
+        dat = self.loadDat()
+        for u in dat:
+            u.setChangeStatus(True)
+        contents = dat.getPrintableContents()
+        self.assertListEqual(list(dat.iterPrintableContents()), contents)
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            out_path = os.path.join(temp_dir, 'out.dat')
+            dat.write(out_path)
+            with open(out_path) as f:
+                self.assertEqual(f.read(), '\n'.join(contents) + '\n')
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_writeFailureKeepsFile(self):
+        '''An error part way through writing shouldn't touch the old file.'''
+        dat = self.loadDat()
+        temp_dir = tempfile.mkdtemp()
+        try:
+            out_path = os.path.join(temp_dir, 'out.dat')
+            dat.write(out_path)
+            with open(out_path) as f:
+                original = f.read()
+
+            def badData():
+                raise ValueError('bad unit')
+            riv3 = dat.unit('riv3')
+            riv3.iterData = badData
+            riv3.setChangeStatus(True)
+            with self.assertRaises(ValueError):
+                dat.write(out_path, overwrite=True)
+            with open(out_path) as f:
+                self.assertEqual(f.read(), original)
+            self.assertListEqual(os.listdir(temp_dir), ['out.dat'])
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_buildParallelDat(self):
+        '''Reading the units on a process pool should give the same model.'''
+        full = self.loadDat()
+        dat = self.loadDat({'workers': 2}, chunk_lines=5)
+        self.assertFalse([u for u in dat.units if isinstance(u, LazyUnit)])
+        self.assertListEqual([u.unit_type for u in dat], [u.unit_type for u in full])
+        ic = dat.unit('initial_conditions')
+        self.assertEqual(ic.node_count, full.unit('initial_conditions').node_count)
+        self.assertDictEqual(ic._name_types, full.unit('initial_conditions')._name_types)
+        self.assertFalse([u for u in dat if u.has_changed and u.unit_type != 'unknown'])
+        for u in dat:
+            u.setChangeStatus(True)
+        for u in full:
+            u.setChangeStatus(True)
+        self.assertListEqual(dat.getPrintableContents(), full.getPrintableContents())
@@ -0,0 +1,93 @@
+from __future__ import unicode_literals
+
+import unittest
+
+from ship.utils.tools import modelconveyance as mc
+from ship.utils.tools import openchannel as oc
+from ship.fmp.datcollection import DatCollection
+from ship.fmp import fmpunitfactory as iuf
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+
+
+class ModelConveyanceTests(unittest.TestCase):
+    '''Tests for calculating conveyance for a whole model.
+    '''
+
+    def setUp(self):
+        def section(name, berm):
+            rows = [(0.0, 10.0), (0.0, 5.0), (2.0, 5.0), (2.0, berm),
+                    (50.0, berm), (50.0, 10.0)]
+            row_data = {'main': [
+                {rdt.CHAINAGE: x, rdt.ELEVATION: y, rdt.ROUGHNESS: 0.04}
+                for x, y in rows
+            ]}
+            return iuf.FmpUnitFactory.createUnit('river', name=name, row_data=row_data)
+
+        self.riv1 = section('riv1', 8.0)
+        self.riv2 = section('riv2', 8.0)
+        self.riv3 = section('riv3', 9.0)
+        brg1 = iuf.FmpUnitFactory.createUnit('arch', name='brg1', name_ds='brg1ds')
+        self.dat = DatCollection.initialisedDat(
+            'c:/fake/path.dat', [self.riv1, self.riv2, brg1, self.riv3]
+        )
+        self.chunk_size = mc.CHUNK_SIZE
+
+    def tearDown(self):
+        mc.CHUNK_SIZE = self.chunk_size
+
+    def test_calcModelConveyance(self):
+        '''Each section should have the same results as calcConveyance.'''
+        conveyance, negatives = mc.calcModelConveyance(self.dat, interpolate_space=0.5)
+        self.assertListEqual(list(conveyance.keys()),
+                             [('riv1', 2), ('riv2', 3), ('riv3', 5)])
+
+        geometry = mc.sectionGeometry(self.riv3)
+        expected = oc.calcConveyance(interpolate_space=0.5, **geometry)
+        self.assertEqual(conveyance[('riv3', 5)], expected)
+
+        # The wide berms should cause negative conveyance
+        self.assertListEqual([n['name'] for n in negatives], ['riv1', 'riv2', 'riv3'])
+        self.assertListEqual([n['index'] for n in negatives], [2, 3, 5])
+        self.assertListEqual(negatives[2]['stages'], [9.0])
+        self.assertGreater(negatives[2]['max_reduction'], 0.0)
+
+        # Run on a process pool
+        mc.CHUNK_SIZE = 1
+        pooled, pooled_negatives = mc.calcModelConveyance(
+            self.dat, workers=2, interpolate_space=0.5
+        )
+        self.assertEqual(pooled, conveyance)
+        self.assertEqual(pooled_negatives, negatives)
+
+    def test_calcModelConveyanceCache(self):
+        '''Only sections that have changed should be calculated again.'''
+        cache = {}
+        conveyance, negatives = mc.calcModelConveyance(self.dat, cache=cache)
+        # riv1 and riv2 have the same geometry so share an entry
+        self.assertEqual(len(cache), 2)
+
+        self.riv3.row_data['main'].dataObject(rdt.ELEVATION)[3] = 7.0
+        conveyance2, negatives2 = mc.calcModelConveyance(self.dat, cache=cache)
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(conveyance2[('riv1', 2)], conveyance[('riv1', 2)])
+        self.assertNotEqual(conveyance2[('riv3', 5)], conveyance[('riv3', 5)])
+
+    def test_duplicateNames(self):
+        '''Sections with the same name should each have their own results.'''
+        self.riv2.name = 'riv1'
+        self.riv2.row_data['main'].dataObject(rdt.ELEVATION)[3] = 7.0
+        conveyance, negatives = mc.calcModelConveyance(self.dat, interpolate_space=0.5)
+        self.assertListEqual(list(conveyance.keys()),
+                             [('riv1', 2), ('riv1', 3), ('riv3', 5)])
+        self.assertNotEqual(conveyance[('riv1', 2)], conveyance[('riv1', 3)])
+        flagged = [k for k, v in conveyance.items() if v[1]]
+        self.assertListEqual([(n['name'], n['index']) for n in negatives], flagged)
+
+    def test_sectionGeometryActive(self):
+        '''Only the part between the deactivation markers should be used.'''
+        deact = self.riv1.row_data['main'].dataObject(rdt.DEACTIVATION)
+        deact[1] = 'LEFT'
+        deact[4] = 'RIGHT'
+        geometry = mc.sectionGeometry(self.riv1, active_only=True)
+        self.assertListEqual(geometry['x_vals'], [0.0, 2.0, 2.0, 50.0])
+        self.assertListEqual(geometry['y_vals'], [5.0, 5.0, 8.0, 8.0])
@@ -0,0 +1,64 @@
+from __future__ import unicode_literals
+
+import unittest
+
+from ship.utils.tools import modeltable as mt
+from ship.fmp.datcollection import DatCollection
+from ship.fmp import fmpunitfactory as iuf
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+
+
+@unittest.skipIf(mt.np is None, 'numpy is not installed')
+class ModelTableTests(unittest.TestCase):
+
+    def setUp(self):
+        rows = {
+            'main': [
+                {rdt.CHAINAGE: 0.0, rdt.ELEVATION: 20.0, rdt.ROUGHNESS: 0.04},
+                {rdt.CHAINAGE: 2.0, rdt.ELEVATION: 10.0, rdt.ROUGHNESS: 0.03},
+                {rdt.CHAINAGE: 4.0, rdt.ELEVATION: 20.0, rdt.ROUGHNESS: 0.04},
+            ]
+        }
+        riv1 = iuf.FmpUnitFactory.createUnit('river', name='riv1', row_data=rows)
+        riv2 = iuf.FmpUnitFactory.createUnit('river', name='riv2', row_data=rows)
+        htbdy = iuf.FmpUnitFactory.createUnit('htbdy', name='hbdy1', row_data={
+            'main': [{rdt.ELEVATION: 5.0, rdt.TIME: 0.0}, {rdt.ELEVATION: 6.0, rdt.TIME: 1.0}]
+        })
+        self.dat = DatCollection.initialisedDat('/fake/path/model.dat', [riv1, htbdy, riv2])
+
+    def test_unitArrays(self):
+        riv1 = self.dat.unit('riv1')
+        arrays = mt.unitArrays(riv1)
+        self.assertListEqual(arrays['elevation'].tolist(), [20.0, 10.0, 20.0])
+        self.assertListEqual(list(arrays.keys())[:3], ['chainage', 'elevation', 'roughness'])
+        arrays['elevation'][0] = 1.0
+        self.assertEqual(riv1.row_data['main'].dataValue(rdt.ELEVATION, 0), 20.0)
+
+        arrays = mt.unitArrays(riv1, copy=False)
+        self.assertFalse(arrays['elevation'].flags.writeable)
+
+    def test_modelArrays(self):
+        arrays = mt.modelArrays(self.dat)
+        self.assertListEqual(arrays['unit_name'].tolist()[:6], ['riv1'] * 3 + ['hbdy1'] * 2 + ['riv2'])
+        self.assertListEqual(arrays['row'].tolist()[:6], [0, 1, 2, 0, 1, 0])
+        self.assertListEqual(arrays['elevation'].tolist()[:8], [20.0, 10.0, 20.0, 5.0, 6.0, 20.0, 10.0, 20.0])
+        time = arrays['time'].tolist()[:8]
+        self.assertEqual(time[3:5], [0.0, 1.0])
+        self.assertTrue(all(t != t for t in time[:3] + time[5:]))  # NaN
+
+        arrays = mt.modelArrays(self.dat, unit_types=['river'], keys=[rdt.ROUGHNESS])
+        self.assertListEqual(list(arrays.keys()), mt.UNIT_COLUMNS + ['roughness'])
+        self.assertListEqual(arrays['roughness'].tolist(), [0.04, 0.03, 0.04] * 2)
+
+    @unittest.skipIf(mt.pd is None, 'pandas is not installed')
+    def test_modelTable(self):
+        table = mt.modelTable(self.dat, unit_types=['river'])
+        self.assertEqual(len(table), 6)
+        self.assertAlmostEqual(table.groupby('unit_name')['roughness'].mean()['riv2'], 0.11 / 3)
+        riv1 = self.dat.unit('riv1')
+        frame = mt.unitDataFrame(riv1)
+        self.assertListEqual(frame['chainage'].tolist(), [0.0, 2.0, 4.0])
+
+        # The DataFrame doesn't stop rows being added to the unit
+        riv1.addRow({rdt.CHAINAGE: 6.0, rdt.ELEVATION: 25.0})
+        self.assertEqual(len(frame), 3)
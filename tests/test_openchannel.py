@@ -0,0 +1,128 @@
+from __future__ import unicode_literals
+
+import unittest
+import warnings
+
+from ship.utils.tools import openchannel as oc
+
+
+class OpenChannelTests(unittest.TestCase):
+    '''Tests for the open channel conveyance calculations.
+    '''
+
+    def setUp(self):
+        # A channel with a flat bed, a step in the right bank and a panel
+        self.x = [0.0, 2.0, 4.0, 6.0, 8.0, 10.0, 12.0]
+        self.y = [10.0, 6.0, 5.0, 5.0, 7.0, 7.0, 10.0]
+        self.n = [0.05, 0.035, 0.035, 0.035, 0.06, 0.06, 0.06]
+        self.panels = [False, False, False, False, True, False, False]
+
+        # kwargs to select each of the ways of calculating conveyance
+        self.loop = {'sweep': False}
+        self.methods = [self.loop, {'sweep': True}]
+
+    def test_interpolateGaps(self):
+        '''Gaps larger than space should be filled stepping down from the top.'''
+        depths = oc.interpolateGaps([5.0, 3.0, 2.0, 2.5], 0.3)
+        expected = [2.0, 2.2, 2.5, 2.7, 3.0, 3.2, 3.5, 3.8, 4.1, 4.4, 4.7, 5.0]
+        self.assertEqual(len(depths), len(expected))
+        for d, e in zip(depths, expected):
+            self.assertAlmostEqual(d, e)
+
+        # Fixed count of depths merged in with the elevations
+        depths = oc.interpolateGaps([0.0, 3.0, 1.0], 0, count=5)
+        self.assertListEqual(depths, [0.0, 0.75, 1.0, 1.5, 2.25, 3.0])
+        self.assertListEqual(oc.interpolateGaps([4.0], 0.1), [4.0])
+
+    def test_calcConveyanceRectangle(self):
+        '''Check a simple rectangular channel against Manning's formula.'''
+        x = [0.0, 0.0, 10.0, 10.0]
+        y = [2.0, 0.0, 0.0, 2.0]
+        results, has_negative = oc.calcConveyance(x, y, n_vals=0.04)
+        self.assertFalse(has_negative)
+        k, stage, negative = results[-1]
+        self.assertEqual(stage, 2.0)
+        area = 20.0
+        wp = 14.0
+        self.assertAlmostEqual(k, (1.0 / 0.04) * area * (area / wp)**(2.0 / 3.0))
+
+    def test_calcConveyanceMethods(self):
+        '''The sweep results should match the depth by depth ones.'''
+        for panels in ([], self.panels):
+            for space in (0, 0.25):
+                loop = oc.calcConveyance(
+                    self.x, self.y, panels, self.n, interpolate_space=space,
+                    **self.loop
+                )
+                for method in self.methods[1:]:
+                    vec = oc.calcConveyance(
+                        self.x, self.y, panels, self.n, interpolate_space=space,
+                        **method
+                    )
+                    self.assertEqual(len(vec[0]), len(loop[0]))
+                    self.assertEqual(vec[1], loop[1])
+                    for v, l in zip(vec[0], loop[0]):
+                        self.assertAlmostEqual(v[0], l[0])
+                        self.assertEqual(v[1:], l[1:])
+
+    def test_calcConveyanceNegative(self):
+        '''A wide flat berm should cause a drop in conveyance.'''
+        x = [0.0, 0.0, 1.0, 1.0, 100.0, 100.0]
+        y = [5.0, 0.0, 0.0, 2.0, 2.0, 5.0]
+        for method in self.methods:
+            results, has_negative = oc.calcConveyance(
+                x, y, interpolate_space=0.1, **method
+            )
+            self.assertTrue(has_negative)
+            self.assertTrue([r for r in results if r[1] == 2.0 and r[2]])
+
+    def test_hydraulicTable(self):
+        '''Check the properties of a rectangular channel.'''
+        x = [0.0, 0.0, 10.0, 10.0]
+        y = [2.0, 0.0, 0.0, 2.0]
+        for method in self.methods:
+            table = oc.HydraulicTable(x, y, n_vals=0.04, depths=[0.0, 1.0, 2.0], **method)
+            self.assertEqual(len(table), 3)
+            self.assertListEqual(table.area, [0.0, 10.0, 20.0])
+            self.assertListEqual(table.wetted_perimeter, [10.0, 12.0, 14.0])
+            self.assertListEqual(table.top_width, [10.0, 10.0, 10.0])
+            self.assertAlmostEqual(table.hydraulic_radius[1], 10.0 / 12.0)
+            self.assertAlmostEqual(table.valueAt('area', 1.5), 15.0)
+            self.assertAlmostEqual(table.valueAt('top_width', 0.25), 10.0)
+            with self.assertRaises(ValueError):
+                table.valueAt('area', 2.5)
+
+            # Conveyance should match calcConveyance
+            results, has_negative = oc.calcConveyance(x, y, n_vals=0.04, **method)
+            self.assertAlmostEqual(table.conveyance[-1], results[-1][0])
+
+    def test_hydraulicTablePanels(self):
+        '''The sweep and depth by depth tables should match.'''
+        kwargs = {'interpolate_space': 0.5}
+        loop = oc.HydraulicTable(self.x, self.y, self.panels, self.n, **dict(kwargs, **self.loop))
+        for method in self.methods[1:]:
+            vec = oc.HydraulicTable(self.x, self.y, self.panels, self.n, **dict(kwargs, **method))
+            self.assertListEqual(vec.depths, loop.depths)
+            for p in oc.HydraulicTable.PROPERTIES:
+                for v, l in zip(getattr(vec, p), getattr(loop, p)):
+                    self.assertAlmostEqual(v, l)
+        results = oc.calcConveyance(self.x, self.y, self.panels, self.n, **dict(kwargs, **self.loop))[0]
+        self.assertAlmostEqual(loop.conveyance[-1], results[-1][0])
+
+        # Memoized on the geometry
+        table = oc.hydraulicTable(self.x, self.y, self.panels, self.n, **kwargs)
+        self.assertIs(oc.hydraulicTable(list(self.x), self.y, self.panels, self.n, **kwargs), table)
+        self.assertIsNot(oc.hydraulicTable(self.x, self.y, self.panels, self.n), table)
+
+    def test_vectorizeDeprecated(self):
+        '''vectorize should be ignored with a DeprecationWarning.'''
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            results = oc.calcConveyance(self.x, self.y, self.panels, self.n, vectorize=True)
+            table = oc.HydraulicTable(self.x, self.y, self.panels, self.n, vectorize=False)
+        self.assertEqual(len(caught), 2)
+        for w in caught:
+            self.assertTrue(issubclass(w.category, DeprecationWarning))
+        self.assertEqual(results, oc.calcConveyance(self.x, self.y, self.panels, self.n))
+        self.assertListEqual(table.conveyance, oc.HydraulicTable(
+            self.x, self.y, self.panels, self.n).conveyance)
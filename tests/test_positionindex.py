@@ -0,0 +1,66 @@
+from __future__ import unicode_literals
+
+import random
+import unittest
+
+from ship.datastructures.positionindex import PositionIndex
+
+
+class PositionIndexTests(unittest.TestCase):
+    '''Tests the PositionIndex stays in step with the list it's indexing.
+    '''
+
+    def setUp(self):
+        self.block_size = PositionIndex.BLOCK_SIZE
+        # Small blocks so that they're split and removed often
+        PositionIndex.BLOCK_SIZE = 2
+
+    def tearDown(self):
+        PositionIndex.BLOCK_SIZE = self.block_size
+
+    def checkIndex(self, index, items, groups):
+        self.assertEqual(len(index), len(items))
+        for item in groups:
+            expected = items.index(item) if item in items else -1
+            self.assertEqual(index.index(item), expected)
+            self.assertEqual(index.count(item), items.count(item))
+        for group in set(groups.values()):
+            last = -1
+            for i, item in enumerate(items):
+                if groups[item] == group:
+                    last = i
+            self.assertEqual(index.lastIndexOfGroup(group), last)
+
+    def test_insertAndDelete(self):
+        index = PositionIndex()
+        items = []
+        groups = dict(('item%d' % i, i % 3) for i in range(10))
+        rand = random.Random(4)
+        for i in range(200):
+            if not items or rand.random() < 0.6:
+                item = rand.choice(sorted(groups))
+                pos = rand.randint(-len(items) - 1, len(items) + 1)
+                items.insert(pos, item)
+                index.insert(pos, item, groups[item])
+            else:
+                pos = rand.randint(-len(items), len(items) - 1)
+                self.assertEqual(index.delete(pos), items.pop(pos))
+            self.checkIndex(index, items, groups)
+
+    def test_missingItems(self):
+        index = PositionIndex()
+        index.insert(0, 'a', 'first')
+        self.assertEqual(index.index('b'), -1)
+        self.assertFalse('b' in index)
+        self.assertEqual(index.lastIndexOfGroup('second'), -1)
+        self.assertRaises(IndexError, index.delete, 1)
+
+        index.delete(0)
+        self.assertFalse('a' in index)
+        self.assertEqual(index.lastIndexOfGroup('first'), -1)
+        index.insert(0, 'a')
+        self.assertEqual(index.index('a'), 0)
+
+        index.clear()
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.index('a'), -1)
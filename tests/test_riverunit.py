@@ -204,3 +204,25 @@ class RiverUnitTests(unittest.TestCase):
         args = {rdt.CHAINAGE: 5.0, rdt.ELEVATION: 37.2}
         with self.assertRaises(ValueError):
             river.addRow(args, index=3)
+
+        # Rows given to the factory need the required values too
+        rows = {'main': [{rdt.CHAINAGE: 0.0, rdt.ELEVATION: 20.0}, {rdt.CHAINAGE: 2.0}]}
+        with self.assertRaises(ValueError):
+            ifactory.createUnit('river', name='riv1', row_data=rows)
+
+    def test_hydraulicTable(self):
+        """The table should only be calculated again when the geometry changes."""
+        ifactory = FmpUnitFactory()
+        i, river = ifactory.createUnitFromFile(self.input_contents, 0, 'RIVER', 1, 1)
+
+        table = river.hydraulicTable()
+        self.assertIs(river.hydraulicTable(), table)
+        self.assertEqual(table.depths[0], 35.19)
+        self.assertEqual(table.area[0], 0.0)
+        self.assertGreater(table.area[-1], 0.0)
+
+        river.row_data['main'].dataObject(rdt.ELEVATION)[5] = 35.0
+        new_table = river.hydraulicTable()
+        self.assertIsNot(new_table, table)
+        self.assertEqual(new_table.depths[0], 35.0)
+        self.assertIsNot(river.hydraulicTable(interpolate_space=0.1), new_table)
@@ -249,3 +249,137 @@ class RowDataCollectionTests(unittest.TestCase):
         self.assertEqual(self.testcol.numberOfRows(), 1)
         row = self.testcol.rowAsList(0)
         self.assertListEqual(row, test_list)
+
+    def test_dataObjectLookup(self):
+        """Lookups by data_type should follow changes to the collection."""
+        self.assertIs(self.testcol.dataObject(rdt.ELEVATION), self.obj2)
+        self.assertTrue(self.testcol.deleteDataObject(rdt.CHAINAGE))
+        self.assertFalse(self.testcol.deleteDataObject(rdt.CHAINAGE))
+        self.assertEqual(self.testcol.indexOfDataObject(rdt.ELEVATION), 0)
+        self.assertIsNone(self.testcol.indexOfDataObject(rdt.CHAINAGE))
+        with self.assertRaises(KeyError):
+            self.testcol.dataObject(rdt.CHAINAGE)
+
+        # Changes made straight to _collection are picked up too
+        self.testcol._collection.insert(0, self.obj1)
+        self.assertEqual(self.testcol.indexOfDataObject(rdt.ELEVATION), 1)
+        self.assertIs(self.testcol.dataObject(rdt.CHAINAGE), self.obj1)
+
+        # If data_type's are repeated the first one is used
+        dup = do.FloatData(rdt.ELEVATION, format_str='{:>10}', default=None, no_of_dps=3)
+        self.testcol.addToCollection(dup)
+        self.assertIs(self.testcol.dataObject(rdt.ELEVATION), self.obj2)
+
+    def test_rowChangesRolledBack(self):
+        """A row change that fails part way should leave the collection as it was."""
+        before = self.testcol.toList()
+
+        # Elevation has no default so the row can't be added after chainage
+        with self.assertRaises(ValueError):
+            self.testcol.addRow({rdt.CHAINAGE: 5.0}, 1)
+        self.assertListEqual(self.testcol.toList(), before)
+        self.assertTrue(self.testcol.checkRowsInSync())
+
+        # Negative indexes should remove the inserted value, not the last one
+        for index in (-1, -5):
+            with self.assertRaises(ValueError):
+                self.testcol.addRow({rdt.CHAINAGE: 1.0}, index)
+            self.assertListEqual(self.testcol.toList(), before)
+
+        # The values set before the bad one should be put back
+        self.obj1.setChangeStatus(False)
+        with self.assertRaises(ValueError):
+            self.testcol.updateRow({rdt.CHAINAGE: 1.0, rdt.ELEVATION: 'bad'}, 1)
+        self.assertListEqual(self.testcol.toList(), before)
+        self.assertFalse(self.obj1.has_changed)
+        self.assertIs(self.testcol.dataObject(rdt.CHAINAGE), self.obj1)
+
+    def test_addColumns(self):
+        """Check a block of rows can be added a column at a time."""
+        self.obj3.default = 0.04
+        self.testcol.addColumns({
+            rdt.CHAINAGE: [5.0, 6.0], rdt.ELEVATION: ['34.1', '35.2']
+        })
+        self.assertEqual(self.testcol.row_count, 4)
+        self.assertListEqual(self.testcol.dataObjectAsList(rdt.ELEVATION), [32.345, 33.45, 34.1, 35.2])
+        self.assertListEqual(self.testcol.dataObjectAsList(rdt.ROUGHNESS), [0.035, 0.035, 0.04, 0.04])
+
+        # Insert at an index in compacted objects
+        self.testcol.compact()
+        self.testcol.addColumns({
+            rdt.CHAINAGE: [1.0, 2.0], rdt.ELEVATION: [32.5, 33.0], rdt.ROUGHNESS: [None, 0.05]
+        }, index=1)
+        self.assertListEqual(self.testcol.dataObjectAsList(rdt.CHAINAGE), [0.0, 1.0, 2.0, 3.65, 5.0, 6.0])
+        self.assertListEqual(self.testcol.dataObjectAsList(rdt.ROUGHNESS), [0.035, 0.04, 0.05, 0.035, 0.04, 0.04])
+        self.assertTrue(self.obj1.is_compact)
+
+        # The dummy row should be replaced
+        col = rdc.RowDataCollection.bulkInitCollection([
+            do.FloatData(rdt.CHAINAGE, format_str='{:>10}', no_of_dps=3),
+            do.FloatData(rdt.ELEVATION, format_str='{:>10}', no_of_dps=3),
+        ])
+        col.setDummyRow({rdt.CHAINAGE: 0.0, rdt.ELEVATION: 0.0})
+        col.addColumns({rdt.CHAINAGE: [1.0, 2.0], rdt.ELEVATION: [3.0, 4.0]}, index=0)
+        self.assertFalse(col.has_dummy)
+        self.assertListEqual(col.toList(), [[1.0, 2.0], [3.0, 4.0]])
+
+    def test_addColumnsRolledBack(self):
+        """Columns that can't be added should leave the collection as it was."""
+        before = self.testcol.toList()
+        self.assertRaises(KeyError, self.testcol.addColumns, {rdt.RAIN: [1.0]})
+        self.assertRaises(ValueError, self.testcol.addColumns, {
+            rdt.CHAINAGE: [5.0, 6.0], rdt.ELEVATION: [34.1], rdt.ROUGHNESS: [0.04]
+        })
+        # Elevation has no default
+        self.assertRaises(ValueError, self.testcol.addColumns, {rdt.CHAINAGE: [5.0]})
+        self.assertRaises(ValueError, self.testcol.addColumns, {
+            rdt.CHAINAGE: [5.0, 6.0], rdt.ELEVATION: [34.1, None], rdt.ROUGHNESS: [0.04, 0.04]
+        })
+        self.assertRaises(IndexError, self.testcol.addColumns, {
+            rdt.CHAINAGE: [5.0], rdt.ELEVATION: [34.1], rdt.ROUGHNESS: [0.04]
+        }, index=3)
+
+        # Roughness is added after chainage and elevation
+        self.obj1.setChangeStatus(False)
+        self.assertRaises(ValueError, self.testcol.addColumns, {
+            rdt.CHAINAGE: [1.0, 2.0], rdt.ELEVATION: [32.5, 33.0], rdt.ROUGHNESS: [0.04, 'bad']
+        }, index=1)
+        self.assertListEqual(self.testcol.toList(), before)
+        self.assertFalse(self.obj1.has_changed)
+        self.assertTrue(self.testcol.checkRowsInSync())
+
+    def test_getPrintableRows(self):
+        rows = self.testcol.getPrintableRows()
+        self.assertListEqual(rows, ['     0.000    32.345     0.035', '     3.650    33.450     0.035'])
+        self.assertListEqual(self.testcol.getPrintableRows(1), rows[1:])
+        self.assertListEqual(rows, [self.testcol.getPrintableRow(i) for i in range(2)])
+        self.assertListEqual(list(self.testcol.iterPrintableRows()), rows)
+
+    @unittest.skipIf(rdc.np is None, 'numpy is not installed')
+    def test_toArrays(self):
+        arrays = self.testcol.toArrays()
+        self.assertListEqual(list(arrays.keys()), [rdt.CHAINAGE, rdt.ELEVATION, rdt.ROUGHNESS])
+        self.assertListEqual(arrays[rdt.ELEVATION].tolist(), [32.345, 33.45])
+
+        # Copies don't stop the rows being changed
+        self.testcol.addRow({rdt.CHAINAGE: 4.0, rdt.ELEVATION: 34.0, rdt.ROUGHNESS: 0.04})
+        self.testcol.deleteRow(2)
+        self.assertListEqual(arrays[rdt.ELEVATION].tolist(), [32.345, 33.45])
+
+        arrays = self.testcol.toArrays(copy=False)
+        self.assertTrue(self.obj2.is_compact)
+        self.assertFalse(arrays[rdt.ELEVATION].flags.writeable)
+
+        # Rows can't be added while the values are viewed
+        with self.assertRaises(BufferError):
+            self.testcol.addRow({rdt.CHAINAGE: 5.0, rdt.ELEVATION: 34.0, rdt.ROUGHNESS: 0.04})
+        del arrays
+        self.testcol.addRow({rdt.CHAINAGE: 5.0, rdt.ELEVATION: 34.0, rdt.ROUGHNESS: 0.04})
+
+        # Blanks are NaN
+        blank = do.FloatData(rdt.EASTING, format_str='{:>10}', default='')
+        blank.data_collection = [1.0, '', 2.0]
+        self.testcol.addToCollection(blank)
+        eastings = self.testcol.toArrays([rdt.EASTING])[rdt.EASTING].tolist()
+        self.assertEqual(eastings[0], 1.0)
+        self.assertNotEqual(eastings[1], eastings[1])
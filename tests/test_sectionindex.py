@@ -0,0 +1,75 @@
+from __future__ import unicode_literals
+
+import math
+import random
+import unittest
+
+from ship.utils.tools.sectionindex import SectionIndex
+from ship.fmp.datcollection import DatCollection
+from ship.fmp import fmpunitfactory as iuf
+from ship.fmp.datunits import ROW_DATA_TYPES as rdt
+
+
+class SectionIndexTests(unittest.TestCase):
+    '''Tests for finding sections by location.
+    '''
+
+    def setUp(self):
+        random.seed(7)
+        units = []
+        for i in range(40):
+            e = random.uniform(0, 1000)
+            n = random.uniform(0, 1000)
+            rows = [
+                {rdt.CHAINAGE: float(j), rdt.ELEVATION: 5.0, rdt.EASTING: e + j, rdt.NORTHING: n + j}
+                for j in range(3)
+            ]
+            units.append(iuf.FmpUnitFactory.createUnit(
+                'river', name='riv%s' % i, row_data={'main': rows}
+            ))
+        # No locations so shouldn't be indexed
+        rows = [{rdt.CHAINAGE: 0.0, rdt.ELEVATION: 5.0}, {rdt.CHAINAGE: 1.0, rdt.ELEVATION: 5.0}]
+        units.append(iuf.FmpUnitFactory.createUnit('river', name='noloc', row_data={'main': rows}))
+        units.append(iuf.FmpUnitFactory.createUnit('arch', name='brg1', name_ds='brg1ds'))
+        self.units = units
+        self.dat = DatCollection.initialisedDat('c:/fake/path.dat', units)
+
+    def distance(self, unit, e, n):
+        rows = unit.row_data['main']
+        return min(
+            math.hypot(x - e, y - n) for x, y in
+            zip(rows.dataObjectAsList(rdt.EASTING), rows.dataObjectAsList(rdt.NORTHING))
+        )
+
+    def scan(self, e, n):
+        return sorted((self.distance(u, e, n), u.name) for u in self.units[:40])
+
+    def test_nearest(self):
+        '''Should match a scan of every section.'''
+        for cell_size in (None, 5.0, 5000.0):
+            index = SectionIndex(self.dat, cell_size=cell_size)
+            self.assertEqual(len(index), 40)
+            for e, n in ((500.0, 500.0), (-300.0, 2000.0), (10.0, 990.0)):
+                expected = self.scan(e, n)
+                found = index.nearest(e, n, count=3)
+                self.assertListEqual([u.name for d, u in found], [x[1] for x in expected[:3]])
+                self.assertAlmostEqual(found[0][0], expected[0][0])
+            self.assertListEqual(index.nearest(500.0, 500.0, max_distance=0.001), [])
+
+    def test_withinDistanceAndBox(self):
+        '''Should find every section with a point in range.'''
+        index = SectionIndex(self.dat, unit_types=['river'])
+        expected = [x for x in self.scan(400.0, 600.0) if x[0] <= 250.0]
+        found = index.withinDistance(400.0, 600.0, 250.0)
+        self.assertListEqual([u.name for d, u in found], [x[1] for x in expected])
+
+        found = index.inBox(200.0, 300.0, 600.0, 700.0)
+        expected = [
+            u.name for u in self.units[:40] if [
+                1 for r in range(3)
+                if 200.0 <= u.row_data['main'].dataValue(rdt.EASTING, r) <= 600.0 and
+                300.0 <= u.row_data['main'].dataValue(rdt.NORTHING, r) <= 700.0
+            ]
+        ]
+        self.assertListEqual([u.name for u in found], expected)
+        self.assertListEqual(index.inBox(2000.0, 2000.0, 3000.0, 3000.0), [])
@@ -521,3 +521,28 @@ class TuflowFilePartTests(unittest.TestCase):
         self.assertFalse(cpart2.filename_is_prefix)
         self.assertTrue(cpart3.filename_is_prefix)
         self.assertFalse(cpart4.filename_is_prefix)
+
+
+class TuflowFilepartTypesTests(unittest.TestCase):
+    """Test the lookup of commands in TuflowFilepartTypes."""
+
+    def setUp(self):
+        self.types = f.TuflowFilepartTypes()
+
+    def test_find(self):
+        self.assertTupleEqual((False, None), self.types.find('Mongoose'))
+        self.assertTupleEqual((True, ft.MODEL), self.types.find('GEOMETRY CONTROL FILE == ..\\model\\test.tgc'))
+        self.assertTupleEqual((True, ft.MODEL), self.types.find('geometry control file'))
+        self.assertTupleEqual((True, ft.GIS), self.types.find('Read GIS Z Shape == gis\\zsh.shp'))
+        self.assertTupleEqual((True, ft.VARIABLE), self.types.find('GRID SIZE (X,Y) == 100, 200'))
+        self.assertTupleEqual((False, None), self.types.find('GRID SIZE'))
+
+        # With file type
+        self.assertTupleEqual((False, None), self.types.find('GEOMETRY CONTROL FILE', ft.GIS))
+        self.assertTupleEqual((True, ft.DATA), self.types.find('BC DATABASE', ft.DATA))
+
+    def test_findAmbiguous(self):
+        self.assertTupleEqual((True, ft.RESULT), self.types.find('WRITE CHECK FILES == checks\\'))
+        self.assertTupleEqual((True, ft.VARIABLE), self.types.find('WRITE CHECK FILES INCLUDE == 2d_zsh'))
+        self.assertTupleEqual((True, ft.EVENT_LOGIC), self.types.find('DEFINE EVENT == Q100'))
+        self.assertTupleEqual((True, ft.SECTION_LOGIC), self.types.find('DEFINE OUTPUT ZONE == zone1'))